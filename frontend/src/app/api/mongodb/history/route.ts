@@ -1,6 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getDatabase } from '@/lib/mongodb';
-import { HourlyStats } from '@/types';
+import { HourlyStats, OverallHourly } from '@/types';
 
 export async function GET(request: Request) {
   try {
@@ -22,54 +22,59 @@ export async function GET(request: Request) {
       return NextResponse.json({ error: 'MongoDB connection failed' }, { status: 500 });
     }
 
-    // 사용 가능한 timestampHour들을 확인
-    const availableTimestamps = await db.collection<HourlyStats>('hourly_stats')
-      .distinct('timestampHour');
+    const limit = days * 24; // 최대 N일 * 24시간
 
-    if (availableTimestamps.length === 0) {
-      return NextResponse.json({ error: 'No hourly stats data found' }, { status: 404 });
-    }
-
-    // 최신 timestampHour부터 최대 N개 가져오기
-    const sortedTimestamps = availableTimestamps.sort().reverse();
-    const limit = Math.min(days * 24, sortedTimestamps.length); // 최대 N일 * 24시간
-    const selectedTimestamps = sortedTimestamps.slice(0, limit);
-
-    // 선택된 시간대의 데이터 조회
-    const historyData = await db.collection<HourlyStats>('hourly_stats')
-      .find({
-        timestampHour: { $in: selectedTimestamps }
-      })
-      .sort({ timestampHour: 1 })
+    // 시간별 전체 롤업은 시간당 문서 1개만 읽는다 (기관 수와 무관)
+    const rollups = await db.collection<OverallHourly>('overall_hourly')
+      .find({}, { projection: { _id: 0, timestampHour: 1, stats: 1 } })
+      .sort({ timestampHour: -1 })
+      .limit(limit)
       .toArray();
 
-    if (!historyData || historyData.length === 0) {
-      return NextResponse.json({ error: 'No history data found' }, { status: 404 });
+    type Counts = { total: number; normal: number; maintenance: number; problem: number };
+    const byHour = new Map<string, { timestampHour: string; overall: Counts }>();
+    for (const { timestampHour, stats } of rollups) {
+      byHour.set(String(timestampHour), {
+        timestampHour,
+        overall: { total: stats.total, normal: stats.normal, maintenance: stats.maintenance, problem: stats.problem }
+      });
     }
 
-    // 시간별로 그룹화하여 전체 통계 계산
-    const groupedByHour = historyData.reduce((acc, entry) => {
-      const hour = entry.timestampHour;
-      if (!acc[hour]) {
-        acc[hour] = {
-          total: 0,
-          normal: 0,
-          maintenance: 0,
-          problem: 0
-        };
+    // 롤업이 다루지 않는 구간은 hourly_stats 원본을 시간별로 집계해 채운다 (롤업 도입 이전, backfill 전)
+    // 가장 오래된 롤업 시간은 도입 시점에 일부만 쌓였을 수 있으므로 원본이 있으면 원본을 쓴다
+    if (rollups.length < limit) {
+      const oldest = rollups.length > 0 ? rollups[rollups.length - 1].timestampHour : null;
+      // 모자란 시간만큼만 거슬러 올라가 읽는다 (하한이 없으면 오래된 hourly_stats 전체를 $group 하게 된다)
+      const upper = oldest !== null ? new Date(oldest) : new Date();
+      const lower = new Date(upper.getTime() - (limit - rollups.length) * 60 * 60 * 1000);
+      const raw = await db.collection<HourlyStats>('hourly_stats').aggregate<{ _id: string } & Counts>([
+        { $match: { timestampHour: { $gte: lower, ...(oldest !== null ? { $lte: oldest } : {}) } } },
+        {
+          $group: {
+            _id: '$timestampHour',
+            total: { $sum: '$stats.total' },
+            normal: { $sum: '$stats.normal' },
+            maintenance: { $sum: '$stats.maintenance' },
+            problem: { $sum: '$stats.problem' }
+          }
+        },
+        { $sort: { _id: -1 } },
+        { $limit: limit - rollups.length + (oldest !== null ? 1 : 0) }
+      ]).toArray();
+
+      for (const { _id, total, normal, maintenance, problem } of raw) {
+        byHour.set(String(_id), { timestampHour: _id, overall: { total, normal, maintenance, problem } });
       }
-      acc[hour].total += entry.stats.total;
-      acc[hour].normal += entry.stats.normal;
-      acc[hour].maintenance += entry.stats.maintenance;
-      acc[hour].problem += entry.stats.problem;
-      return acc;
-    }, {} as Record<string, { total: number; normal: number; maintenance: number; problem: number }>);
+    }
+
+    if (byHour.size === 0) {
+      return NextResponse.json({ error: 'No hourly stats data found' }, { status: 404 });
+    }
 
-    // MongoDB 데이터를 기존 Redis 구조로 변환
-    const history = Object.entries(groupedByHour).map(([timestamp, stats]) => ({
-      timestamp,
-      overall: stats
-    }));
+    // 기존 응답과 같은 형식 (Date를 객체 키로 쓸 때의 문자열), 오래된 시간부터
+    const history = Array.from(byHour.values())
+      .sort((a, b) => new Date(a.timestampHour).getTime() - new Date(b.timestampHour).getTime())
+      .map(({ timestampHour, overall }) => ({ timestamp: String(timestampHour), overall }));
 
     return NextResponse.json(history, {
       headers: {
@@ -0,0 +1,54 @@
+import { NextResponse } from 'next/server';
+import { getDatabase } from '@/lib/mongodb';
+import { secondsBetween } from '@/lib/statusEvents';
+import { StatusIndex } from '@/types';
+
+// 기관별 현재 상태와 그 상태가 이어진 시간 (status_index 문서 1개, ?agencyId= 없으면 전 기관)
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const agencyId = searchParams.get('agencyId');
+
+    const db = await getDatabase();
+
+    // MongoDB 연결 테스트
+    let mongoConnected = false;
+    try {
+      await db.admin().ping();
+      mongoConnected = true;
+    } catch {
+      console.log('MongoDB connection failed');
+    }
+
+    if (!mongoConnected) {
+      return NextResponse.json({ error: 'MongoDB connection failed' }, { status: 500 });
+    }
+
+    const docs = await db.collection<StatusIndex>('status_index')
+      .find(agencyId ? { _id: agencyId, status: { $exists: true } } : { status: { $exists: true } })
+      .sort({ _id: 1 })
+      .toArray();
+
+    if (docs.length === 0) {
+      return NextResponse.json({ error: 'No status data found' }, { status: 404 });
+    }
+
+    const now = new Date();
+    const current = docs.map(doc => ({
+      agencyId: doc._id,
+      status: doc.status,
+      since: doc.since,
+      durationS: doc.since ? Math.round(secondsBetween(doc.since, now) * 10) / 10 : null,
+      triggeredBy: doc.triggeredBy ?? null
+    }));
+
+    return NextResponse.json(agencyId ? current[0] : current, {
+      headers: {
+        'Cache-Control': 'public, s-maxage=180, stale-while-revalidate=0'
+      }
+    });
+  } catch (error) {
+    console.error('Error fetching current status:', error);
+    return NextResponse.json({ error: 'Failed to fetch current status' }, { status: 500 });
+  }
+}
@@ -0,0 +1,57 @@
+import { NextResponse } from 'next/server';
+import { getDatabase } from '@/lib/mongodb';
+import { STATUSES, secondsBetween } from '@/lib/statusEvents';
+import { StatusIndex, StatusName } from '@/types';
+
+// 진행 중인 장애를 오래된 순으로 ((status, since) 인덱스). ?status=problem,maintenance 로 점검 포함
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const limit = Math.max(1, parseInt(searchParams.get('limit') || '10') || 10);
+    const statuses = (searchParams.get('status') || 'problem')
+      .split(',')
+      .filter((s): s is StatusName => (STATUSES as string[]).includes(s));
+
+    if (statuses.length === 0) {
+      return NextResponse.json({ error: 'Invalid status' }, { status: 400 });
+    }
+
+    const db = await getDatabase();
+
+    // MongoDB 연결 테스트
+    let mongoConnected = false;
+    try {
+      await db.admin().ping();
+      mongoConnected = true;
+    } catch {
+      console.log('MongoDB connection failed');
+    }
+
+    if (!mongoConnected) {
+      return NextResponse.json({ error: 'MongoDB connection failed' }, { status: 500 });
+    }
+
+    const docs = await db.collection<StatusIndex>('status_index')
+      .find({ status: { $in: statuses } })
+      .sort({ since: 1 })
+      .limit(limit)
+      .toArray();
+
+    const now = new Date();
+    const outages = docs.map(doc => ({
+      agencyId: doc._id,
+      status: doc.status,
+      since: doc.since,
+      durationS: doc.since ? Math.round(secondsBetween(doc.since, now) * 10) / 10 : null
+    }));
+
+    return NextResponse.json(outages, {
+      headers: {
+        'Cache-Control': 'public, s-maxage=180, stale-while-revalidate=0'
+      }
+    });
+  } catch (error) {
+    console.error('Error fetching outages:', error);
+    return NextResponse.json({ error: 'Failed to fetch outages' }, { status: 500 });
+  }
+}
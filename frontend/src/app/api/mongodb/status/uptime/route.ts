@@ -0,0 +1,50 @@
+import { NextResponse } from 'next/server';
+import { getDatabase } from '@/lib/mongodb';
+import { uptime } from '@/lib/statusEvents';
+
+// 기관 하나의 임의 구간 상태별 시간과 가동률 (status_events 인덱스 조회 2번)
+// ?agencyId=...&days=7 또는 ?agencyId=...&start=ISO&end=ISO
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const agencyId = searchParams.get('agencyId');
+    if (!agencyId) {
+      return NextResponse.json({ error: 'agencyId is required' }, { status: 400 });
+    }
+
+    const days = parseInt(searchParams.get('days') || '7') || 7;
+    const end = searchParams.get('end') ? new Date(searchParams.get('end')!) : new Date();
+    const start = searchParams.get('start')
+      ? new Date(searchParams.get('start')!)
+      : new Date(end.getTime() - days * 24 * 60 * 60 * 1000);
+    if (isNaN(start.getTime()) || isNaN(end.getTime()) || start > end) {
+      return NextResponse.json({ error: 'Invalid time range' }, { status: 400 });
+    }
+
+    const db = await getDatabase();
+
+    // MongoDB 연결 테스트
+    let mongoConnected = false;
+    try {
+      await db.admin().ping();
+      mongoConnected = true;
+    } catch {
+      console.log('MongoDB connection failed');
+    }
+
+    if (!mongoConnected) {
+      return NextResponse.json({ error: 'MongoDB connection failed' }, { status: 500 });
+    }
+
+    const result = { agencyId, start, end, ...(await uptime(db, agencyId, start, end)) };
+
+    return NextResponse.json(result, {
+      headers: {
+        'Cache-Control': 'public, s-maxage=180, stale-while-revalidate=0'
+      }
+    });
+  } catch (error) {
+    console.error('Error fetching uptime:', error);
+    return NextResponse.json({ error: 'Failed to fetch uptime' }, { status: 500 });
+  }
+}
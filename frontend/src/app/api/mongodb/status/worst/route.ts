@@ -0,0 +1,54 @@
+import { NextResponse } from 'next/server';
+import { getDatabase } from '@/lib/mongodb';
+import { UPTIME_WINDOWS_DAYS } from '@/lib/statusEvents';
+import { StatusIndex } from '@/types';
+
+// 최근 N일 장애 시간이 긴 기관 순 (windows.<N>d.downS 인덱스, 구간 집계 재계산 주기(STATUS_WINDOW_REFRESH_MIN)만큼 늦을 수 있다)
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const limit = Math.max(1, parseInt(searchParams.get('limit') || '10') || 10);
+    const days = parseInt(searchParams.get('days') || String(UPTIME_WINDOWS_DAYS[UPTIME_WINDOWS_DAYS.length - 1]));
+
+    if (!UPTIME_WINDOWS_DAYS.includes(days)) {
+      return NextResponse.json({ error: `days must be one of ${UPTIME_WINDOWS_DAYS.join(', ')}` }, { status: 400 });
+    }
+
+    const db = await getDatabase();
+
+    // MongoDB 연결 테스트
+    let mongoConnected = false;
+    try {
+      await db.admin().ping();
+      mongoConnected = true;
+    } catch {
+      console.log('MongoDB connection failed');
+    }
+
+    if (!mongoConnected) {
+      return NextResponse.json({ error: 'MongoDB connection failed' }, { status: 500 });
+    }
+
+    const key = `windows.${days}d`;
+    const docs = await db.collection<StatusIndex>('status_index')
+      .find({ [`${key}.downS`]: { $gt: 0 } })
+      .sort({ [`${key}.downS`]: -1 })
+      .limit(limit)
+      .toArray();
+
+    const worst = docs.map(doc => ({
+      agencyId: doc._id,
+      status: doc.status,
+      ...doc.windows?.[`${days}d`]
+    }));
+
+    return NextResponse.json(worst, {
+      headers: {
+        'Cache-Control': 'public, s-maxage=180, stale-while-revalidate=0'
+      }
+    });
+  } catch (error) {
+    console.error('Error fetching worst agencies:', error);
+    return NextResponse.json({ error: 'Failed to fetch worst agencies' }, { status: 500 });
+  }
+}
@@ -0,0 +1,44 @@
+import { Db } from 'mongodb';
+import { StatusEvent, StatusName, StatusSeconds } from '@/types';
+
+export const STATUSES: StatusName[] = ['normal', 'maintenance', 'problem'];
+
+// tasks/config.py의 UPTIME_WINDOWS_DAYS와 같아야 한다 (status_index.windows.<N>d)
+export const UPTIME_WINDOWS_DAYS = [1, 7, 30];
+
+const zero = (): StatusSeconds => ({ normal: 0, maintenance: 0, problem: 0 });
+
+export function secondsBetween(from: Date, to: Date): number {
+  return Math.max(0, (to.getTime() - from.getTime()) / 1000);
+}
+
+// t까지 상태별 누적 시간(초). t를 포함한 구간 하나만 읽는다 ((agencyId, start) 인덱스)
+export async function cumulative(db: Db, agencyId: string, t: Date): Promise<StatusSeconds> {
+  const event = await db.collection<StatusEvent>('status_events')
+    .findOne({ agencyId, start: { $lte: t } }, { sort: { start: -1 } });
+  if (!event) {
+    return zero(); // 첫 관측 이전
+  }
+  const end = event.end && event.end < t ? event.end : t;
+  const cum = { ...zero(), ...event.cum };
+  cum[event.status] += secondsBetween(event.start, end);
+  return cum;
+}
+
+// [start, end] 동안 상태별 시간과 가동률 (관측 이전 구간은 빠진다). 인덱스 조회 2번
+export async function uptime(db: Db, agencyId: string, start: Date, end: Date) {
+  const [after, before] = await Promise.all([cumulative(db, agencyId, end), cumulative(db, agencyId, start)]);
+  const spent = zero();
+  for (const s of STATUSES) {
+    spent[s] = Math.max(0, after[s] - before[s]);
+  }
+  const observed = spent.normal + spent.maintenance + spent.problem;
+  const round1 = (v: number) => Math.round(v * 10) / 10;
+  return {
+    observedS: round1(observed),
+    normalS: round1(spent.normal),
+    maintenanceS: round1(spent.maintenance),
+    downS: round1(spent.problem),
+    uptime: observed ? Math.round((spent.normal / observed) * 1e6) / 1e6 : null
+  };
+}
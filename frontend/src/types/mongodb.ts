@@ -21,6 +21,21 @@ export interface HourlyStats {
   };
 }
 
+// 시간별 전체 롤업 (Python Storage가 저장 시점에 갱신)
+export interface OverallHourly {
+  _id?: string;
+  timestampHour: string; // ISO string
+  stats: {
+    total: number;
+    normal: number;
+    maintenance: number;
+    problem: number;
+    responseTimeSum?: number;
+    responseTimeMin?: number;
+    responseTimeMax?: number;
+  };
+}
+
 export interface AgencyStatus {
   agencyId: string;
   status: 'normal' | 'maintenance' | 'problem';
@@ -38,3 +53,36 @@ export interface OverallStats {
   };
   agencies: AgencyStatus[];
 }
+
+export type StatusName = 'normal' | 'maintenance' | 'problem';
+export type StatusSeconds = Record<StatusName, number>;
+
+// 상태 변화 구간 (Python StatusEvents가 상태가 바뀔 때만 기록)
+export interface StatusEvent {
+  _id?: string;
+  agencyId: string;
+  status: StatusName;
+  start: Date;
+  end: Date | null; // 진행 중이면 null
+  durationS?: number;
+  cum: StatusSeconds; // 이 구간이 시작되기 전까지 상태별 누적 시간(초)
+  triggeredBy?: Record<string, unknown>;
+  endedBy?: Record<string, unknown>;
+}
+
+export interface StatusWindow {
+  downS: number;
+  maintenanceS: number;
+  uptime: number | null;
+}
+
+// 기관별 현재 상태 + 최근 N일 구간 집계 ("_windows" 문서는 구간 집계 갱신 시각만 담는다)
+export interface StatusIndex {
+  _id: string; // agencyId
+  status?: StatusName;
+  since?: Date;
+  cum?: StatusSeconds;
+  triggeredBy?: Record<string, unknown>;
+  windows?: Record<string, StatusWindow>; // "1d", "7d", "30d"
+  refreshedAt?: Date;
+}
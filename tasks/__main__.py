@@ -0,0 +1,9 @@
+import os
+import sys
+
+# tasks/ 안의 모듈은 `python tasks/main.py`와 같은 방식(config, checker.* 최상위 import)으로 작성되어 있다
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daemon import main  # noqa: E402
+
+main()
@@ -0,0 +1,65 @@
+"""
+동시성 벤치마크: 전역 Semaphore(30) vs 호스트별 상한 + AIMD 적응형 한도
+======================================================================
+
+로컬 사이트 팜(호스트 수, 호스트 용량, 지연 분포 지정)을 대상으로
+전체 검사 소요 시간과 problem 판정 수(과부하로 인한 오탐)를 비교한다.
+
+사용법:
+    python tasks/bench/bench_concurrency.py --sites 740 --hosts 20 --capacity 6
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+
+import aiohttp
+
+from common import Timer, emit
+from site_farm import SiteFarm
+from checker.status_checker import StatusChecker
+from checker.concurrency import AdaptiveLimiter
+
+
+async def run_mode(farm, mode):
+    checker = StatusChecker()
+    if mode == "baseline":
+        # 기존 동작: 전역 30개 고정, 호스트 구분 없음, 기본 커넥터
+        limiter = AdaptiveLimiter(initial=30, per_host=None, adaptive=False)
+        connector = aiohttp.TCPConnector()
+    else:
+        limiter, connector = None, None
+
+    farm.requests = 0
+    with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+        await checker.check_sites(farm.agencies(), limiter=limiter, connector=connector)
+
+    conc = checker.run_stats["concurrency"]
+    return {
+        "mode": mode,
+        "wallS": round(t.wall, 2),
+        "problem": len(checker.summary["problem"]),
+        "requests": farm.requests,
+        "limitRange": f"{conc['minLimit']}~{conc['maxLimit']}",
+        "peakInFlight": conc["peakInFlight"],
+    }
+
+
+async def main(args):
+    farm = SiteFarm(hosts=args.hosts, sites=args.sites, capacity=args.capacity,
+                    latency_ms=(args.min_latency, args.max_latency))
+    async with farm:
+        return [await run_mode(farm, mode) for mode in ("baseline", "adaptive")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sites", type=int, default=740)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=6, help="호스트당 지연 없이 처리 가능한 동시 요청 수")
+    parser.add_argument("--min-latency", type=float, default=30)
+    parser.add_argument("--max-latency", type=float, default=300)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.json)
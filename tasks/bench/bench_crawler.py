@@ -0,0 +1,204 @@
+"""
+기관 목록 크롤러 벤치마크: 순차 requests + sleep vs AsyncGovCrawler
+====================================================================
+
+루프백 주소(127.0.0.x)마다 포털 디렉터리 페이지를 흉내내는 정적 미러를 띄운다.
+각 페이지는 하위 디렉터리 페이지(트리)와 다른 페이지로의 교차 링크(중복), 기관 사이트 링크(*.go.kr),
+robots.txt로 막힌 링크를 가진다.
+
+- baseline: 기존 GovCrawler.crawl_page 방식 (requests 순차 요청 + 페이지마다 sleep)으로 링크를 따라가되
+  --sync-pages 페이지까지만 돌려 페이지/초를 재고 전체 소요 시간은 추정
+- async: AsyncGovCrawler (같은 호스트 요청 간격은 baseline의 sleep과 동일)
+- resume: 절반에서 중단(frontier 저장) 후 이어받아 끝까지 (수집 결과가 async와 같아야 함)
+
+사용법:
+    python tasks/bench/bench_crawler.py --pages 2000 --hosts 10 --delay 0.1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+
+from aiohttp import web
+
+from common import emit
+from crawler.gov_crawler import GovCrawler
+from crawler.async_crawler import AsyncGovCrawler, normalize_url
+
+
+class PortalMirror:
+    def __init__(self, pages=2000, hosts=10, port=18180, branching=4, cross_links=3, org_links=8,
+                 latency_ms=(20, 80), seed=0):
+        self.pages = pages
+        self.hosts = hosts
+        self.port = port
+        self.latency_ms = latency_ms
+        self.rnd = random.Random(seed)
+        self.requests = 0
+        self.runners = []
+        self.loop = None
+
+        n_orgs = max(1, pages * org_links // 3)
+        self.html = []
+        for i in range(pages):
+            children = range(i * branching + 1, min(pages, i * branching + branching + 1))
+            links = [self.url_for(c) for c in children]
+            links += [self.url_for(self.rnd.randrange(pages)) + "#top" for _ in range(cross_links)]
+            links.append(f"http://{self.host_for(i)}:{port}/private/{i}")
+            orgs = [f"https://www.org{self.rnd.randrange(n_orgs)}.go.kr" for _ in range(org_links)]
+            items = "".join(f'<li><a href="{u}">디렉터리 {k}</a></li>' for k, u in enumerate(links))
+            items += "".join(f'<li><a href="{u}"></a></li>' for u in orgs)
+            self.html.append(f"<html><body><h1>기관 안내 {i}</h1><ul>{items}</ul></body></html>".encode())
+
+    def host_for(self, i):
+        return f"127.0.0.{i % self.hosts + 1}"
+
+    def url_for(self, i):
+        return f"http://{self.host_for(i)}:{self.port}/org/{i}"
+
+    async def handle_page(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.rnd.uniform(*self.latency_ms) / 1000)
+        return web.Response(body=self.html[int(request.match_info["index"])], content_type="text/html", charset="utf-8")
+
+    async def handle_robots(self, request):
+        return web.Response(text="User-agent: *\nDisallow: /private/\n")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/org/{index}", self.handle_page)
+        app.router.add_get("/robots.txt", self.handle_robots)
+        for k in range(self.hosts):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, f"127.0.0.{k + 1}", self.port).start()
+            self.runners.append(runner)
+
+    def start_in_thread(self):
+        """동기 baseline(requests)이 루프를 막지 않도록 별도 스레드의 이벤트 루프에서 서비스"""
+        ready = threading.Event()
+
+        def serve():
+            self.loop = asyncio.new_event_loop()
+            self.loop.run_until_complete(self.start())
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        ready.wait()
+        return self
+
+
+def run_sync(mirror, delay, max_pages):
+    """기존 방식: requests로 한 페이지씩 받고 매번 sleep (링크는 BFS로 따라감)"""
+    crawler = GovCrawler()
+    crawler.delay = delay
+    seen = {normalize_url(mirror.url_for(0))}
+    frontier = deque(seen)
+    pages = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while frontier and pages < max_pages:
+            url = frontier.popleft()
+            response = crawler.session.get(url, timeout=10)
+            pages += 1
+            for full_url, text in crawler.extract_links(response.content, url):
+                if crawler.add_org(full_url, text):
+                    continue
+                key = normalize_url(full_url)
+                if key and "/org/" in key and key not in seen:
+                    seen.add(key)
+                    frontier.append(key)
+            time.sleep(crawler.delay)
+    elapsed = time.perf_counter() - started
+    rate = pages / elapsed
+    return {
+        "mode": "baseline",
+        "pages": pages,
+        "wallS": round(elapsed, 2),
+        "pagesPerSec": round(rate, 1),
+        "estTotalS": round(mirror.pages / rate, 1),
+        "orgs": len(crawler.org_data),
+    }
+
+
+def make_crawler(mirror, args, state_file, max_pages=None):
+    crawler = AsyncGovCrawler(seeds=[mirror.url_for(0)], max_depth=args.depth, concurrency=args.concurrency,
+                              host_delay=args.delay, state_file=state_file, max_pages=max_pages,
+                              follow_hosts={f"{mirror.host_for(k)}:{mirror.port}" for k in range(mirror.hosts)})
+    return crawler
+
+
+def run_async(mirror, args, state_file, max_pages=None, resume=False):
+    crawler = make_crawler(mirror, args, state_file, max_pages)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if resume:
+            crawler.load_state()
+        started = time.perf_counter()
+        asyncio.run(crawler.crawl())
+    return crawler, time.perf_counter() - started
+
+
+def main(args):
+    mirror = PortalMirror(pages=args.pages, hosts=args.hosts, port=args.port).start_in_thread()
+    rows = [run_sync(mirror, args.delay, args.sync_pages)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "frontier.json")
+
+        mirror.requests = 0
+        crawler, elapsed = run_async(mirror, args, state_file)
+        full_orgs = {url for _, url in crawler.org_data}
+        rows.append({
+            "mode": "async",
+            "pages": crawler.stats["pages"],
+            "wallS": round(elapsed, 2),
+            "pagesPerSec": crawler.stats["pagesPerSec"],
+            "estTotalS": round(elapsed, 1),
+            "orgs": len(full_orgs),
+            "robotsBlocked": crawler.stats["robotsBlocked"],
+            "requests": mirror.requests,
+        })
+
+        # 절반에서 중단 → 새 프로세스처럼 frontier 파일에서 이어받기
+        mirror.requests = 0
+        first, t1 = run_async(mirror, args, state_file, max_pages=args.pages // 2)
+        saved = os.path.exists(state_file)
+        second, t2 = run_async(mirror, args, state_file, resume=True)
+        resumed_orgs = {url for _, url in second.org_data}
+        rows.append({
+            "mode": "resume",
+            "pages": second.stats["pages"],
+            "wallS": round(t1 + t2, 2),
+            "pagesPerSec": round(second.stats["pages"] / (t1 + t2), 1),
+            "estTotalS": round(t1 + t2, 1),
+            "orgs": len(resumed_orgs),
+            "robotsBlocked": second.stats["robotsBlocked"],
+            "requests": mirror.requests,
+            "stateSaved": saved,
+            "sameOrgs": resumed_orgs == full_orgs,
+        })
+
+    mirror.loop.call_soon_threadsafe(mirror.loop.stop)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--port", type=int, default=18180)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--delay", type=float, default=0.1, help="같은 호스트 요청 간격 (baseline은 페이지마다 sleep)")
+    parser.add_argument("--sync-pages", type=int, default=150, help="baseline을 돌릴 페이지 수 (나머지는 추정)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(main(args), args.json)
@@ -0,0 +1,130 @@
+"""
+기관별 타임아웃 + 헤지 요청 + 리셋 재시도 벤치마크 (장애 주입)
+=============================================================
+
+별도 프로세스로 띄운 사이트 팜에 장애를 섞는다.
+- hang: 응답하지 않음 (실제 장애, problem이 정답)
+- stall: faultRate 확률로 35초 멈춤 (일시적, normal이 정답)
+- reset: faultRate 확률로 응답 전에 연결을 끊음 (일시적, normal이 정답)
+
+사이트별 정상 지연으로 7일치 agency_daily 이력을 만들어 SiteDeadlines에 넣은 뒤
+모드별로 전체 소요 시간, problem 판정 수, 오판(일시 장애인데 problem), 놓친 장애, 재시도/헤지 수를 비교한다.
+- baseline: 전체 30초 타임아웃 하나, 재시도 없음 (기존 방식)
+- deadlines: 기관별 타임아웃만
+- full: 기관별 타임아웃 + 헤지 요청 + 리셋 재시도
+
+사용법:
+    python tasks/bench/bench_deadlines.py --sites 740 --hang 0.02 --stall 0.03 --reset 0.05
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+from datetime import datetime, timezone, timedelta
+
+from common import MemoryDB, Timer, emit
+from site_farm import FarmProcess, farm_args, farm_from_args
+from checker.deadlines import SiteDeadlines
+from checker.stats import StatsBuilder
+from checker.status_checker import StatusChecker
+from checker.storage import Storage
+
+FAULTS = {"hang": 0.02, "stall": 0.03, "reset": 0.05}
+
+
+def inject_faults(farm, rates=None):
+    rates = rates or FAULTS
+    for site in farm.sites:
+        roll = farm.rnd.random()
+        for fault, rate in rates.items():
+            if roll < rate:
+                site["fault"] = fault
+                if fault != "hang":
+                    site["faultRate"] = 0.5
+                break
+            roll -= rate
+
+
+def seed_history(db, farm, days, per_day, seed):
+    """사이트별 정상 지연(+30% 흔들림)으로 agency_daily 이력 생성"""
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for d in range(days):
+        day = Storage.rollup_day(now - timedelta(days=d))
+        for site in farm.sites:
+            aid = f"site-{site['index']}"
+            results = [{"agencyId": aid, "status": "normal",
+                        "responseTime": int(site["latencyMs"] * (1 + rnd.random() * 0.3)) + 2,
+                        "timing": {"queueMs": 0, "dnsMs": 0, "connectMs": 1, "ttfbMs": 0, "bodyMs": 0}}
+                       for _ in range(per_day)]
+            keys = {"agencyId": aid, "date": day}
+            db["agency_daily"].update_one(keys, StatsBuilder.rollup_update(StatsBuilder.rollup(results), keys), upsert=True)
+
+
+async def run_mode(agencies, mode, deadlines):
+    checker = StatusChecker(
+        deadlines=deadlines if mode != "baseline" else None,
+        hedge_ratio=0.1 if mode == "full" else 0,
+        reset_retries=1 if mode == "full" else 0,
+        timing_sample_rate=0,
+    )
+    with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+        await checker.check_sites(agencies)
+    return t, checker
+
+
+def main(args):
+    rates = {"hang": args.hang, "stall": args.stall, "reset": args.reset}
+    farm = farm_from_args(args)
+    inject_faults(farm, rates)
+    faults = {f"site-{s['index']}": s["fault"] for s in farm.sites}
+
+    db = MemoryDB()
+    seed_history(db, farm, args.days, args.per_day, args.seed)
+    deadlines = SiteDeadlines(db).load()
+
+    argv = [f"--{k.replace('_', '-')}={v}" for k, v in vars(args).items()
+            if k not in ("hang", "stall", "reset", "days", "per_day", "modes", "json") and v is not None]
+    rows = []
+    for mode in args.modes.split(","):
+        # 모드마다 팜을 새로 띄워 장애 발생 순서를 같게
+        with FarmProcess(argv + [f"--mutate=bench_deadlines:inject_faults_{args.hang}_{args.stall}_{args.reset}"]):
+            t, checker = asyncio.run(run_mode(farm.agencies(), mode, deadlines))
+        problems = [r for r in checker.results if r["status"] == "problem"]
+        attempts = checker.run_stats["attempts"]
+        rows.append({
+            "mode": mode,
+            "wallS": round(t.wall, 2),
+            "problem": len(problems),
+            "falseProblem": sum(1 for r in problems if faults[r["agencyId"]] != "hang"),
+            "missed": sum(1 for r in checker.results if faults[r["agencyId"]] == "hang" and r["status"] != "problem"),
+            "hedged": attempts["hedged"],
+            "hedgeWins": attempts["hedgeWins"],
+            "resetRetries": attempts["resetRetries"],
+            "resetRecovered": attempts["resetRecovered"],
+        })
+    return rows
+
+
+def __getattr__(name):
+    # FarmProcess의 --mutate는 "모듈:함수" 형식이라 장애 비율을 함수 이름에 담아 넘긴다
+    if name.startswith("inject_faults_"):
+        hang, stall, reset = (float(x) for x in name[len("inject_faults_"):].split("_"))
+        return lambda farm: inject_faults(farm, {"hang": hang, "stall": stall, "reset": reset})
+    raise AttributeError(name)
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--hang", type=float, default=FAULTS["hang"])
+    parser.add_argument("--stall", type=float, default=FAULTS["stall"])
+    parser.add_argument("--reset", type=float, default=FAULTS["reset"])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--per-day", type=int, default=24)
+    parser.add_argument("--modes", default="baseline,deadlines,full")
+    parser.add_argument("--json", action="store_true")
+    parser.set_defaults(capacity=0)
+    args = parser.parse_args()
+    emit(main(args), args.json)
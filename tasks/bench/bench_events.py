@@ -0,0 +1,174 @@
+"""
+상태 변화 이벤트 로그 vs hourly_stats 집계 벤치마크
+==================================================
+
+기관별로 5분 간격 검사 결과(가끔 장애/점검)를 days일치 만들어 두 방식으로 저장한다.
+- hourly: 검사마다 hourly_stats 기관·시간 문서에 $inc (기존 방식, 조회 시 시간 버킷을 모두 읽어 합산)
+- events: Storage.save_events로 상태가 바뀔 때만 status_events/status_index 기록
+
+그 뒤 대시보드 질의를 두 방식으로 실행해 읽은 문서 수, DB 왕복, 소요 시간을 비교한다.
+- uptime: 기관 1곳의 최근 window일 가동률
+- outage: 기관 1곳의 현재 상태 지속 시간
+- worst: 최근 window일 장애 시간 상위 10곳
+
+사용법:
+    python tasks/bench/bench_events.py --agencies 741 --days 14
+    python tasks/bench/bench_events.py --mongodb-uri mongodb://localhost:27017 --days 30
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone, timedelta
+
+from common import emit, make_db
+from checker.events import StatusEvents
+from checker.indexes import ensure_indexes
+from checker.stats import STATUSES
+from checker.storage import Storage
+
+SLOT_MIN = 5
+
+
+def make_timelines(agencies, slots, outage_rate, seed):
+    """기관별 슬롯 상태 목록. 슬롯마다 outage_rate 확률로 장애(평균 6슬롯) 또는 점검(평균 12슬롯) 시작"""
+    rnd = random.Random(seed)
+    timelines = []
+    for _ in range(agencies):
+        states, k = [], 0
+        while k < slots:
+            if rnd.random() < outage_rate:
+                status = "problem" if rnd.random() < 0.8 else "maintenance"
+                length = 1 + int(rnd.expovariate(1 / (6 if status == "problem" else 12)))
+            else:
+                status, length = "normal", 1
+            states += [status] * length
+            k += length
+        timelines.append(states[:slots])
+    return timelines
+
+
+def load_hourly(db, timelines, start):
+    """hourly_stats: 기관·시간마다 상태별 검사 수 (기존 Storage.save_hourly와 같은 모양)"""
+    writes, docs = 0, []
+    per_hour = 60 // SLOT_MIN
+    for i, states in enumerate(timelines):
+        for h in range(0, len(states), per_hour):
+            chunk = states[h:h + per_hour]
+            stats = {s: chunk.count(s) for s in STATUSES}
+            docs.append({"agencyId": f"agency-{i}", "timestampHour": start + timedelta(minutes=h * SLOT_MIN),
+                         "stats": {"total": len(chunk), **stats}})
+            writes += len(chunk)  # 실제로는 검사마다 $inc upsert 1건
+    for k in range(0, len(docs), 5000):
+        db["hourly_stats"].insert_many(docs[k:k + 5000])
+    return writes, len(docs)
+
+
+def load_events(db, timelines, start):
+    """검사 슬롯 순서대로 상태가 바뀐 기관만 Storage.save_events에 넘긴다 (그대로인 기관은 어차피 쓰지 않음)"""
+    storage = Storage(db)
+    writes = 0
+    for k in range(len(timelines[0])):
+        at = start + timedelta(minutes=k * SLOT_MIN)
+        changed = [({"agencyId": f"agency-{i}", "status": states[k], "responseTime": 100}, at)
+                   for i, states in enumerate(timelines) if k == 0 or states[k] != states[k - 1]]
+        if changed:
+            storage.batch_reports = []
+            storage.save_events(changed, at)
+            writes += sum(rep["ops"] for rep in storage.batch_reports)
+    return writes
+
+
+def timed(counter, fn):
+    counter.reset()
+    t0 = time.perf_counter()
+    value, docs_read = fn()
+    return {"ms": round((time.perf_counter() - t0) * 1000, 2), "docsRead": docs_read, "roundTrips": counter.total}, value
+
+
+def hourly_queries(db, agency_id, since):
+    def uptime():
+        docs = list(db["hourly_stats"].find({"agencyId": agency_id, "timestampHour": {"$gte": since}}))
+        total = sum(d["stats"]["total"] for d in docs)
+        return sum(d["stats"]["normal"] for d in docs) / total, len(docs)
+
+    def outage():
+        # 최신 시간부터 거슬러 올라가며 상태가 달라지는 시간까지 읽는다
+        docs = db["hourly_stats"].find({"agencyId": agency_id}, sort=[("timestampHour", -1)])
+        last = StatusEvents.hourly_status(docs[0]["stats"])
+        read = 0
+        for d in docs:
+            read += 1
+            if StatusEvents.hourly_status(d["stats"]) != last:
+                break
+        return read, read
+
+    def worst():
+        docs = list(db["hourly_stats"].find({"timestampHour": {"$gte": since}}))
+        down = {}
+        for d in docs:
+            down[d["agencyId"]] = down.get(d["agencyId"], 0) + d["stats"]["problem"]
+        return sorted(down, key=lambda a: -down[a])[:10], len(docs)
+
+    return {"uptime": uptime, "outage": outage, "worst": worst}
+
+
+def event_queries(events, agency_id, since, now, window):
+    def uptime():
+        return events.uptime(agency_id, since, now)["uptime"], 2
+
+    def outage():
+        return events.current(agency_id, now)["durationS"], 1
+
+    def worst():
+        rows = events.worst(10, window)
+        return [r["agencyId"] for r in rows], len(rows)
+
+    return {"uptime": uptime, "outage": outage, "worst": worst}
+
+
+def main(args):
+    slots = args.days * 24 * 60 // SLOT_MIN
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    now = start + timedelta(minutes=slots * SLOT_MIN)
+    since = now - timedelta(days=args.window)
+    timelines = make_timelines(args.agencies, slots, args.outage_rate, args.seed)
+
+    db, counter = make_db(args.mongodb_uri, args.database)
+    ensure_indexes(db)
+    events = StatusEvents(db, windows=(args.window,))
+    hourly_writes, hourly_docs = load_hourly(db, timelines, start)
+    event_writes = load_events(db, timelines, start)
+    # 마지막 검사 이후 구간 집계를 now 기준으로 갱신 (평소에는 Storage가 STATUS_WINDOW_REFRESH_MIN마다)
+    Storage(db).write_updates("status_index", events.window_updates(now))
+    event_docs = db["status_events"].count_documents({})
+
+    # 장애가 가장 잦은 기관 기준으로 조회
+    target = max(range(args.agencies), key=lambda i: timelines[i].count("problem"))
+    agency_id = f"agency-{target}"
+    rows = [{"store": "hourly", "docs": hourly_docs, "writes": hourly_writes},
+            {"store": "events", "docs": event_docs, "writes": event_writes}]
+    for row, queries in ((rows[0], hourly_queries(db, agency_id, since)),
+                         (rows[1], event_queries(events, agency_id, since, now, args.window))):
+        for name, fn in queries.items():
+            stats, value = timed(counter, fn)
+            row[f"{name}Ms"] = stats["ms"]
+            row[f"{name}Docs"] = stats["docsRead"]
+            row[f"{name}Rtt"] = stats["roundTrips"]
+            if name == "uptime":
+                row["uptime"] = round(value, 4)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agencies", type=int, default=741)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--window", type=int, default=7, help="가동률/순위 구간 (일)")
+    parser.add_argument("--outage-rate", type=float, default=0.002, help="슬롯(5분)마다 장애/점검이 시작될 확률")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--database", default="gov_status_bench")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(main(args), args.json)
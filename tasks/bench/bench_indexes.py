@@ -0,0 +1,75 @@
+"""
+인덱스 유무에 따른 hourly_stats upsert 지연 벤치마크 (로컬 mongod 필요)
+=======================================================================
+
+hourly_stats에 N건(기본 100만 건 = 740기관 x 약 1350시간)을 채운 뒤
+Storage와 같은 upsert를 인덱스 없이/있이 실행해 p50/p99 지연을 비교한다.
+
+사용법:
+    python tasks/bench/bench_indexes.py --mongodb-uri mongodb://localhost:27017 --docs 1000000
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone, timedelta
+
+from common import make_db, fake_results, emit
+from checker.storage import Storage
+from checker.indexes import ensure_indexes
+
+
+def fill(db, docs, agencies):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(docs):
+        hour, agency = divmod(i, len(agencies))
+        batch.append({
+            "agencyId": agencies[agency]["agencyId"],
+            "timestampHour": base + timedelta(hours=hour),
+            "stats": {"total": 12, "normal": 12, "maintenance": 0, "problem": 0},
+        })
+        if len(batch) == 10000:
+            db["hourly_stats"].insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db["hourly_stats"].insert_many(batch, ordered=False)
+    return base + timedelta(hours=docs // len(agencies))
+
+
+def measure(db, results, bucket_time, samples):
+    latencies = []
+    for r in results[:samples]:
+        flt, update = Storage.hourly_update(r, bucket_time)
+        t0 = time.perf_counter()
+        db["hourly_stats"].update_one(flt, update, upsert=True)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return {
+        "p50Ms": round(latencies[len(latencies) // 2], 2),
+        "p99Ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        "totalS": round(sum(latencies) / 1000, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mongodb-uri", required=True)
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--agencies", type=int, default=740)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    db, _ = make_db(args.mongodb_uri)
+    results = fake_results(args.agencies)
+    print(f"hourly_stats {args.docs}건 적재 중...")
+    last_hour = fill(db, args.docs, results)
+
+    rows = []
+    rows.append({"indexes": "none", "docs": args.docs, **measure(db, results, last_hour, args.samples)})
+    t0 = time.perf_counter()
+    ensure_indexes(db)
+    build_s = round(time.perf_counter() - t0, 1)
+    rows.append({"indexes": f"ensure_indexes ({build_s}s)", "docs": args.docs,
+                 **measure(db, results, last_hour + timedelta(hours=1), args.samples)})
+    emit(rows, args.json)
@@ -0,0 +1,181 @@
+"""
+링크 추출 벤치마크: 기존 crawl_page 링크 처리 vs 빠른 경로
+==========================================================
+
+저장된 대형 HTML 페이지(기본: 링크 1만 개 이상을 가진 합성 디렉터리 페이지)를 대상으로
+링크 추출 + 기관 필터 + 중복 체크까지의 처리량(links/s)과 tracemalloc 최대 메모리를 비교한다.
+
+- legacy:   html.parser 전체 파싱 + 링크마다 패턴 목록 재검색 + org_data 리스트 재생성 후 멤버십 검사
+- bs4:      html.parser 전체 파싱 + 합친 정규식 + 정규화 URL 집합
+- strainer: BeautifulSoup(lxml) + SoupStrainer('a')
+- lxml:     lxml.html 직접 순회 (GovCrawler 기본값)
+
+사용법:
+    python tasks/bench/bench_linkparse.py --pages 3 --links 12000
+    python tasks/bench/bench_linkparse.py --html-dir saved_pages/
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from common import emit
+from crawler.gov_crawler import GovCrawler
+
+
+class LegacyCrawler(GovCrawler):
+    """변경 전 GovCrawler의 링크 처리 (비교 기준)"""
+
+    def is_gov_domain(self, url):
+        if not url:
+            return False
+        try:
+            domain = urlparse(url).netloc.lower()
+            if 'gov.kr' in domain:
+                return False
+            gov_patterns = [r'\.go\.kr$', r'\.gov\.kr$', r'\.or\.kr$', r'\.re\.kr$', r'\.ac\.kr$']
+            return any(re.search(pattern, domain) for pattern in gov_patterns)
+        except Exception:
+            return False
+
+    def is_valid_site(self, url, text=""):
+        if not url:
+            return False
+        exclude_patterns = [
+            r'/bbs/', r'/board/', r'/event/', r'/contest/', r'/gongmo/',
+            r'/privacy', r'/policy', r'/notice/', r'/news/', r'/content/',
+            r'#', r'\.pdf$', r'\.xlsx$', r'\.doc$', r'\.zip$'
+        ]
+        exclude_keywords = [
+            '공모전', '이벤트', '대회', '개인정보처리방침', '공지사항',
+            '보도자료', '뉴스', '게시판', '자료실', '다운로드',
+            '로그인', '회원가입', '바로가기', '웹접근성', '배너'
+        ]
+        if any(re.search(pattern, url, re.IGNORECASE) for pattern in exclude_patterns):
+            return False
+        text_lower = text.lower()
+        return not any(keyword in text_lower for keyword in exclude_keywords)
+
+    def process(self, html, base_url):
+        soup = BeautifulSoup(html, 'html.parser')
+        links = soup.find_all('a', href=True)
+        for link in links:
+            href = link['href'].strip()
+            text = link.get_text(strip=True)
+            full_url = urljoin(base_url, href)
+            if self.is_gov_domain(full_url) and self.is_valid_site(full_url, text):
+                existing_urls = [url for _, url in self.org_data]
+                if full_url not in existing_urls:
+                    org_name = self.extract_org_name(full_url, text)
+                    self.org_data.append((org_name, full_url))
+        return len(links)
+
+
+class FastCrawler(GovCrawler):
+    def process(self, html, base_url):
+        n = 0
+        for full_url, text in self.extract_links(html, base_url):
+            n += 1
+            self.add_org(full_url, text)
+        return n
+
+
+def make_page(links, orgs, rnd):
+    """기관 링크(중복/표기 변형 포함), 포털 내부 링크, 제외 대상 링크가 섞인 디렉터리 페이지"""
+    rows = []
+    for i in range(links):
+        kind = rnd.random()
+        if kind < 0.5:
+            host = f"www.org{rnd.randrange(orgs)}.go.kr"
+            variant = rnd.random()
+            if variant < 0.2:
+                href = f"https://{host.upper()}/"       # 대문자 호스트 + 끝 슬래시
+            elif variant < 0.3:
+                href = f"https://{host}:443"            # 기본 포트 명시
+            else:
+                href = f"https://{host}"
+            text = f"기관 {i}" if rnd.random() < 0.7 else ""
+        elif kind < 0.7:
+            href, text = f"https://www.gov.kr/portal/orgInfo/{i}", "기관 안내"
+        elif kind < 0.85:
+            href, text = f"https://www.org{rnd.randrange(orgs)}.go.kr/bbs/list.do?id={i}", "공지사항"
+        else:
+            href, text = f"/portal/orgInfo?page={i}", "다음"
+        rows.append(f'<li class="org"><span class="cat">분류</span><a href="{href}" title="새창">{text}</a></li>')
+    return f"<html><head><title>기관 목록</title></head><body><ul>{''.join(rows)}</ul></body></html>"
+
+
+def load_pages(args, tmp):
+    if args.html_dir:
+        paths = sorted(glob.glob(os.path.join(args.html_dir, "*.htm*")))
+    else:
+        rnd = random.Random(args.seed)
+        paths = []
+        for k in range(args.pages):
+            path = os.path.join(tmp, f"page{k}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(make_page(args.links, args.orgs, rnd))
+            paths.append(path)
+    return paths
+
+
+def run(mode, paths, trace=False):
+    crawler = LegacyCrawler() if mode == "legacy" else FastCrawler()
+    if mode != "legacy":
+        crawler.parser = mode
+    if trace:
+        tracemalloc.start()
+    links = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in paths:
+            with open(path, "rb") as f:
+                links += crawler.process(f.read(), "https://www.gov.kr/portal/orgInfo")
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return links, elapsed, len(crawler.org_data), peak
+
+
+def main(args):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = load_pages(args, tmp)
+        size = sum(os.path.getsize(p) for p in paths)
+        for mode in ("legacy", "bs4", "strainer", "lxml"):
+            links, elapsed, orgs, _ = run(mode, paths)
+            _, _, _, peak = run(mode, paths, trace=True)
+            rows.append({
+                "mode": mode,
+                "links": links,
+                "wallS": round(elapsed, 3),
+                "linksPerSec": round(links / elapsed),
+                "MBps": round(size / elapsed / 1e6, 1),
+                "peakMB": round(peak / 1e6, 1),
+                "orgs": orgs,
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--links", type=int, default=12000, help="페이지당 링크 수")
+    parser.add_argument("--orgs", type=int, default=8000, help="서로 다른 기관 도메인 수")
+    parser.add_argument("--html-dir", default=None, help="저장해 둔 HTML 페이지 디렉터리 (지정 시 합성 페이지 대신 사용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(main(args), args.json)
@@ -0,0 +1,97 @@
+"""
+점검 키워드 매처 마이크로 벤치마크
+==================================
+
+기존 방식(디코딩 후 키워드마다 text.lower() + in 검사), 키워드 전체를 한 번에 훑는 bytes 정규식(a|b|...)과
+KeywordMatcher(bytes.lower() 1회 + 키워드마다 bytes.find, 전체/16KB 청크 스트리밍)의 처리량(MB/s)을 비교한다.
+
+사용법:
+    python tasks/bench/bench_matcher.py --corpus saved_pages/   # 저장해 둔 실제 포털 HTML (*.html)
+    python tasks/bench/bench_matcher.py --keywords 40            # 합성 페이지 + 키워드 40개
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from common import emit
+from site_farm import make_page
+from checker.matcher import KeywordMatcher
+
+BASE_KEYWORDS = ["점검", "일시중단", "서비스중단", "maintenance", "개선작업"]
+EXTRA_KEYWORDS = [
+    "정기점검", "시스템 점검", "서버 점검", "긴급 점검", "작업 중", "서비스 이용이 제한", "이용에 불편",
+    "잠시 후 다시", "접속이 원활하지", "서비스 준비중", "under construction", "temporarily unavailable",
+    "service unavailable", "scheduled downtime", "be right back", "down for maintenance", "업데이트 중",
+    "장애", "복구 중", "시스템 개편", "홈페이지 개편", "서비스 일시 중지", "서비스를 일시적으로",
+    "이용하실 수 없습니다", "점검시간", "작업시간", "중단 안내", "차단", "일시 정지", "운영 중단",
+    "migration", "upgrade in progress", "please try again later", "not available", "오픈 예정",
+]
+
+
+def legacy_match(raw, keywords):
+    text = raw.decode(errors="ignore")
+    for kw in keywords:
+        if kw.lower() in text.lower():
+            return kw
+    return None
+
+
+def alternation(matcher):
+    """단일 패스 비교용: 같은 패턴을 하나의 정규식으로 (가장 앞 위치, 같은 위치면 먼저 나온 키워드)"""
+    pattern = re.compile(b"|".join(re.escape(p) for p in matcher.patterns))
+    return lambda page: pattern.search(page.lower())
+
+
+def load_corpus(path, pages):
+    if path:
+        files = sorted(glob.glob(os.path.join(path, "*.htm*")))
+        return [open(f, "rb").read() for f in files]
+    # 키워드 없는 정상 페이지가 대부분인 합성 코퍼스 (최악의 경우: 끝까지 훑어야 함)
+    return [make_page(300_000 + i * 1000) for i in range(pages)]
+
+
+def throughput(fn, corpus, repeat):
+    size = sum(len(p) for p in corpus) * repeat
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for page in corpus:
+            fn(page)
+    elapsed = time.perf_counter() - t0
+    return round(size / 1024 / 1024 / elapsed, 1)
+
+
+def stream_search(matcher, page, chunk=16 * 1024):
+    stream = matcher.stream()
+    for i in range(0, len(page), chunk):
+        found = stream.feed(page[i:i + chunk])
+        if found:
+            return found
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keywords", default="5,40", help="비교할 키워드 개수 목록")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.pages)
+    rows = []
+    for n in [int(k) for k in args.keywords.split(",")]:
+        keywords = (BASE_KEYWORDS + EXTRA_KEYWORDS)[:n]
+        matcher = KeywordMatcher(keywords)
+        rows.append({
+            "keywords": len(keywords),
+            "corpusMB": round(sum(len(p) for p in corpus) / 1024 / 1024, 1),
+            "legacyMBs": throughput(lambda p: legacy_match(p, keywords), corpus, args.repeat),
+            "regexMBs": throughput(alternation(matcher), corpus, args.repeat),
+            "matcherMBs": throughput(matcher.search, corpus, args.repeat),
+            "streamMBs": throughput(lambda p: stream_search(matcher, p), corpus, args.repeat),
+        })
+    emit(rows, args.json)
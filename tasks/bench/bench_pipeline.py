@@ -0,0 +1,151 @@
+"""
+전체 파이프라인 벤치마크 (검사 → StatsBuilder → Storage)
+========================================================
+
+gov_sites.csv로 만든 사이트 팜(별도 프로세스)을 상대로 main.py와 같은 CycleRunner 1회
+(대상 선정 → 검사 → 재검사 → 롤업/overall/스냅샷 저장)를 그대로 실행한다.
+배수(--scales)마다 팜과 측정 프로세스를 새로 띄우므로 CPU 시간과 최대 RSS가 배수별로 따로 잡힌다.
+DB는 --mongodb-uri의 로컬 mongod(매 실행 drop), 없으면 인프로세스 MemoryDB(--db-latency-ms로 원격 RTT 모사).
+
+팜 설정: 지연 분포(--latency-dist, --min/max-latency), 페이지 크기(--page-bytes, --page-sigma),
+오류(--error-rate), 무응답(--timeout-rate), 점검 페이지(--maintenance-rate), 인증서 오류(--ssl-rate)
+
+결과 행: wallS, cpuS, 단계별 시간(checkS/retryS/storeS), p50Ms/p99Ms(응답시간), peakRssMb, dbRoundTrips,
+판정 수와 팜이 정한 정답과 다른 판정 수(mismatched). --out 파일에는 meta(커밋, 파이썬, 인자)와 함께 JSON으로 남긴다.
+
+사용법:
+    python tasks/bench/bench_pipeline.py --scales 1,10,100 --out bench-$(git rev-parse --short HEAD).json
+    python tasks/bench/bench_pipeline.py --mongodb-uri mongodb://localhost:27017 --scales 1,10
+    python tasks/bench/bench_pipeline.py --scales 1 --timeout-rate 0 --error-rate 0 --latency-dist fixed
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timezone
+
+from common import TASKS_DIR, Timer, emit, make_db
+from site_farm import FarmProcess, farm_args, farm_argv, farm_from_args
+from checker.indexes import ensure_indexes
+from checker.sites import agency_id_for
+from runner import CycleRunner
+
+
+def write_csv(path, agencies):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["기관명", "URL"])
+        writer.writerows([a["name"], a["url"]] for a in agencies)
+
+
+async def run_cycle(db, csv_file):
+    runner = CycleRunner(db, csv_file)
+    with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+        result = await runner.run()
+    return t, result, runner.writer.snapshot
+
+
+def child(args):
+    """배수 1개 측정: 팜과 같은 인자로 사이트 목록(정답 포함)을 다시 만들고 CycleRunner 1회 실행, 결과 행을 JSON 한 줄로 출력"""
+    farm = farm_from_args(args)
+    expected = {agency_id_for(a["url"]): site["expected"] for a, site in zip(farm.agencies(), farm.sites)}
+    db, counter = make_db(args.mongodb_uri, args.database, latency_ms=args.db_latency_ms)
+    ensure_indexes(db)
+    counter.reset()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "sites.csv")
+        write_csv(csv_file, farm.agencies())
+        t, result, snapshot = asyncio.run(run_cycle(db, csv_file))
+
+    verdicts = Counter(entry["status"] for entry in snapshot.values())
+    phases = result["phases"]
+    row = {
+        "scale": args.scale,
+        "sites": len(farm.sites),
+        "wallS": round(t.wall, 2),
+        "cpuS": round(t.cpu, 2),
+        "checkS": round(phases.get("check", 0) / 1000, 2),
+        "retryS": round(phases.get("retry", 0) / 1000, 2),
+        "storeS": round(phases.get("store", 0) / 1000, 2),
+        "p50Ms": round(result["latency"].get("p50", 0), 1),
+        "p99Ms": round(result["latency"].get("p99", 0), 1),
+        "peakRssMb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "dbRoundTrips": counter.total,
+        "normal": verdicts["normal"],
+        "maintenance": verdicts["maintenance"],
+        "problem": verdicts["problem"],
+        "mismatched": sum(1 for aid, entry in snapshot.items() if expected.get(aid) != entry["status"]),
+    }
+    if args.json:
+        row["dbCommands"] = dict(counter.commands)
+    print(json.dumps(row))
+
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=TASKS_DIR, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, cwd=TASKS_DIR).stdout.strip()
+        return f"{rev}{'-dirty' if dirty else ''}"
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args):
+    rows = []
+    for scale in (int(x) for x in args.scales.split(",")):
+        args.scale = scale
+        with FarmProcess(farm_argv(args)):
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--child",
+                                   f"--scale={scale}"], stdout=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"배수 {scale} 측정 실패 (종료 코드 {proc.returncode})")
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        # 큰 배수는 오래 걸리므로 끝난 배수는 바로 남긴다
+        print(f"✅ 배수 {scale}: {json.dumps(rows[-1])}", file=sys.stderr)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--scales", default="1,10,100", help="기관 목록 배수 (쉼표 구분)")
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--database", default="gov_status_bench")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="MemoryDB 사용 시 왕복당 지연 (Atlas RTT 모사)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일 (meta + 행)")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.set_defaults(csv=os.path.join(TASKS_DIR, "gov_sites.csv"), capacity=0, latency_dist="lognormal",
+                        min_latency=50, max_latency=1500, page_bytes=32768, page_sigma=0.8, error_rate=0.02,
+                        timeout_rate=0.002, maintenance_rate=0.01, ssl_rate=0.02)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        sys.exit(0)
+
+    started = datetime.now(timezone.utc)
+    rows = main(args)
+    if args.out:
+        meta = {
+            "revision": git_revision(),
+            "startedAt": started.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("child", "out", "json", "scale")},
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "runs": rows}, f, ensure_ascii=False, indent=2)
+    emit(rows, args.json)
@@ -0,0 +1,59 @@
+"""
+본문 프로브 벤치마크: 전체 read() vs 청크 스트리밍(partial)
+==========================================================
+
+별도 프로세스로 띄운 사이트 팜이 큰 합성 페이지를 내려주고,
+모드별로 수신 바이트, 클라이언트 CPU 시간, 전체 소요 시간, 점검 탐지 수를 비교한다.
+
+사용법:
+    python tasks/bench/bench_probe.py --page-bytes 400000 --max-bytes 131072
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+
+from common import Timer, emit
+from site_farm import FarmProcess, farm_args, farm_from_args
+from checker.status_checker import StatusChecker
+
+
+def add_keywords(farm):
+    # 10%는 페이지 앞부분, 5%는 페이지 끝부분에 점검 문구 삽입
+    for site in farm.sites:
+        roll = farm.rnd.random()
+        if roll < 0.10:
+            site["keyword"], site["keywordAt"] = "시스템 점검 중입니다", 0.02
+        elif roll < 0.15:
+            site["keyword"], site["keywordAt"] = "시스템 점검 중입니다", 0.98
+
+
+async def run_mode(agencies, mode, max_bytes):
+    checker = StatusChecker(probe_mode=mode, max_bytes=max_bytes)
+    with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+        await checker.check_sites(agencies)
+    return {
+        "mode": mode,
+        "wallS": round(t.wall, 2),
+        "cpuS": round(t.cpu, 2),
+        "bytesReadMB": round(checker.run_stats["bytesRead"] / 1024 / 1024, 1),
+        "maintenance": len(checker.summary["maintenance"]),
+        "problem": len(checker.summary["problem"]),
+    }
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--max-bytes", type=int, default=128 * 1024)
+    parser.add_argument("--json", action="store_true")
+    parser.set_defaults(page_bytes=400_000, capacity=0)
+    args = parser.parse_args()
+
+    farm = farm_from_args(args)
+    add_keywords(farm)
+    argv = [f"--{k.replace('_', '-')}={v}" for k, v in vars(args).items()
+            if k not in ("max_bytes", "json") and v is not None]
+    with FarmProcess(argv + ["--mutate=bench_probe:add_keywords"]):
+        rows = [asyncio.run(run_mode(farm.agencies(), mode, args.max_bytes)) for mode in ("full", "partial")]
+    emit(rows, args.json)
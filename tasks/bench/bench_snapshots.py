@@ -0,0 +1,104 @@
+"""
+실행별 스냅샷 저장 크기/조회 벤치마크
+=====================================
+
+5분 주기 실행 한 주(2016회) × 기관 740개를 기준으로
+- legacy: overall_stats 형식(agencyId 문자열 + status + responseTime 딕셔너리 목록) 문서를 실행마다 보관한다고 가정
+- columnar: run_snapshots (uint8 상태 + uint16 응답시간 바이너리, 기관 인덱스 표는 한 번만)
+의 문서 크기(BSON)와 한 주치를 (실행 × 기관) NumPy 배열로 읽어 들이는 시간을 비교한다.
+
+사용법:
+    python tasks/bench/bench_snapshots.py --agencies 740 --runs 2016
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone, timedelta
+
+import bson
+import numpy as np
+
+from common import MemoryDB, emit, fake_results
+from checker.snapshots import RunSnapshots, RunSeries, STATUS_CODES, STATUS_MISSING
+from checker.storage import Storage
+
+
+def make_runs(agencies, runs, seed):
+    base = fake_results(agencies, seed)
+    rnd = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for k in range(runs):
+        snapshot = []
+        for r in base:
+            status = rnd.choices(["normal", "maintenance", "problem"], weights=[95, 2, 3])[0]
+            rt = rnd.randint(50, 3000) if status != "problem" else None
+            snapshot.append({"agencyId": r["agencyId"], "status": status, "responseTime": rt})
+        yield start + timedelta(minutes=5 * k), snapshot
+
+
+def legacy_decode(docs):
+    """legacy 문서 목록 → (실행 × 기관) 배열 (순수 파이썬 루프)"""
+    columns = {}
+    for doc in docs:
+        for a in doc["agencies"]:
+            columns.setdefault(a["agencyId"], len(columns))
+    statuses = np.full((len(docs), len(columns)), STATUS_MISSING, dtype=np.uint8)
+    times = np.full((len(docs), len(columns)), np.nan, dtype=np.float32)
+    for i, doc in enumerate(docs):
+        for a in doc["agencies"]:
+            j = columns[a["agencyId"]]
+            statuses[i, j] = STATUS_CODES[a["status"]]
+            if a["responseTime"] is not None:
+                times[i, j] = a["responseTime"]
+    return statuses, times
+
+
+def main(args):
+    db = MemoryDB()
+    storage = Storage(db)
+    legacy_docs, legacy_bytes, columnar_bytes = [], 0, 0
+    started = None
+    for now, snapshot in make_runs(args.agencies, args.runs, args.seed):
+        started = started or now
+        overall = Storage.count_overall(snapshot)
+        legacy = {"timestamp": now, "overall": overall, "agencies": snapshot}
+        legacy_bytes += len(bson.encode(legacy))
+        legacy_docs.append(bson.decode(bson.encode(legacy)))
+        storage.save_overall(snapshot, overall, now)
+    for doc in db["run_snapshots"].find({}):
+        doc.pop("_id", None)
+        columnar_bytes += len(bson.encode(doc))
+    index_bytes = len(bson.encode({"agencyIds": storage.snapshots.agency_ids}))
+
+    t0 = time.perf_counter()
+    statuses, _ = legacy_decode(legacy_docs)
+    legacy_ms = (time.perf_counter() - t0) * 1000
+
+    docs = list(db["run_snapshots"].find({"timestamp": {"$gte": started}}, sort=[("timestamp", 1)]))
+    t0 = time.perf_counter()
+    series = RunSeries.decode(docs, storage.snapshots.agency_ids)
+    columnar_ms = (time.perf_counter() - t0) * 1000
+    assert (series.statuses == statuses).all()
+
+    t0 = time.perf_counter()
+    RunSnapshots(db).load(started)
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    mb = 1024 * 1024
+    return [
+        {"format": "legacy", "runs": args.runs, "totalMB": round(legacy_bytes / mb, 2),
+         "bytesPerRun": legacy_bytes // args.runs, "decodeMs": round(legacy_ms, 1), "loadMs": "-"},
+        {"format": "columnar", "runs": args.runs, "totalMB": round((columnar_bytes + index_bytes) / mb, 2),
+         "bytesPerRun": columnar_bytes // args.runs, "decodeMs": round(columnar_ms, 1), "loadMs": round(load_ms, 1)},
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agencies", type=int, default=740)
+    parser.add_argument("--runs", type=int, default=2016, help="실행 횟수 (기본: 5분 주기 1주)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(main(args), args.json)
@@ -0,0 +1,127 @@
+"""
+통계 엔진 벤치마크: StatsBuilder.build(순수 파이썬 카운트) vs NumPy 벡터화 요약
+==============================================================================
+
+합성 결과 10만/100만 건(기관 740곳 × 반복, 분류는 AgencyManager.classify_agency)에 대해
+- build:        기존 구현 (상태 개수만)
+- python:       같은 요약(개수 + 분위수 + 히스토그램, 분류별)을 순수 파이썬으로 계산
+- summarize:    StatsBuilder.summarize (dict 목록 → NumPy)
+- arrays:       StatsBuilder.summarize_arrays (이미 배열인 경우, 예: RunSeries)
+의 소요 시간을 비교하고, 시간별 히스토그램 24개를 합친 분위수의 오차(정확한 값 대비)를 출력한다.
+
+사용법:
+    python tasks/bench/bench_stats.py --sizes 100000 1000000
+"""
+
+import argparse
+import bisect
+import random
+import time
+
+import numpy as np
+
+from common import TASKS_DIR, emit
+from checker.agencies import AgencyManager
+from checker.sites import load_sites
+from checker.stats import StatsBuilder, LatencyHistogram, STATUSES, LATENCY_BUCKETS, N_BUCKETS
+from config import LATENCY_PERCENTILES
+
+CSV_FILE = TASKS_DIR + "/gov_sites.csv"
+
+
+def make_results(n, agencies, seed):
+    rnd = random.Random(seed)
+    results = []
+    for i in range(n):
+        a = agencies[i % len(agencies)]
+        status = rnd.choices(STATUSES, weights=[90, 3, 7])[0]
+        rt = None if status == "problem" and rnd.random() < 0.5 else int(rnd.lognormvariate(6.0, 0.8))
+        results.append({"agencyId": a["agencyId"], "status": status, "responseTime": rt})
+    return results
+
+
+def python_summary(results, categories):
+    """summarize와 같은 결과를 순수 파이썬으로"""
+    groups = {}
+    for r in results:
+        main, sub = categories[r["agencyId"]]
+        for key in ("overall", main, f"{main}/{sub}"):
+            g = groups.setdefault(key, {"counts": dict.fromkeys(STATUSES, 0), "times": []})
+            g["counts"][r["status"]] += 1
+            if r["responseTime"] is not None:
+                g["times"].append(r["responseTime"])
+    out = {}
+    for key, g in groups.items():
+        times = sorted(g["times"])
+        hist = [0] * N_BUCKETS
+        for t in times:
+            hist[bisect.bisect_right(LATENCY_BUCKETS, t)] += 1
+        row = dict(g["counts"])
+        for p in LATENCY_PERCENTILES:
+            pos = (len(times) - 1) * p / 100
+            lo = int(pos)
+            hi = min(lo + 1, len(times) - 1)
+            row[f"p{p}"] = times[lo] + (times[hi] - times[lo]) * (pos - lo) if times else None
+        row["latencyHist"] = hist
+        out[key] = row
+    return out
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, round((time.perf_counter() - t0) * 1000, 1)
+
+
+def main(args):
+    agencies = load_sites(CSV_FILE)
+    classify = AgencyManager(db={}).classify_agency
+    categories = {}
+    for a in agencies:
+        c = classify(a["name"])
+        categories[a["agencyId"]] = (c["mainCategory"], c["subCategory"])
+
+    rows = []
+    for n in args.sizes:
+        results = make_results(n, agencies, args.seed)
+        _, build_ms = timed(StatsBuilder.build, results)
+        expected, python_ms = timed(python_summary, results, categories)
+        summary, numpy_ms = timed(StatsBuilder.summarize, results, categories)
+
+        statuses = np.array([STATUSES.index(r["status"]) for r in results], dtype=np.int8)
+        times = np.array([np.nan if r["responseTime"] is None else r["responseTime"] for r in results])
+        group = np.zeros(n, dtype=np.int64)
+        _, arrays_ms = timed(StatsBuilder.summarize_arrays, statuses, times, group, 1)
+
+        assert summary["overall"]["latencyHist"] == expected["overall"]["latencyHist"]
+        assert all(abs(summary["overall"][f"p{p}"] - expected["overall"][f"p{p}"]) < 0.1 for p in LATENCY_PERCENTILES)
+
+        # 시간별 히스토그램 24개를 합쳐 구한 분위수 vs 정확한 분위수
+        merged = LatencyHistogram()
+        for chunk in np.array_split(times, 24):
+            merged = merged.merge(LatencyHistogram.of(chunk))
+        approx = merged.percentiles()
+        error = max(abs(approx[k] - summary["overall"][k]) / summary["overall"][k] for k in approx)
+
+        rows.append({
+            "results": n,
+            "groups": len(summary["mainCategory"]) + len(summary["subCategory"]) + 1,
+            "buildMs": build_ms,
+            "pythonMs": python_ms,
+            "summarizeMs": numpy_ms,
+            "arraysMs": arrays_ms,
+            "speedup": f"{python_ms / numpy_ms:.1f}x",
+            "p95": summary["overall"]["p95"],
+            "mergedP95": approx["p95"],
+            "mergeMaxErr": f"{error * 100:.1f}%",
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    emit(main(args), args.json)
@@ -0,0 +1,49 @@
+"""
+Storage 쓰기 벤치마크: 개별 update_one vs bulk_write
+====================================================
+
+사용법:
+    python tasks/bench/bench_storage.py                     # 인메모리 대체 DB
+    python tasks/bench/bench_storage.py --latency-ms 2      # 왕복당 2ms 지연 모사
+    python tasks/bench/bench_storage.py --mongodb-uri mongodb://localhost:27017
+"""
+
+import argparse
+import contextlib
+import io
+
+from common import make_db, fake_results, Timer, emit
+from checker.storage import Storage
+
+
+def run(sizes, uri, batch_size, latency_ms):
+    rows = []
+    for n in sizes:
+        results = fake_results(n)
+        for mode in ("single", "bulk"):
+            db, counter = make_db(uri, latency_ms=latency_ms)
+            storage = Storage(db, batch_size=batch_size, bulk=(mode == "bulk"))
+            counter.reset()
+            with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+                storage.save_hourly_and_overall(results)
+            rows.append({
+                "agencies": n,
+                "mode": mode,
+                "roundTrips": counter.total,
+                "wallMs": round(t.wall * 1000, 1),
+                "batches": len(storage.batch_reports),
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--sizes", default="700,5000,50000")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="인메모리 DB 사용 시 왕복당 지연 (Atlas RTT 모사)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    emit(run(sizes, args.mongodb_uri, args.batch_size, args.latency_ms), args.json)
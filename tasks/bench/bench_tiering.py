@@ -0,0 +1,144 @@
+"""
+계층형 검사 주기 시뮬레이션
+============================
+
+합성한 한 달치 기관 상태 이력(대부분 안정, 일부 불안정 기관)을 5분 단위로 재생하며
+매 실행 전체 검사(baseline)와 checker.tiers.interval_for 기반 계층형 검사를 비교한다.
+요청 수, 장애 탐지 지연(장애 시작 → 첫 탐지), 놓친 장애 수와 함께
+hourly_stats 카운터로 계산한 problem 비율(problemPct, 재검사 제외 + checker.tiers.weight_for 가중치)을
+실제 비율(truePct, 모든 실행 시점 기준)과 재검사/가중치 없이 센 비율(unweightedPct)과 비교한다.
+
+사용법:
+    python tasks/bench/bench_tiering.py --agencies 740 --days 30
+"""
+
+import argparse
+import bisect
+import random
+from collections import deque
+
+from common import emit
+from checker.tiers import interval_for, weight_for
+from config import RUN_INTERVAL, TIER_STABLE_HOURS, TIER_RECENT_HOURS, FAST_RETRY_DELAYS
+
+
+def make_outages(n, days, flaky_ratio, seed):
+    """기관별 (시작분, 종료분, 상태) 목록"""
+    rnd = random.Random(seed)
+    horizon = days * 24 * 60
+    outages = []
+    for _ in range(n):
+        rate = 1.0 if rnd.random() < flaky_ratio else 0.05  # 하루 평균 장애 횟수
+        events, t = [], 0.0
+        while True:
+            t += rnd.expovariate(rate / (24 * 60))
+            if t >= horizon:
+                break
+            duration = min(rnd.lognormvariate(3.0, 1.0), 24 * 60)  # 중앙값 약 20분
+            status = "maintenance" if rnd.random() < 0.2 else "problem"
+            events.append((t, t + duration, status))
+            t += duration
+        outages.append(events)
+    return outages
+
+
+def status_at(events, starts, minute):
+    i = bisect.bisect_right(starts, minute) - 1
+    if i >= 0 and events[i][0] <= minute < events[i][1]:
+        return events[i][2], i
+    return "normal", None
+
+
+def simulate(outages, days, tiered):
+    ticks = days * 24 * 60 // RUN_INTERVAL
+    requests = 0
+    latencies, detected_total, outage_total = [], 0, 0
+    counters = {"problem": 0, "total": 0, "rawProblem": 0, "rawTotal": 0, "trueProblem": 0, "trueTotal": 0}
+
+    for events in outages:
+        starts = [e[0] for e in events]
+        detected = set()
+        hourly = deque(maxlen=TIER_STABLE_HOURS)  # (hour, total, nonNormal)
+        next_due = 0
+        interval = None  # 직전 실행에서 정한 검사 주기 (가중치 계산용)
+
+        def probe(minute):
+            status, idx = status_at(events, starts, minute)
+            if idx is not None and idx not in detected:
+                detected.add(idx)
+                latencies.append(minute - events[idx][0])
+            hour = int(minute // 60)
+            if not hourly or hourly[-1][0] != hour:
+                hourly.append([hour, 0, 0])
+            hourly[-1][1] += 1
+            hourly[-1][2] += status != "normal"
+            return status
+
+        for tick in range(ticks):
+            minute = tick * RUN_INTERVAL
+            counters["trueTotal"] += 1
+            counters["trueProblem"] += status_at(events, starts, minute)[0] == "problem"
+            if tiered and minute + 1 < next_due:
+                continue
+            requests += 1
+            status = probe(minute)
+            # hourly_stats: 첫 검사만 가중치를 곱해 센다 (재검사는 스냅샷/상태 이벤트에만 반영)
+            weight = weight_for(interval) if tiered else 1
+            counters["total"] += weight
+            counters["problem"] += weight * (status == "problem")
+            counters["rawTotal"] += 1
+            counters["rawProblem"] += status == "problem"
+            if not tiered:
+                continue
+
+            # 같은 실행 안의 빠른 재검사
+            for delay in FAST_RETRY_DELAYS:
+                if status != "problem":
+                    break
+                requests += 1
+                status = probe(minute + delay / 60)
+                counters["rawTotal"] += 1
+                counters["rawProblem"] += status == "problem"
+
+            hour = int(minute // 60)
+            window = [h for h in hourly if h[0] > hour - TIER_STABLE_HOURS]
+            history = {
+                "hours": len(window),
+                "nonNormal": sum(h[2] for h in window),
+                "recentNonNormal": sum(h[2] for h in window if h[0] > hour - TIER_RECENT_HOURS),
+            }
+            interval = interval_for(history, status)
+            next_due = minute + interval
+
+        outage_total += len(events)
+        detected_total += len(detected)
+
+    latencies.sort()
+    pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1) if latencies else None
+    return {
+        "mode": "tiered" if tiered else "baseline",
+        "requests": requests,
+        "outages": outage_total,
+        "missed": outage_total - detected_total,
+        "detectMeanMin": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        "detectP95Min": pct(0.95),
+        "truePct": round(counters["trueProblem"] / counters["trueTotal"] * 100, 2),
+        "problemPct": round(counters["problem"] / counters["total"] * 100, 2),
+        "unweightedPct": round(counters["rawProblem"] / counters["rawTotal"] * 100, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agencies", type=int, default=740)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--flaky-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    outages = make_outages(args.agencies, args.days, args.flaky_ratio, args.seed)
+    rows = [simulate(outages, args.days, tiered) for tiered in (False, True)]
+    rows[1]["saved"] = f"{(1 - rows[1]['requests'] / rows[0]['requests']) * 100:.1f}%"
+    rows[0]["saved"] = "-"
+    emit(rows, args.json)
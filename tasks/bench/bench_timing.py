@@ -0,0 +1,67 @@
+"""
+요청 단계별 시간 측정 오버헤드 벤치마크
+======================================
+
+별도 프로세스로 띄운 사이트 팜을 측정 비율(TIMING_SAMPLE_RATE)별로 검사해
+클라이언트 CPU 시간/전체 소요 시간과 집계된 단계별 평균(대기, DNS, 연결, 첫 바이트, 본문)을 비교한다.
+팜의 지연은 서버 쪽 sleep이므로 대부분 ttfb로 잡혀야 한다.
+
+사용법:
+    python tasks/bench/bench_timing.py --sites 740 --rates 0,0.1,1 --repeat 3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+from statistics import median
+
+from common import Timer, emit
+from site_farm import FarmProcess, farm_args
+from checker.status_checker import StatusChecker
+
+
+async def run_rate(agencies, rate):
+    checker = StatusChecker(timing_sample_rate=rate)
+    with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+        await checker.check_sites(agencies)
+    return t, checker.run_stats.get("timing", {})
+
+
+def main(args):
+    agencies = [
+        {"agencyId": f"site-{i}", "url": f"http://127.0.0.{i % args.hosts + 1}:{args.port}/site/{i}"}
+        for i in range(args.sites)
+    ]
+    argv = [f"--{k.replace('_', '-')}={v}" for k, v in vars(args).items()
+            if k not in ("rates", "repeat", "json") and v is not None]
+    rows = []
+    with FarmProcess(argv):
+        for rate in (float(r) for r in args.rates.split(",")):
+            runs = [asyncio.run(run_rate(agencies, rate)) for _ in range(args.repeat)]
+            timing = runs[-1][1]
+            row = {
+                "sampleRate": rate,
+                "wallS": round(median(t.wall for t, _ in runs), 2),
+                "cpuS": round(median(t.cpu for t, _ in runs), 3),
+                "sampled": timing.get("sampled", 0),
+            }
+            for phase, v in timing.get("phases", {}).items():
+                row[f"{phase}Mean"] = v["mean"]
+            if "ttfb" in timing.get("phases", {}):
+                row["ttfbP95"] = timing["phases"]["ttfb"]["p95"]
+            rows.append(row)
+    base = rows[0]["cpuS"]
+    for row in rows:
+        row["cpuOverhead"] = f"{(row['cpuS'] / base - 1) * 100:+.1f}%" if base else "-"
+    return rows
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--rates", default="0,0.1,1", help="비교할 측정 비율 (쉼표 구분, 첫 값이 기준)")
+    parser.add_argument("--repeat", type=int, default=3, help="비율별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--json", action="store_true")
+    parser.set_defaults(capacity=0)
+    args = parser.parse_args()
+    emit(main(args), args.json)
@@ -0,0 +1,157 @@
+"""
+분산 검사 워커 확장성 벤치마크
+==============================
+
+사이트 팜(별도 프로세스)과 공유 DB를 두고 worker.py의 ShardWorker를 N개 프로세스로 동시에 띄워
+한 실행(runId)을 나눠 검사한다. 공유 DB는 --mongodb-uri의 로컬 mongod, 없으면
+multiprocessing 매니저로 띄운 MemoryDB(명령 단위로 잠금)를 쓴다.
+
+- N(--workers)별 전체 소요 시간(프로세스 시작 포함), 조각 검사 구간 시간, 처리량(기관/초), 워커별 조각 수
+- --kill: 워커 하나를 첫 조각 도중 SIGKILL 해서 만료된 임대가 다른 워커에게 넘어가고 병합까지 끝나는지 확인
+
+사용법:
+    python tasks/bench/bench_workers.py --sites 2960 --workers 1,2,4,8
+    python tasks/bench/bench_workers.py --mongodb-uri mongodb://localhost:27017 --workers 1,2,4,8 --kill
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import RemoteDB, emit, make_db, serve_shared_db
+from site_farm import FarmProcess, farm_args, farm_from_args
+
+
+def write_csv(path, agencies):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["기관명", "URL"])
+        writer.writerows([a["name"], a["url"]] for a in agencies)
+
+
+def child(args):
+    """워커 프로세스 1개: 공유 DB에 붙어 ShardWorker 실행 후 결과를 JSON 한 줄로 출력"""
+    from worker import ShardWorker
+    if args.mongodb_uri:
+        from pymongo import MongoClient
+        db = MongoClient(args.mongodb_uri)[args.database]
+    else:
+        host, port = args.db_address.split(":")
+        db = RemoteDB((host, int(port)))
+    worker = ShardWorker(db, args.sites_csv, worker_id=args.worker_id, shard_size=args.shard_size, ttl=args.ttl,
+                         heartbeat=args.heartbeat, poll=0.2, concurrency=args.concurrency)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(worker.run(args.run_id))
+    print(json.dumps(result))
+
+
+def spawn(n, run_id, csv_file, db_args, args):
+    base = [sys.executable, os.path.abspath(__file__), "--child", "--sites-csv", csv_file, "--run-id", run_id,
+            "--shard-size", str(args.shard_size), "--ttl", str(args.ttl), "--heartbeat", str(args.heartbeat),
+            "--concurrency", str(args.concurrency), *db_args]
+    return [subprocess.Popen(base + ["--worker-id", f"w{i}"], stdout=subprocess.PIPE, text=True) for i in range(n)]
+
+
+def wait_for_claim(db, run_id, worker_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if db["scan_leases"].find_one({"runId": run_id, "owner": worker_id, "state": "leased"}):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run_workers(n, csv_file, sites, args, kill=False):
+    if args.mongodb_uri:
+        db, _ = make_db(args.mongodb_uri, args.database)
+        from checker.indexes import ensure_indexes
+        ensure_indexes(db)
+        manager, db_args = None, ["--mongodb-uri", args.mongodb_uri, "--database", args.database]
+    else:
+        manager, address = serve_shared_db()
+        db, db_args = RemoteDB(address), ["--db-address", f"{address[0]}:{address[1]}"]
+
+    run_id = f"bench-{n}{'-kill' if kill else ''}"
+    try:
+        t0 = time.perf_counter()
+        procs = spawn(n, run_id, csv_file, db_args, args)
+        if kill:
+            # w0이 첫 조각을 가져가면 바로 죽인다 → 임대 만료(ttl) 후 다른 워커가 다시 가져가야 함
+            wait_for_claim(db, run_id, "w0")
+            procs[0].send_signal(signal.SIGKILL)
+        outputs = [p.communicate()[0] for p in procs]
+        wall = time.perf_counter() - t0
+
+        overall = db["overall_stats"].find_one({}) or {}
+        distributed = (overall.get("run") or {}).get("distributed") or {}
+        shards_per_worker = [w["shards"] for w in distributed.get("workers", {}).values()]
+        scan_s = (distributed.get("scanMs") or 0) / 1000
+        results = [json.loads(out.strip().splitlines()[-1]) for out in outputs if out.strip()]
+        return {
+            "workers": n,
+            "killed": 1 if kill else 0,
+            "wallS": round(wall, 2),
+            "scanS": round(scan_s, 2),
+            "sitesPerS": round(sites / scan_s, 1) if scan_s else "-",
+            "shards": distributed.get("shards"),
+            "shardsPerWorker": f"{min(shards_per_worker)}-{max(shards_per_worker)}" if shards_per_worker else "-",
+            "reclaimed": distributed.get("reclaimed"),
+            "merged": len(overall.get("agencies", [])),
+            "mergedBy": next((r["workerId"] for r in results if r["merged"]), "-"),
+        }
+    finally:
+        if manager:
+            manager.shutdown()
+
+
+def main(args):
+    farm = farm_from_args(args)
+    agencies = farm.agencies()
+    argv = [f"--{k}={getattr(args, k.replace('-', '_'))}" for k in
+            ("sites", "hosts", "port", "capacity", "min-latency", "max-latency", "page-bytes", "seed")]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, FarmProcess(argv):
+        csv_file = os.path.join(tmp, "sites.csv")
+        write_csv(csv_file, agencies)
+        for n in (int(x) for x in args.workers.split(",")):
+            rows.append(run_workers(n, csv_file, len(agencies), args))
+        if args.kill:
+            rows.append(run_workers(max(2, int(args.workers.split(",")[-1])), csv_file, len(agencies), args, kill=True))
+    base = rows[0]["sitesPerS"]
+    for row in rows:
+        row["speedup"] = f"{row['sitesPerS'] / base:.2f}x" if isinstance(base, float) and row["sitesPerS"] != "-" else "-"
+    return rows
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--shard-size", type=int, default=50)
+    parser.add_argument("--ttl", type=float, default=3.0, help="임대 유효 시간 (초, --kill 복구 시간을 줄이려고 짧게)")
+    parser.add_argument("--heartbeat", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=30, help="워커별 초기 동시성 한도")
+    parser.add_argument("--kill", action="store_true", help="워커 하나를 도중에 죽이는 실행 추가")
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--database", default="gov_status_bench")
+    parser.add_argument("--json", action="store_true")
+    # 워커 프로세스용
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sites-csv", default=None, help=argparse.SUPPRESS)  # --csv는 팜 옵션
+    parser.add_argument("--run-id", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-id", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--db-address", default=None, help=argparse.SUPPRESS)
+    parser.set_defaults(sites=2960, hosts=40, capacity=0, min_latency=200, max_latency=2000)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+    else:
+        emit(main(args), args.json)
@@ -0,0 +1,499 @@
+"""
+벤치마크 공용 유틸
+==================
+
+- 로컬 mongod(--mongodb-uri) 또는 인프로세스 대체 DB(MemoryDB) 생성
+- DB 왕복(round-trip) 횟수 집계
+"""
+
+import os
+import sys
+import json
+import time
+from collections import Counter
+
+TASKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_tasks_path():
+    """tasks/를 sys.path 앞에 추가해 벤치마크가 checker/config를 import할 수 있게 한다 (여러 번 불러도 한 번만 추가)"""
+    if TASKS_DIR not in sys.path:
+        sys.path.insert(0, TASKS_DIR)
+    return TASKS_DIR
+
+
+# 벤치마크는 `from common import ...`를 checker/config보다 먼저 import하므로 여기서 한 번 설정해 둔다
+add_tasks_path()
+
+
+class RoundTripCounter:
+    """pymongo CommandListener: 실제 mongod로 나간 명령 수 집계"""
+
+    def __init__(self):
+        self.commands = Counter()
+
+    @property
+    def total(self):
+        return sum(self.commands.values())
+
+    def reset(self):
+        self.commands.clear()
+
+    # pymongo.monitoring.CommandListener 인터페이스
+    def started(self, event):
+        self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def _get(doc, path):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return None
+        doc = doc[part]
+    return doc
+
+
+def _set(doc, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _match_value(value, cond):
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        for op, arg in cond.items():
+            if op == "$in" and value not in arg: return False
+            if op == "$nin" and value in arg: return False
+            if op == "$ne" and value == arg: return False
+            if op == "$exists" and (value is not None) != bool(arg): return False
+            if op in ("$lt", "$lte", "$gt", "$gte"):
+                if value is None: return False
+                if op == "$lt" and not value < arg: return False
+                if op == "$lte" and not value <= arg: return False
+                if op == "$gt" and not value > arg: return False
+                if op == "$gte" and not value >= arg: return False
+        return True
+    return value == cond
+
+
+def _matches(doc, flt):
+    for key, cond in (flt or {}).items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond): return False
+        elif key == "$and":
+            if not all(_matches(doc, sub) for sub in cond): return False
+        elif not _match_value(_get(doc, key), cond):
+            return False
+    return True
+
+
+def _eval(doc, expr):
+    """집계 식 일부 ($필드, $add, $cond, 비교, $ifNull, 상수)"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get(doc, expr[1:])
+    if isinstance(expr, dict) and len(expr) == 1:
+        (op, args), = expr.items()
+        if op == "$ifNull":
+            value = _eval(doc, args[0])
+            return _eval(doc, args[1]) if value is None else value
+        values = [_eval(doc, a) for a in args] if isinstance(args, list) else [_eval(doc, args)]
+        if op == "$add":
+            return sum(v or 0 for v in values)
+        if op == "$cond":
+            return values[1] if values[0] else values[2]
+        if op in ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte"):
+            a, b = values
+            if op in ("$eq", "$ne"):
+                return (a == b) == (op == "$eq")
+            if a is None or b is None:
+                return False
+            return {"$gt": a > b, "$gte": a >= b, "$lt": a < b, "$lte": a <= b}[op]
+    return expr
+
+
+def _group(docs, spec):
+    groups = {}
+    for doc in docs:
+        key = _eval(doc, spec["_id"])
+        out = groups.setdefault(repr(key), {"_id": key})
+        for field, acc in spec.items():
+            if field == "_id":
+                continue
+            (op, arg), = acc.items()
+            value = _eval(doc, arg)
+            if op == "$sum":
+                out[field] = out.get(field, 0) + (value or 0)
+            elif op == "$min":
+                out[field] = value if field not in out else min(out[field], value)
+            elif op == "$max":
+                out[field] = value if field not in out else max(out[field], value)
+            elif op == "$first":
+                out.setdefault(field, value)
+            elif op == "$last":
+                out[field] = value
+            elif op == "$push":
+                out.setdefault(field, []).append(value)
+    return list(groups.values())
+
+
+class _Result:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MemoryCollection:
+    """테스트/벤치용 최소 인메모리 컬렉션 (pymongo 호환 일부 메서드만 지원)"""
+
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = []
+        self._next_id = 0
+        self._eq_indexes = {}  # 동등 조건 필터용 해시 인덱스 (keys -> {values: [docs]})
+
+    def _rtt(self, command):
+        self.db.counter.commands[command] += 1
+        if self.db.latency_ms:
+            time.sleep(self.db.latency_ms / 1000)
+
+    def _apply_update(self, doc, update, inserting):
+        if not any(k.startswith("$") for k in update):
+            keep_id = doc.get("_id")
+            doc.clear()
+            doc.update(update)
+            doc["_id"] = keep_id
+            return
+        for op, fields in update.items():
+            for path, value in fields.items():
+                cur = _get(doc, path)
+                if op == "$set":
+                    _set(doc, path, value)
+                elif op == "$setOnInsert":
+                    if inserting: _set(doc, path, value)
+                elif op == "$inc":
+                    _set(doc, path, (cur or 0) + value)
+                elif op == "$min":
+                    _set(doc, path, value if cur is None else min(cur, value))
+                elif op == "$max":
+                    _set(doc, path, value if cur is None else max(cur, value))
+                elif op == "$unset":
+                    doc.pop(path, None)
+                elif op == "$push":
+                    if cur is None:
+                        cur = []
+                        _set(doc, path, cur)
+                    if isinstance(value, dict) and "$each" in value:
+                        cur.extend(value["$each"])
+                        if "$slice" in value and value["$slice"] < 0:
+                            del cur[:len(cur) + value["$slice"]]
+                    else:
+                        cur.append(value)
+
+    def _insert(self, doc):
+        doc = dict(doc)
+        if "_id" not in doc:
+            self._next_id += 1
+            doc["_id"] = self._next_id
+        self.docs.append(doc)
+        for keys, index in self._eq_indexes.items():
+            index.setdefault(tuple(_get(doc, k) for k in keys), []).append(doc)
+        return doc
+
+    def _candidates(self, flt):
+        if not flt or any(k.startswith("$") or isinstance(v, (dict, list)) for k, v in flt.items()):
+            return self.docs
+        keys = tuple(sorted(flt))
+        if keys not in self._eq_indexes:
+            index = {}
+            for doc in self.docs:
+                index.setdefault(tuple(_get(doc, k) for k in keys), []).append(doc)
+            self._eq_indexes[keys] = index
+        return self._eq_indexes[keys].get(tuple(flt[k] for k in keys), [])
+
+    def _invalidate(self, update=None):
+        if update is None or not any(k.startswith("$") for k in update):
+            self._eq_indexes.clear()
+            return
+        touched = {path.split(".")[0] for fields in update.values() for path in fields}
+        for keys in [k for k in self._eq_indexes if touched & {p.split(".")[0] for p in k}]:
+            del self._eq_indexes[keys]
+
+    def _update(self, flt, update, upsert=False, many=False):
+        matched = 0
+        for doc in list(self._candidates(flt)):
+            if _matches(doc, flt):
+                self._apply_update(doc, update, inserting=False)
+                self._invalidate(update)
+                matched += 1
+                if not many:
+                    break
+        if matched == 0 and upsert:
+            base = {k: v for k, v in (flt or {}).items() if not k.startswith("$") and not isinstance(v, dict)}
+            self._apply_update(base, update, inserting=True)
+            self._insert(base)
+        return matched
+
+    # --- pymongo 호환 메서드 ---
+    def update_one(self, flt, update, upsert=False):
+        self._rtt("update")
+        return _Result(matched_count=self._update(flt, update, upsert))
+
+    def update_many(self, flt, update, upsert=False):
+        self._rtt("update")
+        return _Result(matched_count=self._update(flt, update, upsert, many=True))
+
+    def replace_one(self, flt, doc, upsert=False):
+        self._rtt("update")
+        return _Result(matched_count=self._update(flt, doc, upsert))
+
+    def insert_one(self, doc):
+        self._rtt("insert")
+        return _Result(inserted_id=self._insert(doc)["_id"])
+
+    def insert_many(self, docs, ordered=True):
+        self._rtt("insert")
+        return _Result(inserted_ids=[self._insert(d)["_id"] for d in docs])
+
+    def delete_many(self, flt):
+        self._rtt("delete")
+        self._invalidate()
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if not _matches(d, flt)]
+        return _Result(deleted_count=before - len(self.docs))
+
+    def delete_one(self, flt):
+        self._rtt("delete")
+        self._invalidate()
+        for i, d in enumerate(self.docs):
+            if _matches(d, flt):
+                del self.docs[i]
+                return _Result(deleted_count=1)
+        return _Result(deleted_count=0)
+
+    def bulk_write(self, requests, ordered=True):
+        from pymongo import UpdateOne, UpdateMany, ReplaceOne, InsertOne, DeleteOne, DeleteMany
+        self._rtt("bulkWrite")
+        for req in requests:
+            if isinstance(req, InsertOne):
+                self._insert(req._doc)
+            elif isinstance(req, (UpdateOne, ReplaceOne)):
+                self._update(req._filter, req._doc, req._upsert)
+            elif isinstance(req, UpdateMany):
+                self._update(req._filter, req._doc, req._upsert, many=True)
+            elif isinstance(req, DeleteOne):
+                self._invalidate()
+                for i, d in enumerate(self.docs):
+                    if _matches(d, req._filter):
+                        del self.docs[i]
+                        break
+            elif isinstance(req, DeleteMany):
+                self._invalidate()
+                self.docs = [d for d in self.docs if not _matches(d, req._filter)]
+        return _Result(bulk_api_result={})
+
+    def find(self, flt=None, projection=None, sort=None, limit=0):
+        self._rtt("find")
+        docs = [dict(d) for d in self._candidates(flt) if _matches(d, flt)]
+        if sort:
+            for key, direction in reversed(sort):
+                docs.sort(key=lambda d: (_get(d, key) is None, _get(d, key)), reverse=direction < 0)
+        return docs[:limit] if limit else docs
+
+    def find_one(self, flt=None, projection=None, sort=None):
+        docs = self.find(flt, sort=sort, limit=1)
+        return docs[0] if docs else None
+
+    def find_one_and_update(self, flt, update, upsert=False, sort=None, return_document=False):
+        self._rtt("findAndModify")
+        docs = [d for d in self._candidates(flt) if _matches(d, flt)]
+        if sort:
+            for key, direction in reversed(sort):
+                docs.sort(key=lambda d: (_get(d, key) is None, _get(d, key)), reverse=direction < 0)
+        if docs:
+            before = dict(docs[0])
+            self._apply_update(docs[0], update, inserting=False)
+            self._invalidate(update)
+            return dict(docs[0]) if return_document else before
+        if upsert:
+            base = {k: v for k, v in (flt or {}).items() if not k.startswith("$") and not isinstance(v, dict)}
+            self._apply_update(base, update, inserting=True)
+            doc = self._insert(base)
+            return dict(doc) if return_document else None
+        return None
+
+    def aggregate(self, pipeline):
+        """$match / $group / $sort / $limit 단계만 지원"""
+        self._rtt("aggregate")
+        docs = [dict(d) for d in self.docs]
+        for stage in pipeline:
+            (op, arg), = stage.items()
+            if op == "$match":
+                docs = [d for d in docs if _matches(d, arg)]
+            elif op == "$group":
+                docs = _group(docs, arg)
+            elif op == "$sort":
+                for key, direction in reversed(list(arg.items())):
+                    docs.sort(key=lambda d: (_get(d, key) is None, _get(d, key)), reverse=direction < 0)
+            elif op == "$limit":
+                docs = docs[:arg]
+            else:
+                raise NotImplementedError(f"MemoryDB aggregate: {op}")
+        return iter(docs)
+
+    def count_documents(self, flt):
+        self._rtt("count")
+        return sum(1 for d in self.docs if _matches(d, flt))
+
+    def distinct(self, key, flt=None):
+        self._rtt("distinct")
+        seen = []
+        for d in self.docs:
+            if _matches(d, flt):
+                v = _get(d, key)
+                if v not in seen:
+                    seen.append(v)
+        return seen
+
+    def create_indexes(self, models):
+        self._rtt("createIndexes")
+        return [m.document["name"] for m in models]
+
+    def create_index(self, keys, **kwargs):
+        self._rtt("createIndexes")
+        return "_".join(f"{k}_{v}" for k, v in keys) if isinstance(keys, list) else f"{keys}_1"
+
+
+class MemoryDB:
+    """mongomock 스타일 인프로세스 대체 DB. latency_ms로 원격 클러스터 RTT를 흉내낸다"""
+
+    def __init__(self, counter=None, latency_ms=0.0):
+        self.counter = counter or RoundTripCounter()
+        self.latency_ms = latency_ms
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+
+class _SharedStore:
+    """매니저 서버 안의 MemoryDB. 연결마다 스레드가 따로 돌므로 명령 하나를 잠금으로 원자적으로 실행"""
+
+    def __init__(self):
+        import threading
+        self.db = MemoryDB()
+        self.lock = threading.Lock()
+
+    def call(self, collection, method, args, kwargs):
+        with self.lock:
+            return getattr(self.db[collection], method)(*args, **kwargs)
+
+
+_STORE = None
+
+
+def _shared_store():
+    return _STORE
+
+
+class _RemoteCollection:
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+
+    def __getattr__(self, method):
+        return lambda *args, **kwargs: self._store.call(self._name, method, args, kwargs)
+
+
+class RemoteDB:
+    """serve_shared_db로 띄운 MemoryDB에 붙는 클라이언트 (db["컬렉션"].메서드(...)만 지원)"""
+
+    def __init__(self, address, authkey=b"gov-status-bench"):
+        from multiprocessing.managers import BaseManager
+
+        class _Client(BaseManager):
+            pass
+
+        _Client.register("store")
+        self._manager = _Client(address=address, authkey=authkey)
+        self._manager.connect()
+        self._store = self._manager.store()
+
+    def __getitem__(self, name):
+        return _RemoteCollection(self._store, name)
+
+
+def serve_shared_db(authkey=b"gov-status-bench"):
+    """mongod 없이 여러 프로세스가 함께 쓰는 MemoryDB 서버 (multiprocessing 매니저). (manager, address) 반환"""
+    from multiprocessing.managers import BaseManager
+    global _STORE
+    _STORE = _SharedStore()
+
+    class _Server(BaseManager):
+        pass
+
+    _Server.register("store", callable=_shared_store)
+    manager = _Server(address=("127.0.0.1", 0), authkey=authkey)
+    manager.start()
+    return manager, manager.address
+
+
+def make_db(uri=None, database="gov_status_bench", latency_ms=0.0):
+    """(db, counter) 반환. uri가 없으면 인메모리 대체 DB 사용"""
+    counter = RoundTripCounter()
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri, event_listeners=[counter])
+        client.drop_database(database)
+        return client[database], counter
+    return MemoryDB(counter, latency_ms=latency_ms), counter
+
+
+def fake_results(n, seed=0):
+    import random
+    import uuid
+    rnd = random.Random(seed)
+    results = []
+    for i in range(n):
+        url = f"https://site{i}.example.go.kr/"
+        status = rnd.choices(["normal", "maintenance", "problem"], weights=[90, 3, 7])[0]
+        results.append({
+            "agencyId": str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
+            "url": url,
+            "status": status,
+            "responseTime": rnd.randint(50, 3000) if status != "problem" else 30000,
+        })
+    return results
+
+
+class Timer:
+    def __enter__(self):
+        self.cpu0 = time.process_time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.t0
+        self.cpu = time.process_time() - self.cpu0
+
+
+def emit(rows, as_json=False):
+    if as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+        return
+    if not rows:
+        return
+    keys = list(dict.fromkeys(k for row in rows for k in row))  # 행마다 열이 다르면 합집합
+    print(" | ".join(keys))
+    for row in rows:
+        print(" | ".join(str(row.get(k, "-")) for k in keys))
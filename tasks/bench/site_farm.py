@@ -0,0 +1,312 @@
+"""
+로컬 aiohttp 사이트 팜
+======================
+
+루프백 주소(127.0.x.y)마다 서버를 하나씩 띄워 여러 호스트를 흉내낸다.
+사이트별 응답 지연, 상태 코드, 페이지 크기, 점검 문구, TLS(자체 서명 인증서)를 지정할 수 있고,
+호스트 단위 처리 용량을 넘기면 지연이 늘어나고 결국 502를 반환한다.
+
+--csv를 주면 기관 목록 CSV(gov_sites.csv)의 행마다 사이트를 만들고 같은 호스트의 기관은 같은 주소에 둔다.
+--scale N이면 목록을 N배로 복제한다 (복제본은 다른 주소로 분산, 최대 --max-hosts개).
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+from urllib.parse import urlsplit
+from aiohttp import web
+
+import common
+
+common.add_tasks_path()  # farm_from_args에서 checker.sites를 쓴다
+
+
+MAINTENANCE_TEXT = "시스템 점검 중입니다"
+ERROR_STATUSES = (500, 502, 503, 404)  # 503은 점검(maintenance), 나머지는 problem으로 판정됨
+LATENCY_DISTS = ("pareto", "lognormal", "uniform", "fixed")
+
+
+def host_address(k):
+    # 127.0.0.0/8 전체가 루프백이므로 254개를 넘으면 세 번째 옥텟을 늘린다
+    return f"127.0.{k // 254}.{k % 254 + 1}"
+
+
+def self_signed_cert(directory):
+    """openssl로 자체 서명 인증서 생성 → (cert, key) 경로. 클라이언트 검증이 실패해야 하므로 신뢰 저장소에 넣지 않는다"""
+    cert, key = os.path.join(directory, "farm.crt"), os.path.join(directory, "farm.key")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=site-farm.invalid", "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+def make_page(size, keyword=None, keyword_at=None):
+    """size 바이트 내외의 HTML 페이지. keyword_at(0~1) 위치에 keyword 삽입"""
+    filler = "<div class=\"item\"><a href=\"/menu\">정부 서비스 안내 메뉴</a></div>\n"
+    body = filler * max(1, size // len(filler.encode()))
+    if keyword:
+        pos = int(len(body) * (keyword_at if keyword_at is not None else 0.5))
+        body = body[:pos] + f"<p>{keyword}</p>" + body[pos:]
+    return f"<html><head><title>기관</title></head><body>{body}</body></html>".encode()
+
+
+class SiteFarm:
+    def __init__(self, hosts=20, sites=740, port=18080, latency_ms=(30, 300), capacity=6,
+                 overload_factor=3, page_bytes=4096, seed=0, etag=False, latency_dist="pareto", page_sigma=0.0):
+        self.hosts = hosts
+        self.etag = etag
+        self.port = port
+        self.capacity = capacity
+        self.overload_factor = overload_factor
+        self.rnd = random.Random(seed)
+        self.active = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.runners = []
+        self._pages = {}
+
+        self.sites = []
+        for i in range(sites):
+            self.sites.append({
+                "index": i,
+                "host": host_address(i % hosts),
+                "latencyMs": self.draw_latency(latency_ms, latency_dist),
+                "status": 200,
+                "pageBytes": self.draw_page_bytes(page_bytes, page_sigma),
+                "keyword": None,
+                "keywordAt": None,
+                "fault": None,
+                "tls": False,
+                "expected": "normal",
+            })
+
+    def draw_latency(self, latency_ms, dist="pareto"):
+        lo, hi = latency_ms
+        if dist == "pareto":
+            # 대부분 빠르고 일부만 느린 꼬리 분포
+            return min(hi * 4, lo + self.rnd.paretovariate(2.0) * (hi - lo) / 4)
+        if dist == "lognormal":
+            # 중앙값 = lo와 hi의 기하평균, hi가 p99
+            median = math.sqrt(lo * hi)
+            return self.rnd.lognormvariate(math.log(median), math.log(hi / median) / 2.326)
+        if dist == "uniform":
+            return self.rnd.uniform(lo, hi)
+        return lo
+
+    def draw_page_bytes(self, page_bytes, sigma=0.0):
+        if not sigma:
+            return page_bytes
+        # 로그정규 분포를 2^(1/4) 간격으로 양자화 (팜이 만들어 두는 페이지 종류 수 제한)
+        size = self.rnd.lognormvariate(math.log(page_bytes), sigma)
+        return int(2 ** (round(math.log2(max(size, 256)) * 4) / 4))
+
+    @classmethod
+    def from_csv(cls, csv_file, scale=1, max_hosts=500, **kwargs):
+        """기관 목록 CSV로 팜 생성. 같은 호스트의 기관은 같은 주소에 두고, 복제본(scale)은 다른 주소로 분산"""
+        from checker.sites import load_sites
+        rows = load_sites(csv_file)
+        host_ids = {}
+        for row in rows:
+            host_ids.setdefault(urlsplit(row["url"]).hostname, len(host_ids))
+        hosts = min(max_hosts, len(host_ids) * scale)
+        farm = cls(hosts=hosts, sites=len(rows) * scale, **kwargs)
+        for site in farm.sites:
+            replica, row = divmod(site["index"], len(rows))
+            site["host"] = host_address((host_ids[urlsplit(rows[row]["url"]).hostname] + replica * len(host_ids)) % hosts)
+            site["name"] = rows[row]["name"] if replica == 0 else f"{rows[row]['name']} #{replica}"
+        return farm
+
+    def apply_profile(self, error_rate=0.0, timeout_rate=0.0, maintenance_rate=0.0, ssl_rate=0.0):
+        """사이트마다 하나의 성질을 배정하고 정답 판정(expected)을 기록
+
+        - timeout: 응답하지 않음 → problem
+        - error: ERROR_STATUSES 중 하나 (503 → maintenance, 나머지 → problem)
+        - maintenance: 200 페이지 앞쪽 절반 어딘가에 점검 문구 → maintenance
+        - ssl: 자체 서명 인증서로 HTTPS 응답 (검증 실패 후 검증 없이 재시도) → normal
+        """
+        if not any((error_rate, timeout_rate, maintenance_rate, ssl_rate)):
+            return self  # 난수를 쓰지 않아야 기존 벤치마크의 사이트 배치가 그대로 유지됨
+        for site in self.sites:
+            roll = self.rnd.random()
+            if roll < timeout_rate:
+                site["fault"], site["expected"] = "hang", "problem"
+            elif (roll := roll - timeout_rate) < error_rate:
+                site["status"] = self.rnd.choice(ERROR_STATUSES)
+                site["expected"] = "maintenance" if site["status"] == 503 else "problem"
+            elif (roll := roll - error_rate) < maintenance_rate:
+                site["keyword"], site["keywordAt"] = MAINTENANCE_TEXT, self.rnd.randrange(5) / 10
+                site["expected"] = "maintenance"
+            elif roll - maintenance_rate < ssl_rate:
+                site["tls"] = True
+        return self
+
+    def agencies(self):
+        return [
+            {"agencyId": f"site-{s['index']}", "name": s.get("name", f"site-{s['index']}"), "url": self.url_for(s)}
+            for s in self.sites
+        ]
+
+    def url_for(self, site):
+        if site["tls"]:
+            return f"https://{site['host']}:{self.port + 1}/site/{site['index']}"
+        return f"http://{site['host']}:{self.port}/site/{site['index']}"
+
+    def page(self, site):
+        key = (site["pageBytes"], site["keyword"], site["keywordAt"])
+        if key not in self._pages:
+            self._pages[key] = make_page(*key)
+        return self._pages[key]
+
+    async def handle(self, request):
+        site = self.sites[int(request.match_info["index"])]
+        host = site["host"]
+        self.requests += 1
+        self.active[host] = self.active.get(host, 0) + 1
+        try:
+            # 호스트 용량을 넘긴 만큼 지연 증가, 심하게 넘기면 502
+            overload = max(0, self.active[host] - self.capacity) if self.capacity else 0
+            if self.capacity and overload > self.capacity * self.overload_factor:
+                await asyncio.sleep(site["latencyMs"] / 1000)
+                return web.Response(status=502, text="overloaded")
+            await asyncio.sleep(site["latencyMs"] * (1 + overload * 0.5) / 1000)
+
+            # faultRate(0~1)가 있으면 그 확률로만 장애 (일시적 장애 흉내)
+            fault = site["fault"] if site["fault"] and self.rnd.random() < site.get("faultRate", 1.0) else None
+            if fault == "hang":
+                await asyncio.sleep(3600)
+            if fault == "stall":
+                await asyncio.sleep(site.get("stallMs", 35000) / 1000)
+            if fault == "reset":
+                if request.transport is not None:
+                    request.transport.close()
+                return web.Response(status=500)
+
+            body = self.page(site)
+            headers = {}
+            if self.etag:
+                tag = f'"{hash(body) & 0xffffffff:08x}"'
+                if request.headers.get("If-None-Match") == tag:
+                    return web.Response(status=304, headers={"ETag": tag})
+                headers["ETag"] = tag
+            self.bytes_sent += len(body)
+            return web.Response(status=site["status"], body=body, content_type="text/html", charset="utf-8",
+                                headers=headers)
+        finally:
+            self.active[host] -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/site/{index}", self.handle)
+        tls_context = None
+        if any(site["tls"] for site in self.sites):
+            # TLS 사이트는 같은 주소의 port + 1에서 자체 서명 인증서로 응답
+            with tempfile.TemporaryDirectory() as tmp:
+                tls_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+                tls_context.load_cert_chain(*self_signed_cert(tmp))
+        for k in range(self.hosts):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, host_address(k), self.port).start()
+            if tls_context:
+                await web.TCPSite(runner, host_address(k), self.port + 1, ssl_context=tls_context).start()
+            self.runners.append(runner)
+        return self
+
+    async def stop(self):
+        for runner in self.runners:
+            await runner.cleanup()
+        self.runners = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+def farm_args(parser):
+    parser.add_argument("--sites", type=int, default=740)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--capacity", type=int, default=6, help="호스트당 지연 없이 처리 가능한 동시 요청 수 (0이면 무제한)")
+    parser.add_argument("--min-latency", type=float, default=30)
+    parser.add_argument("--max-latency", type=float, default=300)
+    parser.add_argument("--page-bytes", type=int, default=4096, help="페이지 크기 (--page-sigma가 있으면 중앙값)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTS, default="pareto",
+                        help="pareto: min + 꼬리, lognormal: 중앙값 √(min·max)·p99 max, uniform, fixed: min")
+    parser.add_argument("--page-sigma", type=float, default=0.0, help="페이지 크기 로그정규 σ (0이면 모두 같은 크기)")
+    parser.add_argument("--csv", default=None, help="기관 목록 CSV로 사이트 생성 (--sites/--hosts 대신)")
+    parser.add_argument("--scale", type=int, default=1, help="--csv 목록 복제 배수")
+    parser.add_argument("--max-hosts", type=int, default=500, help="--csv 사용 시 루프백 주소 수 상한")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx/404 응답 사이트 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답하지 않는 사이트 비율")
+    parser.add_argument("--maintenance-rate", type=float, default=0.0, help="점검 문구가 있는 사이트 비율")
+    parser.add_argument("--ssl-rate", type=float, default=0.0, help="자체 서명 인증서 HTTPS 사이트 비율")
+    return parser
+
+
+def farm_from_args(args):
+    kwargs = dict(port=args.port, capacity=args.capacity, latency_ms=(args.min_latency, args.max_latency),
+                  page_bytes=args.page_bytes, seed=args.seed, latency_dist=args.latency_dist, page_sigma=args.page_sigma)
+    if args.csv:
+        farm = SiteFarm.from_csv(args.csv, scale=args.scale, max_hosts=args.max_hosts, **kwargs)
+    else:
+        farm = SiteFarm(hosts=args.hosts, sites=args.sites, **kwargs)
+    return farm.apply_profile(args.error_rate, args.timeout_rate, args.maintenance_rate, args.ssl_rate)
+
+
+def farm_argv(args):
+    """farm_args로 파싱한 값을 FarmProcess에 넘길 명령행 인자로 되돌림"""
+    parser = farm_args(argparse.ArgumentParser())
+    values = vars(args)
+    return [f"--{a.dest.replace('_', '-')}={values[a.dest]}" for a in parser._actions
+            if a.dest != "help" and values.get(a.dest) is not None]
+
+
+class FarmProcess:
+    """팜을 별도 프로세스로 띄워 클라이언트 CPU 측정에서 서버 부하를 분리"""
+
+    def __init__(self, argv):
+        self.argv = argv
+        self.proc = None
+
+    def __enter__(self):
+        import subprocess
+        import sys
+        self.proc = subprocess.Popen([sys.executable, __file__, *self.argv], stdout=subprocess.PIPE, text=True)
+        line = self.proc.stdout.readline()
+        if "ready" not in line:
+            self.proc.kill()
+            raise RuntimeError("사이트 팜 시작 실패")
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+if __name__ == "__main__":
+    parser = farm_args(argparse.ArgumentParser())
+    parser.add_argument("--mutate", default=None, help="사이트 속성 변경 스크립트 모듈:함수 (farm을 인자로 받음)")
+    args = parser.parse_args()
+
+    async def serve():
+        farm = farm_from_args(args)
+        if args.mutate:
+            import importlib
+            module, func = args.mutate.split(":")
+            getattr(importlib.import_module(module), func)(farm)
+        await farm.start()
+        print("ready", flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
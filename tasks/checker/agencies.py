@@ -1,13 +1,16 @@
-import csv, uuid
 from urllib.parse import urlparse
-from checker.db import db
+from pymongo import UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
+from checker.db import get_db
+from checker.sites import agency_id_for, load_sites, normalize_url
 
 class AgencyManager:
     central_agencies = ['부', '청', '위원회', '처', '원', '감사원']
     local_agencies = ['시', '도', '구', '군', '특별시', '광역시', '특별자치시', '특별자치도']
 
-    def __init__(self, csv_file='tasks/gov_sites.csv'):
+    def __init__(self, csv_file='tasks/gov_sites.csv', db=None):
         self.csv_file = csv_file
+        self.db = db if db is not None else get_db()
 
     def classify_agency(self, name: str):
         name = name.strip()
@@ -48,36 +51,126 @@ class AgencyManager:
         elif '.re.kr' in domain: tags.append('연구기관')
         return tags if tags else ['공공기관']
 
+    def build_doc(self, name, url):
+        return {
+            "agencyId": agency_id_for(url),
+            "name": name,
+            "url": url,
+            **self.classify_agency(name),
+            "tags": self.generate_tags(name, url)
+        }
+
+    def diff(self):
+        """CSV와 agencies 컬렉션을 비교해 new/changed/unchanged/removed 목록을 만든다 (DB 조회 1회)"""
+        existing = list(self.db["agencies"].find({}, {"_id": 0}))
+        by_url = {doc["url"]: doc for doc in existing}
+        by_name = {doc["name"]: doc for doc in existing}
+
+        report = {"new": [], "changed": [], "unchanged": [], "removed": []}
+        matched = set()
+        seen_urls = set()
+        for site in load_sites(self.csv_file):
+            if site["url"] in seen_urls:
+                continue
+            seen_urls.add(site["url"])
+            doc = self.build_doc(site["name"], site["url"])
+
+            # 기존 기관 찾기: URL 또는 이름이 일치하면 같은 기관으로 간주
+            current = by_url.get(doc["url"]) or by_name.get(doc["name"])
+            if current is None or current["agencyId"] in matched:
+                report["new"].append(doc)
+                continue
+            matched.add(current["agencyId"])
+
+            # agencyId는 StatusChecker와 같은 uuid5(url)로 통일 (예전 uuid4 문서도 여기서 교체)
+            fields = [k for k in doc if current.get(k) != doc[k]]
+            if fields:
+                report["changed"].append({"before": current, "after": doc, "fields": fields})
+            else:
+                report["unchanged"].append(doc)
+
+        report["removed"] = [doc for doc in existing if doc["agencyId"] not in matched]
+        return report
+
+    def sync(self, dry_run=False, prune=False):
+        """변경분만 bulk_write 한 번으로 반영. prune이면 CSV에 없는 기관을 삭제"""
+        report = self.diff()
+        self._write(report, dry_run, prune)
+        self.print_report(report, dry_run, prune)
+        return report
+
+    def apply_delta(self, delta, dry_run=False, prune=False):
+        """크롤러 증분 탐색 결과(added/renamed/removed)만 반영 (DB 조회 1회).
+        기존 기관은 정규화 URL로 찾고, CSV로 등록된 기관 이름은 added로 덮어쓰지 않는다"""
+        existing = {}
+        for doc in self.db["agencies"].find({}, {"_id": 0}):
+            existing.setdefault(normalize_url(doc["url"]) or doc["url"], doc)
+
+        report = {"new": [], "changed": [], "unchanged": [], "removed": []}
+        for kind in ("added", "renamed"):
+            for org in delta[kind]:
+                current = existing.get(normalize_url(org["url"]) or org["url"])
+                if current is None:
+                    report["new"].append(self.build_doc(org["name"], org["url"]))
+                    continue
+                doc = self.build_doc(org["name"] if kind == "renamed" else current["name"], current["url"])
+                fields = [k for k in doc if current.get(k) != doc[k]]
+                if fields:
+                    report["changed"].append({"before": current, "after": doc, "fields": fields})
+                else:
+                    report["unchanged"].append(doc)
+        for org in delta["removed"]:
+            current = existing.get(normalize_url(org["url"]) or org["url"])
+            if current is not None:
+                report["removed"].append(current)
+
+        self._write(report, dry_run, prune)
+        self.print_report(report, dry_run, prune)
+        return report
+
+    def _write(self, report, dry_run, prune):
+        # targets[i]: ops[i]가 쓰려는 문서 (중복 키 오류 보고용)
+        targets = list(report["new"]) + [c["after"] for c in report["changed"]]
+        ops = [UpdateOne({"agencyId": doc["agencyId"]}, {"$set": doc}, upsert=True) for doc in report["new"]]
+        ops += [UpdateOne({"agencyId": c["before"]["agencyId"]}, {"$set": c["after"]}) for c in report["changed"]]
+        if prune:
+            targets += report["removed"]
+            ops += [DeleteOne({"agencyId": doc["agencyId"]}) for doc in report["removed"]]
+
+        report["conflicts"] = []
+        if not ops or dry_run:
+            return
+        try:
+            self.db["agencies"].bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # agencyId unique 인덱스 위반(uuid5 충돌, 다른 기관이 이미 쓰는 URL로 바뀐 기관)은 그 기관만 건너뛰고 보고.
+            # 순서 없는 bulk_write라 나머지 연산은 이미 반영됨
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            for err in errors:
+                doc = targets[err["index"]]
+                report["conflicts"].append({"agencyId": doc["agencyId"], "name": doc["name"], "url": doc["url"],
+                                            "errmsg": err.get("errmsg")})
+
+    def print_report(self, report, dry_run=False, prune=False):
+        prefix = "🔎 [dry-run] " if dry_run else "✅ "
+        print(f"{prefix}agencies 동기화: 신규 {len(report['new'])}, 변경 {len(report['changed'])}, "
+              f"유지 {len(report['unchanged'])}, CSV에 없음 {len(report['removed'])}{' (삭제)' if prune else ''}")
+        conflicts = report.get("conflicts") or []
+        if conflicts:
+            print(f"⚠️ agencyId 중복으로 반영하지 못한 기관 {len(conflicts)}곳")
+            for c in conflicts:
+                print(f"   ! {c['agencyId']} {c['name']} - {c['url']}")
+        if not dry_run:
+            return
+        for doc in report["new"]:
+            print(f"   + {doc['name']} - {doc['url']}")
+        for c in report["changed"]:
+            print(f"   ~ {c['after']['name']} - {c['after']['url']} ({', '.join(c['fields'])})")
+        for doc in report["removed"]:
+            print(f"   - {doc['name']} - {doc['url']}")
+
     def load_from_csv(self):
-        with open(self.csv_file, 'r', encoding='utf-8-sig') as f:
-            reader = csv.reader(f)
-            next(reader)
-            for row in reader:
-                if len(row) >= 2 and row[1].strip():
-                    name, url = row[0].strip(), row[1].strip()
-
-                    # 기존 기관 찾기: URL 또는 이름이 일치하면 같은 기관으로 간주
-                    existing = db["agencies"].find_one({
-                        "$or": [{"url": url}, {"name": name}]
-                    })
-
-                    if existing:
-                        agency_id = existing["agencyId"]
-                    else:
-                        # 완전히 새로운 기관 -> 새로운 ID 부여
-                        agency_id = str(uuid.uuid4())
-
-                    agency_doc = {
-                        "agencyId": agency_id,
-                        "name": name,
-                        "url": url,
-                        **self.classify_agency(name),
-                        "tags": self.generate_tags(name, url)
-                    }
-
-                    db["agencies"].update_one(
-                        {"agencyId": agency_id},
-                        {"$set": agency_doc},
-                        upsert=True
-                    )
+        self.sync()
         print("✅ agencies 컬렉션 업데이트 완료")
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+
+
+def body_hash(data: bytes) -> str:
+    return body_hasher(data).hexdigest()
+
+
+def body_hasher(data: bytes = b""):
+    """청크 단위로 update()하는 body_hash와 같은 해시 객체"""
+    return hashlib.blake2b(data, digest_size=16)
+
+
+class ResponseCache:
+    """URL별 ETag/Last-Modified/본문 해시와 마지막 점검 판정을 MongoDB(response_cache)에 보관"""
+
+    # bodyHash는 끝까지(partial이면 max_bytes까지) 읽어 키워드가 없던 본문만 저장한다 (점검 판정이면 None)
+    def __init__(self, db, collection="response_cache"):
+        self.db = db
+        self.collection = collection
+        self.entries = {}
+        self._dirty = set()
+        self.loaded = False
+        self.stats = {"requests": 0, "notModified": 0, "hashHits": 0, "bytesRead": 0, "bytesSaved": 0}
+
+    def load(self):
+        self.entries = {doc["url"]: doc for doc in self.db[self.collection].find({}, {"_id": 0})}
+        self.loaded = True
+        return self
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def record(self, url, response, digest, size, matched):
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+            "bodyHash": digest,
+            "size": size,
+            "keyword": matched[0] if matched else None,
+            "offset": matched[1] if matched else None,
+            "checkedAt": datetime.now(timezone.utc),
+        }
+        self.entries[url] = entry
+        self._dirty.add(url)
+
+    @staticmethod
+    def cached_verdict(entry):
+        return (entry["keyword"], entry["offset"]) if entry.get("keyword") else None
+
+    def flush(self):
+        # 스레드에서 도는 동안 이벤트 루프 쪽 record()가 계속 추가할 수 있으므로 쓸 목록을 먼저 떼어낸다
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return 0
+        ops = [UpdateOne({"url": url}, {"$set": self.entries[url]}, upsert=True) for url in dirty]
+        try:
+            self.db[self.collection].bulk_write(ops, ordered=False)
+        except Exception:
+            self._dirty |= dirty  # 다음 flush에서 다시 시도
+            raise
+        return len(dirty)
+
+    def report(self):
+        requests = self.stats["requests"]
+        hits = self.stats["notModified"] + self.stats["hashHits"]
+        return {
+            **self.stats,
+            "hitRate": round(hits / requests, 3) if requests else 0.0,
+        }
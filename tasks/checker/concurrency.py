@@ -0,0 +1,142 @@
+import asyncio
+import socket
+from collections import deque
+from contextlib import asynccontextmanager
+from statistics import median
+from urllib.parse import urlparse
+import aiohttp
+from config import (
+    CONCURRENCY_INITIAL, CONCURRENCY_MIN, CONCURRENCY_MAX, CONCURRENCY_PER_HOST,
+    CONCURRENCY_TARGET_LATENCY, CONCURRENCY_WINDOW, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT,
+)
+
+
+def make_connector(limit=CONCURRENCY_MAX, limit_per_host=CONCURRENCY_PER_HOST):
+    # 실행 내내 재사용하는 커넥터: keep-alive + DNS 캐시로 같은 인프라에 대한 재연결 비용 절감
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host or 0,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+
+
+class AdaptiveLimiter:
+    """전역 동시성은 AIMD로 조정하고, 같은 호스트(IP)로 가는 요청은 per_host로 제한"""
+
+    def __init__(self, initial=CONCURRENCY_INITIAL, min_limit=CONCURRENCY_MIN, max_limit=CONCURRENCY_MAX,
+                 per_host=CONCURRENCY_PER_HOST, target_latency=CONCURRENCY_TARGET_LATENCY,
+                 window=CONCURRENCY_WINDOW, adaptive=True, group_by_ip=True):
+        self.limit = initial
+        self.min_limit = min(min_limit, initial)
+        self.max_limit = max(max_limit, initial)
+        self.per_host = per_host
+        self.target_latency = target_latency
+        self.window = window
+        self.adaptive = adaptive
+        self.group_by_ip = group_by_ip
+
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._host_sems = {}
+        self._host_keys = {}
+        self._samples = deque(maxlen=window)
+        self.stats = {"increases": 0, "decreases": 0, "peakInFlight": 0, "minLimit": initial,
+                      "maxLimit": initial, "limitHistory": [initial]}
+
+    async def _host_key(self, url):
+        host = urlparse(url).hostname or url
+        if not self.group_by_ip:
+            return host
+        if host not in self._host_keys:
+            # 같은 IP를 공유하는 *.go.kr 호스트는 하나로 묶는다 (DNS 실패 시 호스트명 사용)
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                self._host_keys[host] = infos[0][4][0] if infos else host
+            except OSError:
+                self._host_keys[host] = host
+        return self._host_keys[host]
+
+    def _host_sem(self, key):
+        if key not in self._host_sems:
+            self._host_sems[key] = asyncio.Semaphore(self.per_host)
+        return self._host_sems[key]
+
+    @asynccontextmanager
+    async def slot(self, url):
+        host_sem = self._host_sem(await self._host_key(url)) if self.per_host else None
+        if host_sem:
+            await host_sem.acquire()
+        try:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self.in_flight < self.limit)
+                self.in_flight += 1
+                self.stats["peakInFlight"] = max(self.stats["peakInFlight"], self.in_flight)
+            try:
+                yield
+            finally:
+                async with self._cond:
+                    self.in_flight -= 1
+                    self._cond.notify_all()
+        finally:
+            if host_sem:
+                host_sem.release()
+
+    async def try_acquire(self, url):
+        """기다리지 않고 빈 자리가 있을 때만 slot()과 같은 자리를 차지 (헤지 요청용).
+        차지했으면 해제 코루틴 함수, 전역 한도나 호스트 상한이 차 있으면 None"""
+        host_sem = self._host_sem(await self._host_key(url)) if self.per_host else None
+        if (host_sem is not None and host_sem.locked()) or self.in_flight >= self.limit:
+            return None
+        if host_sem is not None:
+            await host_sem.acquire()  # locked()가 아니면 기다리지 않고 바로 차지
+        self.in_flight += 1
+        self.stats["peakInFlight"] = max(self.stats["peakInFlight"], self.in_flight)
+
+        async def release():
+            try:
+                async with self._cond:
+                    self.in_flight -= 1
+                    self._cond.notify_all()
+            finally:
+                if host_sem is not None:
+                    host_sem.release()
+        return release
+
+    def observe(self, latency_ms, congested):
+        """요청 완료 시 호출. congested는 타임아웃/연결 오류처럼 과부하를 의심할 수 있는 실패"""
+        if not self.adaptive:
+            return
+        self._samples.append((latency_ms, congested))
+        if len(self._samples) < self.window:
+            return
+
+        error_rate = sum(1 for _, c in self._samples if c) / len(self._samples)
+        latency = median(l for l, _ in self._samples)
+        if error_rate > 0.2 or latency > self.target_latency:
+            new_limit = max(self.min_limit, int(self.limit * 0.7))
+            self.stats["decreases"] += 1
+        else:
+            new_limit = min(self.max_limit, self.limit + max(1, self.window // 4))
+            self.stats["increases"] += 1
+        self._samples.clear()
+
+        if new_limit != self.limit:
+            self.limit = new_limit
+            self.stats["minLimit"] = min(self.stats["minLimit"], new_limit)
+            self.stats["maxLimit"] = max(self.stats["maxLimit"], new_limit)
+            self.stats["limitHistory"].append(new_limit)
+            asyncio.get_running_loop().create_task(self._wake())
+
+    async def _wake(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+    def report(self):
+        return {
+            "adaptive": self.adaptive,
+            "finalLimit": self.limit,
+            "perHost": self.per_host,
+            "hostGroups": len(self._host_sems),
+            **self.stats,
+        }
@@ -1,5 +1,50 @@
-from pymongo import MongoClient
+import threading
+import time
 from config import MONGODB_URI, MONGODB_DATABASE
 
-client = MongoClient(MONGODB_URI)
-db = client[MONGODB_DATABASE]
+# import만으로는 연결하지 않는다. 첫 get_db()/get_client() 호출(또는 warm_up) 때 MongoClient 생성
+_client = None
+_lock = threading.Lock()
+warmed_at = None  # warm_up의 ping이 끝난 시각 (time.perf_counter, 시작 시간 측정용)
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from pymongo import MongoClient  # pymongo import(~80ms)도 첫 사용 시점으로 미룸
+                _client = MongoClient(MONGODB_URI)
+    return _client
+
+
+def get_db():
+    return get_client()[MONGODB_DATABASE]
+
+
+def warm_up():
+    """백그라운드 스레드에서 클라이언트 생성 + ping (DNS/TLS/인증 왕복)
+
+    나머지 모듈 import, CSV 로드, HTTP 세션 생성과 연결 수립이 겹쳐서 첫 DB 요청이 이미 열린 연결을 쓴다.
+    실패해도 여기서는 경고만 남기고, 실제 오류는 첫 DB 요청에서 드러난다.
+    """
+    def ping():
+        global warmed_at
+        try:
+            get_db().command("ping")
+            warmed_at = time.perf_counter()
+        except Exception as e:
+            print(f"⚠️ MongoDB 연결 예열 실패: {e}")
+
+    thread = threading.Thread(target=ping, name="mongo-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    # 기존 `from checker.db import db` 호환 (그 import 시점에 클라이언트 생성)
+    if name == "db":
+        return get_db()
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
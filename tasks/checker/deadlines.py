@@ -0,0 +1,104 @@
+from datetime import datetime, timezone, timedelta
+import aiohttp
+from config import (
+    TIMEOUT_THRESHOLD, DEADLINE_HISTORY_DAYS, DEADLINE_MIN_SAMPLES, TIMEOUT_HEADROOM, TIMEOUT_TTFB_MIN,
+    TIMEOUT_CONNECT_MIN, TIMEOUT_CONNECT_MAX, HEDGE_MIN_DELAY,
+)
+from checker.stats import LatencyHistogram
+from checker.storage import Storage
+
+
+def _clamp(value, lo, hi):
+    return max(lo, min(hi, value))
+
+
+class SiteDeadline:
+    """사이트 하나의 타임아웃(ms)과 헤지 시점. 이력이 없으면 전체 TIMEOUT_THRESHOLD 하나만 쓰고 헤지하지 않는다"""
+
+    def __init__(self, connect=None, ttfb=None, total=TIMEOUT_THRESHOLD, hedge_after=None):
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+        self.hedge_after = hedge_after
+
+    def client_timeout(self):
+        # sock_connect: TCP 연결+TLS, sock_read: 소켓 읽기 간격 (요청 직후 첫 읽기까지가 곧 첫 바이트 시간)
+        return aiohttp.ClientTimeout(
+            total=self.total / 1000,
+            sock_connect=self.connect / 1000 if self.connect else None,
+            sock_read=self.ttfb / 1000 if self.ttfb else None,
+        )
+
+    def to_dict(self):
+        return {"connect": self.connect, "ttfb": self.ttfb, "total": self.total, "hedgeAfter": self.hedge_after}
+
+
+DEFAULT_DEADLINE = SiteDeadline()
+
+
+class SiteDeadlines:
+    """agency_daily 롤업(응답시간 히스토그램 + 단계별 시간 합)으로 기관별 타임아웃과 헤지 시점을 정한다
+
+    - 첫 바이트(sock_read) = p99 × TIMEOUT_HEADROOM (TIMEOUT_TTFB_MIN ~ TIMEOUT_THRESHOLD)
+    - 연결(sock_connect) = 평균 연결 시간 × TIMEOUT_HEADROOM (TIMEOUT_CONNECT_MIN ~ MAX), 측정 이력이 없으면 MAX
+    - 전체 = 연결 + 첫 바이트 × 2 (TIMEOUT_THRESHOLD 이하)
+    - 헤지 = p95 (HEDGE_MIN_DELAY 이상) 동안 응답이 없으면 같은 요청을 한 번 더
+    """
+
+    def __init__(self, db=None, collection="agency_daily", days=DEADLINE_HISTORY_DAYS, min_samples=DEADLINE_MIN_SAMPLES):
+        self.db = db
+        self.collection = collection
+        self.days = days
+        self.min_samples = min_samples
+        self.deadlines = {}
+        self.loaded = False
+
+    def load(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        since = Storage.rollup_day(now - timedelta(days=self.days))
+        hists, connect = {}, {}
+        for doc in self.db[self.collection].find({"date": {"$gte": since}}, {"_id": 0, "agencyId": 1, "stats": 1}):
+            stats = doc.get("stats") or {}
+            aid = doc["agencyId"]
+            hist = LatencyHistogram.from_stats(stats)
+            hists[aid] = hists[aid].merge(hist) if aid in hists else hist
+            timing = stats.get("timing") or {}
+            if timing.get("samples"):
+                total, samples = connect.get(aid, (0.0, 0))
+                connect[aid] = (total + timing.get("connectMs", 0), samples + timing["samples"])
+        for aid, hist in hists.items():
+            total, samples = connect.get(aid, (0.0, 0))
+            self.fit(aid, hist, total / samples if samples else None)
+        self.loaded = True
+        return self
+
+    def fit(self, agency_id, hist, connect_mean=None):
+        """응답시간 히스토그램(과 평균 연결 시간)으로 한 기관의 기한을 정한다. 이력이 모자라면 기본값"""
+        if hist.count < self.min_samples:
+            self.deadlines.pop(agency_id, None)
+            return DEFAULT_DEADLINE
+        p95, p99 = hist.quantile(0.95), hist.quantile(0.99)
+        ttfb = _clamp(p99 * TIMEOUT_HEADROOM, TIMEOUT_TTFB_MIN, TIMEOUT_THRESHOLD)
+        connect = (_clamp(connect_mean * TIMEOUT_HEADROOM, TIMEOUT_CONNECT_MIN, TIMEOUT_CONNECT_MAX)
+                   if connect_mean is not None else TIMEOUT_CONNECT_MAX)
+        total = min(TIMEOUT_THRESHOLD, connect + ttfb * 2)
+        hedge_after = max(HEDGE_MIN_DELAY, p95) if p95 * 2 < ttfb else None  # 헤지해도 기한 안에 못 끝나면 생략
+        deadline = SiteDeadline(int(connect), int(ttfb), int(total), int(hedge_after) if hedge_after else None)
+        self.deadlines[agency_id] = deadline
+        return deadline
+
+    def for_site(self, agency_id):
+        return self.deadlines.get(agency_id, DEFAULT_DEADLINE)
+
+    def report(self):
+        if not self.deadlines:
+            return {"sites": 0}
+        ttfb = sorted(d.ttfb for d in self.deadlines.values())
+        total = sorted(d.total for d in self.deadlines.values())
+        return {
+            "sites": len(self.deadlines),
+            "hedgeable": sum(1 for d in self.deadlines.values() if d.hedge_after),
+            "ttfbMedian": ttfb[len(ttfb) // 2],
+            "totalMedian": total[len(total) // 2],
+            "totalMax": total[-1],
+        }
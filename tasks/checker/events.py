@@ -0,0 +1,212 @@
+from datetime import timezone, timedelta
+from checker.stats import STATUSES
+from config import UPTIME_WINDOWS_DAYS, STATUS_WINDOW_REFRESH_MIN
+
+WINDOWS_DOC = "_windows"  # status_index 안에서 구간 집계(windows)를 마지막으로 갱신한 시각을 담는 문서
+_SEVERITY = {"normal": 0, "maintenance": 1, "problem": 2}
+
+
+def _aware(ts):
+    # pymongo는 기본 설정에서 UTC naive datetime을 돌려준다
+    return ts.replace(tzinfo=timezone.utc) if ts is not None and ts.tzinfo is None else ts
+
+
+def _zero():
+    return {s: 0.0 for s in STATUSES}
+
+
+def _advance(cum, status, start, end):
+    """cum에 status로 start~end를 지낸 시간(초)을 더한 새 dict"""
+    cum = {s: float(cum.get(s, 0.0)) for s in STATUSES}
+    cum[status] += max(0.0, (_aware(end) - _aware(start)).total_seconds())
+    return cum
+
+
+def _window_key(days):
+    return f"{days}d"
+
+
+def _probe(r, at):
+    """상태 변화를 일으킨 프로브 요약"""
+    probe = {"at": at, "responseTime": r.get("responseTime")}
+    for key in ("decidedBy", "attempts", "maintenanceKeyword"):
+        if r.get(key) is not None:
+            probe[key] = r[key]
+    return probe
+
+
+class StatusEvents:
+    """상태가 바뀔 때만 기록하는 기관별 상태 구간 로그(status_events)와 기관별 누적 인덱스(status_index)
+
+    status_events: {agencyId, status, start, end(진행 중이면 None), durationS, cum, triggeredBy, endedBy}
+      - cum: 이 구간이 시작되기 전까지 상태별 누적 시간(초). 시각 t까지의 누적 = t를 포함한 구간의 cum + (t - start)
+        → 임의 구간 [t0, t1]의 상태별 시간은 (agencyId, start) 인덱스 조회 2번 (O(log n))
+    status_index: {_id: agencyId, status, since, cum, triggeredBy, windows}
+      - 현재 상태와 지속 시간은 문서 1개 (O(1)), 진행 중 장애 순위는 (status, since) 인덱스
+      - windows: 최근 UPTIME_WINDOWS_DAYS일별 장애/점검 시간과 가동률. refresh_min분마다 한 번 다시 계산해 두고
+        worst-N은 windows.<N>d.downS 인덱스를 내림차순으로 읽는다
+    """
+
+    def __init__(self, db, collection="status_events", index_collection="status_index",
+                 windows=UPTIME_WINDOWS_DAYS, refresh_min=STATUS_WINDOW_REFRESH_MIN):
+        self.db = db
+        self.collection = collection
+        self.index_collection = index_collection
+        self.windows = tuple(windows)
+        self.refresh = timedelta(minutes=refresh_min)
+
+    # --- 기록 (Storage.save_events) ---
+    def load_states(self, agency_ids):
+        """기관별 현재 상태 + 구간 집계 갱신 시각 문서 (왕복 1회)"""
+        ids = list(agency_ids) + [WINDOWS_DOC]
+        return {doc["_id"]: doc for doc in self.db[self.index_collection].find({"_id": {"$in": ids}})}
+
+    def changes(self, observed, states):
+        """observed: [(결과, 관측 시각)] → (status_events 갱신, status_index 갱신). 상태가 그대로인 기관은 쓰지 않는다"""
+        event_updates, index_updates = [], []
+        for r, at in observed:
+            aid, status = r["agencyId"], r["status"]
+            state = states.get(aid)
+            if state is not None and state["status"] == status:
+                continue
+            probe = _probe(r, at)
+            cum = _zero()
+            if state is not None:
+                # 직전 구간 닫기 (문서가 없더라도 upsert로 같은 내용이 생기도록 전체 필드를 $set)
+                since = state["since"]
+                cum = _advance(state.get("cum") or {}, state["status"], since, at)
+                event_updates.append(({"agencyId": aid, "start": since}, {"$set": {
+                    "status": state["status"], "cum": state.get("cum") or _zero(), "end": at,
+                    "durationS": round((at - _aware(since)).total_seconds(), 1), "endedBy": probe,
+                }}))
+            event_updates.append(({"agencyId": aid, "start": at}, {"$setOnInsert": {
+                "status": status, "cum": cum, "end": None, "triggeredBy": probe,
+            }}))
+            index_updates.append(({"_id": aid}, {"$set": {"status": status, "since": at, "cum": cum, "triggeredBy": probe}}))
+        return event_updates, index_updates
+
+    def windows_due(self, states, now):
+        doc = states.get(WINDOWS_DOC)
+        return doc is None or _aware(doc["refreshedAt"]) + self.refresh <= now
+
+    def window_updates(self, now):
+        """기관별 최근 N일 장애/점검 시간과 가동률 재계산 → status_index 갱신 목록 (창마다 왕복 1회 + 현재 상태 1회)
+        값이 그대로인 기관(대부분인 계속 정상인 기관)은 쓰지 않는다"""
+        states = list(self.db[self.index_collection].find({"status": {"$exists": True}}))
+        fields = {doc["_id"]: {} for doc in states}
+        for days in self.windows:
+            key = _window_key(days)
+            before = self.cumulative_all(now - timedelta(days=days))
+            for doc in states:
+                spent = self._diff(self._cum_now(doc, now), before.get(doc["_id"], _zero()))
+                summary = self._summary(spent)
+                window = {k: summary[k] for k in ("downS", "maintenanceS", "uptime")}
+                if (doc.get("windows") or {}).get(key) != window:
+                    fields[doc["_id"]][f"windows.{key}"] = window
+        updates = [({"_id": aid}, {"$set": f}) for aid, f in fields.items() if f]
+        updates.append(({"_id": WINDOWS_DOC}, {"$set": {"refreshedAt": now}}))
+        return updates
+
+    # --- 조회 (대시보드 API용) ---
+    def current(self, agency_id, now):
+        """현재 상태와 그 상태가 이어진 시간"""
+        doc = self.db[self.index_collection].find_one({"_id": agency_id})
+        if not doc or "status" not in doc:
+            return None
+        return {"agencyId": agency_id, "status": doc["status"], "since": _aware(doc["since"]),
+                "durationS": round((now - _aware(doc["since"])).total_seconds(), 1), "triggeredBy": doc.get("triggeredBy")}
+
+    def outages(self, now, limit=10, statuses=("problem",)):
+        """진행 중인 장애를 오래된 순으로 ((status, since) 인덱스)"""
+        docs = self.db[self.index_collection].find({"status": {"$in": list(statuses)}}, sort=[("since", 1)], limit=limit)
+        return [{"agencyId": d["_id"], "status": d["status"], "since": _aware(d["since"]),
+                 "durationS": round((now - _aware(d["since"])).total_seconds(), 1)} for d in docs]
+
+    def cumulative(self, agency_id, t):
+        """t까지 상태별 누적 시간(초). t를 포함한 구간 하나만 읽는다 ((agencyId, start) 인덱스)"""
+        event = self.db[self.collection].find_one({"agencyId": agency_id, "start": {"$lte": t}}, sort=[("start", -1)])
+        if event is None:
+            return _zero()  # 첫 관측 이전
+        end = min(t, _aware(event["end"])) if event.get("end") else t
+        return _advance(event["cum"], event["status"], event["start"], end)
+
+    def cumulative_all(self, t):
+        """전 기관의 t까지 누적 시간. t에 걸쳐 있는 구간만 한 번에 읽는다 (기관당 1개)"""
+        flt = {"start": {"$lte": t}, "$or": [{"end": {"$gt": t}}, {"end": None}]}
+        return {e["agencyId"]: _advance(e["cum"], e["status"], e["start"], t) for e in self.db[self.collection].find(flt)}
+
+    def time_in_status(self, agency_id, start, end):
+        """[start, end] 동안 상태별 시간(초). 관측 이전 구간은 빠진다"""
+        return self._diff(self.cumulative(agency_id, end), self.cumulative(agency_id, start))
+
+    def uptime(self, agency_id, start, end):
+        return self._summary(self.time_in_status(agency_id, start, end))
+
+    def worst(self, n=10, days=None):
+        """최근 days일 장애(problem) 시간이 긴 기관 순 (마지막 windows 갱신 기준, windows.<N>d.downS 인덱스)"""
+        key = f"windows.{_window_key(days or self.windows[-1])}"
+        docs = self.db[self.index_collection].find({f"{key}.downS": {"$gt": 0}}, sort=[(f"{key}.downS", -1)], limit=n)
+        return [{"agencyId": d["_id"], "status": d["status"], **d["windows"][_window_key(days or self.windows[-1])]}
+                for d in docs]
+
+    # --- 재구성 (rollups.py events) ---
+    @staticmethod
+    def hourly_status(stats):
+        """hourly_stats 한 시간의 대표 상태: 가장 많이 관측된 상태 (같으면 더 나쁜 쪽)"""
+        counts = {s: stats.get(s, 0) or 0 for s in STATUSES}
+        return max(STATUSES, key=lambda s: (counts[s], _SEVERITY[s]))
+
+    def from_hourly(self, docs):
+        """(agencyId, timestampHour) 순으로 정렬된 hourly_stats 문서 → (status_events 문서, status_index 문서)
+
+        시간마다 대표 상태를 정하고 같은 상태가 이어지는 시간을 한 구간으로 합친다. 빠진 시간은 직전 상태가 이어진 것으로 본다
+        """
+        events, states = [], []
+        current = None
+
+        def close(at):
+            if current is not None and at is not None:
+                current["end"] = at
+                current["durationS"] = round((at - current["start"]).total_seconds(), 1)
+                current["endedBy"] = {"at": at, "backfill": True}
+
+        for doc in docs:
+            aid, hour = doc["agencyId"], _aware(doc["timestampHour"])
+            status = self.hourly_status(doc.get("stats") or {})
+            if current is not None and current["agencyId"] == aid and current["status"] == status:
+                continue
+            if current is not None and current["agencyId"] == aid:
+                close(hour)
+                cum = _advance(current["cum"], current["status"], current["start"], hour)
+            else:
+                if current is not None:
+                    states.append(current)
+                cum = _zero()
+            current = {"agencyId": aid, "status": status, "start": hour, "end": None, "cum": cum,
+                       "triggeredBy": {"at": hour, "backfill": True, "counts": {s: (doc.get("stats") or {}).get(s, 0)
+                                                                                for s in STATUSES}}}
+            events.append(current)
+        if current is not None:
+            states.append(current)
+        index = [{"_id": e["agencyId"], "status": e["status"], "since": e["start"], "cum": e["cum"],
+                  "triggeredBy": e["triggeredBy"]} for e in states]
+        return events, index
+
+    # --- 내부 ---
+    @staticmethod
+    def _cum_now(state, now):
+        return _advance(state.get("cum") or {}, state["status"], state["since"], now)
+
+    @staticmethod
+    def _diff(a, b):
+        return {s: max(0.0, a.get(s, 0.0) - b.get(s, 0.0)) for s in STATUSES}
+
+    @staticmethod
+    def _summary(spent):
+        observed = sum(spent.values())
+        return {
+            "observedS": round(observed, 1),
+            **{f"{s}S": round(spent[s], 1) for s in STATUSES if s != "problem"},
+            "downS": round(spent["problem"], 1),
+            "uptime": round(spent["normal"] / observed, 6) if observed else None,
+        }
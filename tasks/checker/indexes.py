@@ -0,0 +1,82 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from config import (
+    HOURLY_STATS_RETENTION_DAYS, RUN_SNAPSHOT_RETENTION_DAYS, SHARD_LEASE_RETENTION_HOURS, UPTIME_WINDOWS_DAYS,
+)
+
+# 보존 기간이 설정되면 TTL 인덱스를 겸하는 인덱스: 컬렉션 -> 인덱스 이름
+TTL_INDEXES = {"hourly_stats": "timestampHour_1", "run_snapshots": "timestamp_1"}
+
+
+def _ttl_opts(collection, days):
+    opts = {"name": TTL_INDEXES[collection]}
+    if days:
+        opts["expireAfterSeconds"] = int(days * 86400)
+    return opts
+
+
+def index_specs(retention_days=HOURLY_STATS_RETENTION_DAYS, snapshot_retention_days=RUN_SNAPSHOT_RETENTION_DAYS):
+    hour_opts = _ttl_opts("hourly_stats", retention_days)
+
+    return {
+        "hourly_stats": [
+            IndexModel([("agencyId", ASCENDING), ("timestampHour", ASCENDING)], name="agencyId_timestampHour", unique=True),
+            IndexModel([("timestampHour", ASCENDING)], **hour_opts),
+        ],
+        "overall_hourly": [IndexModel([("timestampHour", ASCENDING)], name="timestampHour_unique", unique=True)],
+        "agency_daily": [
+            IndexModel([("agencyId", ASCENDING), ("date", ASCENDING)], name="agencyId_date", unique=True),
+            IndexModel([("date", ASCENDING)], name="date_1"),  # 최근 N일 전 기관 조회 (SiteDeadlines.load)
+        ],
+        "global_daily": [IndexModel([("date", ASCENDING)], name="date_unique", unique=True)],
+        "response_cache": [IndexModel([("url", ASCENDING)], name="url_unique", unique=True)],
+        "crawl_pages": [IndexModel([("url", ASCENDING)], name="url_unique", unique=True)],
+        "run_snapshots": [IndexModel([("timestamp", ASCENDING)], unique=True,
+                                     **_ttl_opts("run_snapshots", snapshot_retention_days))],
+        "probe_schedule": [IndexModel([("agencyId", ASCENDING)], name="agencyId_unique", unique=True)],
+        "scan_leases": [
+            IndexModel([("runId", ASCENDING), ("shard", ASCENDING)], name="runId_shard"),
+            IndexModel([("createdAt", ASCENDING)], name="createdAt_ttl",
+                       expireAfterSeconds=int(SHARD_LEASE_RETENTION_HOURS * 3600)),
+        ],
+        "status_events": [
+            IndexModel([("agencyId", ASCENDING), ("start", ASCENDING)], name="agencyId_start", unique=True),
+            IndexModel([("end", ASCENDING)], name="end_1"),  # 시각 t에 걸쳐 있는 구간 (StatusEvents.cumulative_all)
+        ],
+        "status_index": [
+            IndexModel([("status", ASCENDING), ("since", ASCENDING)], name="status_since"),
+            *(IndexModel([(f"windows.{d}d.downS", DESCENDING)], name=f"windows_{d}d_downS") for d in UPTIME_WINDOWS_DAYS),
+        ],
+        "agencies": [
+            IndexModel([("agencyId", ASCENDING)], name="agencyId_unique", unique=True),
+            IndexModel([("url", ASCENDING)], name="url_1"),
+            IndexModel([("name", ASCENDING)], name="name_1"),
+        ],
+    }
+
+
+def ensure_indexes(db, retention_days=HOURLY_STATS_RETENTION_DAYS,
+                   snapshot_retention_days=RUN_SNAPSHOT_RETENTION_DAYS):
+    """필요한 인덱스를 생성 (이미 있으면 그대로). 컬렉션당 createIndexes 1회"""
+    days = {"hourly_stats": retention_days, "run_snapshots": snapshot_retention_days}
+    created = {}
+    for collection, models in index_specs(retention_days, snapshot_retention_days).items():
+        try:
+            created[collection] = db[collection].create_indexes(models)
+        except OperationFailure as e:
+            if e.code == 85 and collection in TTL_INDEXES:
+                # IndexOptionsConflict: 보존 기간(TTL)만 바뀐 경우 collMod로 갱신
+                _update_ttl(db, collection, days[collection])
+                created[collection] = db[collection].create_indexes(models)
+            else:
+                print(f"⚠️ {collection} 인덱스 생성 실패: {e}")
+    return created
+
+
+def _update_ttl(db, collection, days):
+    name = TTL_INDEXES[collection]
+    if days:
+        db.command("collMod", collection, index={"name": name, "expireAfterSeconds": int(days * 86400)})
+    else:
+        # 보존 기간 해제: TTL 인덱스를 지우면 호출한 쪽의 create_indexes가 일반 인덱스로 다시 만든다
+        db[collection].drop_index(name)
@@ -0,0 +1,60 @@
+class KeywordMatcher:
+    """점검 키워드 매처
+
+    키워드를 생성 시 한 번만 소문자 bytes로 변환해 두고, 본문은 디코딩 없이
+    bytes.lower()를 한 번만 거친 뒤 C 구현 부분 문자열 검색(bytes.find)으로 훑는다.
+    대소문자 무시는 ASCII 범위에만 적용된다 (한글 키워드는 영향 없음).
+
+    키워드 수만큼 find를 도는 것은 의도한 것이다. 단일 패스로 훑는 방법(a|b|... 정규식, 순수 Python
+    Aho-Corasick)은 위치마다 바이트를 하나씩 보는 반면 bytes.find는 C 구현 고속 검색으로 건너뛰며 훑는다.
+    그래서 합성 300KB 페이지 기준 키워드 5개/40개 모두 N번 find가 정규식보다 2~3배 빠르다
+    (bench/bench_matcher.py의 regexMBs와 matcherMBs). 뒤쪽 키워드는 앞서 찾은 위치까지만 훑는다.
+    """
+
+    def __init__(self, keywords, encodings=("utf-8",)):
+        self.keywords = [kw for kw in keywords if kw]
+        self._lookup = {}
+        for kw in self.keywords:
+            for enc in encodings:
+                try:
+                    self._lookup.setdefault(kw.lower().encode(enc), kw)
+                except UnicodeEncodeError:
+                    continue
+        self.patterns = list(self._lookup)
+        self.max_len = max((len(p) for p in self.patterns), default=0)
+
+    def search(self, data: bytes, offset=0):
+        """가장 앞에서 등장하는 키워드의 (키워드, 바이트 오프셋) 또는 None"""
+        if not self.patterns:
+            return None
+        low = data.lower()
+        best, best_at = None, -1
+        for pattern in self.patterns:
+            # 이미 찾은 위치보다 뒤쪽은 볼 필요가 없으므로 검색 범위를 줄인다
+            end = best_at + len(pattern) if best is not None else len(low)
+            at = low.find(pattern, 0, end)
+            if at != -1 and (best is None or at < best_at):
+                best, best_at = pattern, at
+        if best is None:
+            return None
+        return self._lookup[best], offset + best_at
+
+    def stream(self):
+        return MatchStream(self)
+
+
+class MatchStream:
+    """청크 경계에 걸친 키워드도 찾도록 직전 청크의 꼬리(max_len - 1 바이트)를 이어 붙여 검사"""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.tail = b""
+        self.consumed = 0
+
+    def feed(self, chunk: bytes):
+        buf = self.tail + chunk if self.tail else chunk
+        found = self.matcher.search(buf, self.consumed - len(self.tail))
+        self.consumed += len(chunk)
+        keep = self.matcher.max_len - 1
+        self.tail = buf[-keep:] if keep > 0 else b""
+        return found
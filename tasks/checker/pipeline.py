@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from checker.stats import StatsBuilder
+from config import WRITER_QUEUE_SIZE, WRITER_BATCH_SIZE, WRITER_FLUSH_INTERVAL
+
+_STOP = object()
+
+
+class ResultWriter:
+    """검사 결과를 bounded queue로 받아 배치 단위로 MongoDB에 저장하는 백그라운드 writer"""
+
+    def __init__(self, storage, batch_size=WRITER_BATCH_SIZE, flush_interval=WRITER_FLUSH_INTERVAL,
+                 queue_size=WRITER_QUEUE_SIZE, merge_snapshot=False, known_ids=None, categories=None, save_snapshot=True,
+                 defer_writes=False):
+        self.storage = storage
+        # True면 hourly_stats/롤업과 상태 변화 이벤트를 바로 쓰지 않고 모아 두었다가 write_deferred()에서 한 번에 기록
+        # (분산 검사에서 임대를 지킨 채 조각을 끝낸 워커만 쓰도록)
+        self.defer_writes = defer_writes
+        self.deferred = []
+        # False면 hourly_stats/롤업만 저장하고 overall_stats는 쓰지 않는다 (분산 검사에서 병합 워커가 한 번에 기록)
+        self.save_snapshot = save_snapshot
+        # 일부 기관만 검사하는 실행이면 직전 overall_stats 스냅샷과 합친다
+        self.merge_snapshot = merge_snapshot
+        self.known_ids = known_ids
+        self.categories = categories  # agencyId -> (mainCategory, subCategory), 분류별 응답시간 요약용
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.task = None
+        self.latency = None
+
+        self.started_at = datetime.now(timezone.utc)
+        self.bucket_time = self.started_at.replace(minute=0, second=0, microsecond=0)
+        self.snapshot = {}  # agencyId -> 최신 결과 (같은 기관을 재검사하면 마지막 결과로 덮어씀)
+        self.observed = {}  # agencyId -> (최신 결과, 그 상태를 이번 실행에서 처음 본 시각), 상태 변화 이벤트용
+        self.stats = {"flushes": 0, "written": 0, "flushMs": 0.0, "blockedPuts": 0, "blockedMs": 0.0, "maxQueueDepth": 0,
+                      "statusChanges": 0}
+
+    async def start(self):
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def put(self, result):
+        if self.task is not None and self.task.done():
+            self.task.result()  # writer가 예외로 종료됐다면 여기서 전파
+            raise RuntimeError("ResultWriter가 이미 종료되었습니다")
+
+        # 큐가 가득 차면 writer가 따라올 때까지 검사 측이 대기 (back-pressure)
+        if self.queue.full():
+            self.stats["blockedPuts"] += 1
+            t0 = time.perf_counter()
+            await self.queue.put(result)
+            self.stats["blockedMs"] += (time.perf_counter() - t0) * 1000
+        else:
+            self.queue.put_nowait(result)
+        self.stats["maxQueueDepth"] = max(self.stats["maxQueueDepth"], self.queue.qsize())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        deadline = loop.time() + self.flush_interval
+        while True:
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _STOP:
+                await self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or loop.time() >= deadline:
+                await self._flush(batch)
+                batch = []
+                deadline = loop.time() + self.flush_interval
+
+    async def _flush(self, batch):
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        # 같은 실행 안의 재검사 결과는 이미 센 기관을 한 번 더 세게 되므로 hourly_stats/롤업에서 뺀다
+        counted = [r for r in batch if not r.get("retry")]
+        if self.defer_writes:
+            self.deferred += counted
+        else:
+            if counted:
+                await asyncio.to_thread(self.storage.save_hourly, counted, self.bucket_time)
+            self.stats["written"] += len(counted)
+        self.stats["flushMs"] += (time.perf_counter() - t0) * 1000
+        self.stats["flushes"] += 1
+
+        now = datetime.now(timezone.utc)
+        for r in batch:
+            self.snapshot[r["agencyId"]] = self.storage.snapshot_entry(r)
+            prev = self.observed.get(r["agencyId"])
+            self.observed[r["agencyId"]] = (r, prev[1] if prev and prev[0]["status"] == r["status"] else now)
+
+    async def close(self, run_stats=None, completed=True):
+        """남은 결과를 flush하고 overall_stats 스냅샷을 기록한 뒤 요약을 반환
+
+        writer가 예외로 끝났으면 그 예외를 다시 던진다. completed=False(검사 도중 실패/취소)면 hourly_stats까지만
+        flush하고 overall_stats는 덮어쓰지 않는다 (일부 기관만 담긴 스냅샷이 대시보드 현재 상태가 되지 않도록)
+        """
+        if self.task is None:
+            return self.summary()
+        task, self.task = self.task, None
+        if not task.done():
+            # writer가 먼저 죽으면 가득 찬 큐에 _STOP을 넣으려다 멈추지 않도록 둘 중 먼저 끝나는 쪽을 기다린다
+            stop = asyncio.ensure_future(self.queue.put(_STOP))
+            await asyncio.wait({stop, task}, return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+        await task  # writer 예외 전파
+
+        if not completed:
+            print(f"⚠️ 검사가 끝나지 않아 overall_stats는 갱신하지 않습니다 (hourly 저장 {self.stats['written']}건)")
+            return self.summary()
+
+        # 상태 변화는 재검사까지 끝난 최종 판정으로만 기록 (조각 단위 분산 검사에서도 기관이 겹치지 않으므로 각자 기록)
+        if self.observed and not self.defer_writes:
+            await self._save_events()
+
+        if self.snapshot and self.save_snapshot:
+            observed = list(self.snapshot.values())
+            snapshot = observed
+            if self.merge_snapshot:
+                # 직전 값을 이어받는 건 overall_stats(현재 상태)뿐, run_snapshots에는 이번 실행에서 검사한 기관만
+                snapshot = await asyncio.to_thread(self.storage.merge_snapshot, observed, self.known_ids)
+            latency = StatsBuilder.summarize(snapshot, self.categories)
+            await asyncio.to_thread(self.storage.save_overall, snapshot, self.storage.count_overall(snapshot),
+                                    datetime.now(timezone.utc),
+                                    {**(run_stats or {}), "writer": self.summary(), "latency": latency},
+                                    run_snapshot=observed)
+            self.latency = latency["overall"]
+        summary = self.summary()
+        print(f"✅ MongoDB 저장 완료 (hourly={self.bucket_time}, 저장 {summary['written']}건, flush {summary['flushes']}회, "
+              f"flush 누적 {summary['flushMs']:.0f}ms, 대기 {summary['blockedPuts']}회)")
+        return summary
+
+    async def _save_events(self):
+        self.stats["statusChanges"] = await asyncio.to_thread(self.storage.save_events, list(self.observed.values()))
+
+    async def write_deferred(self):
+        """defer_writes로 미뤄 둔 hourly_stats/롤업과 상태 변화 이벤트를 기록 (close(completed=True) 뒤에 호출)"""
+        results, self.deferred = self.deferred, []
+        if results:
+            await asyncio.to_thread(self.storage.save_hourly, results, self.bucket_time)
+        self.stats["written"] += len(results)
+        if self.observed:
+            await self._save_events()
+        return len(results)
+
+    def summary(self):
+        return {**self.stats, "flushMs": round(self.stats["flushMs"], 1), "blockedMs": round(self.stats["blockedMs"], 1),
+                "overall": self.storage.count_overall(self.snapshot.values())}
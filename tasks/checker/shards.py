@@ -0,0 +1,116 @@
+from datetime import datetime, timezone, timedelta
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from config import RUN_INTERVAL, SHARD_SIZE, SHARD_LEASE_TTL
+
+MERGE_SHARD = -1  # 모든 조각이 끝난 뒤 한 워커만 가져가는 병합 작업
+
+
+def run_id_for(now, interval_min=RUN_INTERVAL):
+    """같은 cron 슬롯에 뜬 워커들이 같은 실행 ID를 쓰도록 실행 주기 단위로 내림"""
+    slot = now.replace(second=0, microsecond=0)
+    slot -= timedelta(minutes=slot.minute % interval_min)
+    return slot.strftime("%Y-%m-%dT%H:%M")
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class ShardLeases:
+    """실행(runId)마다 기관 목록을 조각(shard)으로 나눈 임대(lease) 문서를 scan_leases 컬렉션에 두고 워커들이 나눠 맡는다
+
+    문서: {_id: "<runId>/<번호>", runId, shard, agencyIds, state: pending|leased|done, owner, leaseUntil, attempts}
+    - 워커는 pending이거나 임대가 만료된 조각을 find_one_and_update로 하나씩 가져간다 (원자적이라 중복 할당 없음)
+    - 작업 중에는 heartbeat로 leaseUntil을 늘리고, 워커가 죽으면 ttl 뒤에 다른 워커가 다시 가져간다
+    - 조각이 끝나면 결과 스냅샷(기관별 상태/응답시간)을 문서에 담아 done으로 바꾼다
+    """
+
+    def __init__(self, db, collection="scan_leases", ttl=SHARD_LEASE_TTL):
+        self.db = db
+        self.collection = collection
+        self.ttl = timedelta(seconds=ttl)
+
+    def plan(self, run_id, agency_ids, shard_size=SHARD_SIZE, now=None):
+        """조각 문서 생성. 여러 워커가 동시에 호출해도 결과가 같다 (정렬 후 고정 크기로 자르고 $setOnInsert upsert)"""
+        now = now or _now()
+        ids = sorted(agency_ids)
+        shards = [ids[i:i + shard_size] for i in range(0, len(ids), shard_size)]
+        base = {"runId": run_id, "state": "pending", "owner": None, "leaseUntil": None, "attempts": 0, "createdAt": now}
+        ops = [UpdateOne({"_id": f"{run_id}/{k}"}, {"$setOnInsert": {**base, "shard": k, "agencyIds": chunk}}, upsert=True)
+               for k, chunk in enumerate(shards)]
+        ops.append(UpdateOne({"_id": f"{run_id}/merge"},
+                             {"$setOnInsert": {**base, "shard": MERGE_SHARD, "shards": len(shards)}}, upsert=True))
+        try:
+            self.db[self.collection].bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # 다른 워커가 같은 문서를 동시에 upsert한 경우(중복 키)만 무시
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+        return len(shards)
+
+    def _claim(self, flt, worker_id, now):
+        now = now or _now()
+        available = {"$or": [{"state": "pending"}, {"state": "leased", "leaseUntil": {"$lt": now}}]}
+        return self.db[self.collection].find_one_and_update(
+            {**flt, **available},
+            {"$set": {"state": "leased", "owner": worker_id, "leaseUntil": now + self.ttl, "claimedAt": now},
+             "$inc": {"attempts": 1}},
+            sort=[("shard", 1)], return_document=ReturnDocument.AFTER,
+        )
+
+    def claim(self, run_id, worker_id, now=None):
+        """남은 조각 하나를 임대. 없으면 None"""
+        return self._claim({"runId": run_id, "shard": {"$gte": 0}}, worker_id, now)
+
+    def remaining(self, run_id):
+        return self.db[self.collection].count_documents({"runId": run_id, "shard": {"$gte": 0}, "state": {"$ne": "done"}})
+
+    def claim_merge(self, run_id, worker_id, now=None):
+        """모든 조각이 끝났으면 병합 작업을 임대. 아직 남았거나 다른 워커가 병합 중이면 None"""
+        if self.remaining(run_id):
+            return None
+        return self._claim({"_id": f"{run_id}/merge"}, worker_id, now)
+
+    def merged(self, run_id):
+        doc = self.db[self.collection].find_one({"_id": f"{run_id}/merge"}, {"state": 1})
+        return bool(doc) and doc["state"] == "done"
+
+    def heartbeat(self, worker_id, lease_ids, now=None):
+        """가진 임대의 만료 시각 연장. 연장된 개수를 반환 (적으면 만료돼 다른 워커에게 넘어간 것)"""
+        if not lease_ids:
+            return 0
+        now = now or _now()
+        result = self.db[self.collection].update_many(
+            {"_id": {"$in": list(lease_ids)}, "owner": worker_id, "state": "leased"},
+            {"$set": {"leaseUntil": now + self.ttl}},
+        )
+        return result.matched_count
+
+    def complete(self, lease_id, worker_id, results=None, stats=None, now=None):
+        """조각 완료 + 결과 스냅샷 저장. 그 사이 임대를 잃었으면 False (다른 워커의 결과를 덮어쓰지 않음)"""
+        update = {"state": "done", "doneAt": now or _now(), "results": results or [], "stats": stats or {}}
+        result = self.db[self.collection].update_one(
+            {"_id": lease_id, "owner": worker_id, "state": "leased"}, {"$set": update})
+        return result.matched_count == 1
+
+    def done_shards(self, run_id):
+        return list(self.db[self.collection].find({"runId": run_id, "shard": {"$gte": 0}, "state": "done"},
+                                                  sort=[("shard", 1)]))
+
+    @staticmethod
+    def report(shards):
+        """병합 시 run_stats에 남기는 요약: 워커별 조각/기관 수, 재임대된 조각 수, 첫 임대~마지막 완료 시간"""
+        workers = {}
+        for s in shards:
+            w = workers.setdefault(s["owner"], {"shards": 0, "sites": 0})
+            w["shards"] += 1
+            w["sites"] += len(s["results"])
+        started = min((s["claimedAt"] for s in shards), default=None)
+        finished = max((s["doneAt"] for s in shards), default=None)
+        return {
+            "shards": len(shards),
+            "workers": workers,
+            "reclaimed": sum(1 for s in shards if s["attempts"] > 1),
+            "scanMs": int((finished - started).total_seconds() * 1000) if started and finished else None,
+        }
@@ -0,0 +1,34 @@
+import csv
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+
+def agency_id_for(url: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+
+
+def normalize_url(url: str):
+    """중복 판정용 URL 정규화 (스킴/호스트 소문자, 기본 포트·끝 슬래시·#fragment 제거). 잘못된 URL이면 None"""
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return None
+    if scheme not in ("http", "https") or not host:
+        return None
+    netloc = host if port is None or (scheme, port) in (("http", 80), ("https", 443)) else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path.rstrip("/") or "/", parts.query, ""))
+
+
+def load_sites(csv_file: str):
+    agencies = []
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader)  # 헤더 스킵
+        for row in reader:
+            if len(row) >= 2 and row[1].strip():
+                name, url = row[0].strip(), row[1].strip()
+                agencies.append({"agencyId": agency_id_for(url), "name": name, "url": url})
+    return agencies
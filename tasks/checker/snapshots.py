@@ -0,0 +1,129 @@
+from datetime import timezone
+import numpy as np
+from bson.binary import Binary
+from pymongo import ReturnDocument
+
+# 상태 코드 (uint8). 해당 실행에서 결과가 없는 기관은 STATUS_MISSING
+STATUS_CODES = {"normal": 0, "maintenance": 1, "problem": 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+STATUS_MISSING = 255
+
+RT_DTYPES = {2: np.dtype("<u2"), 4: np.dtype("<u4")}
+
+
+class RunSnapshots:
+    """실행(run)별 스냅샷을 열(column) 단위 바이너리로 저장/조회
+
+    기관 UUID는 snapshot_agencies의 인덱스 표에 한 번만 저장하고(추가만 하므로 위치가 바뀌지 않음),
+    run_snapshots 문서에는 위치 순서대로 상태(uint8 배열)와 응답시간(ms, uint16 또는 uint32 배열)만 담는다.
+    응답시간이 없으면 해당 dtype의 최댓값을 결측으로 쓴다.
+    """
+
+    def __init__(self, db, collection="run_snapshots", index_collection="snapshot_agencies"):
+        self.db = db
+        self.collection = collection
+        self.index_collection = index_collection
+        self.agency_ids = None
+        self.positions = {}
+
+    def _set_index(self, agency_ids):
+        self.agency_ids = agency_ids
+        self.positions = {}
+        for i, agency_id in enumerate(agency_ids):
+            self.positions.setdefault(agency_id, i)  # 동시에 추가돼 중복된 ID는 첫 위치를 사용
+
+    def load_index(self):
+        doc = self.db[self.index_collection].find_one({"_id": "agencies"}) or {}
+        self._set_index(doc.get("agencyIds", []))
+        return self.agency_ids
+
+    def positions_for(self, agency_ids):
+        """기관 ID들의 인덱스 위치. 처음 보는 기관은 인덱스 표 끝에 추가 (왕복 1회)"""
+        if self.agency_ids is None:
+            self.load_index()
+        new = list(dict.fromkeys(a for a in agency_ids if a not in self.positions))
+        if new:
+            doc = self.db[self.index_collection].find_one_and_update(
+                {"_id": "agencies"}, {"$push": {"agencyIds": {"$each": new}}},
+                upsert=True, return_document=ReturnDocument.AFTER,
+            )
+            self._set_index(doc["agencyIds"])
+        return np.fromiter((self.positions[a] for a in agency_ids), dtype=np.int64, count=len(agency_ids))
+
+    def encode(self, agencies_snapshot, overall, now):
+        """overall_stats 스냅샷(list of {agencyId, status, responseTime}) → run_snapshots 문서"""
+        pos = self.positions_for([a["agencyId"] for a in agencies_snapshot])
+        n = int(pos.max()) + 1 if len(pos) else 0
+
+        statuses = np.full(n, STATUS_MISSING, dtype=np.uint8)
+        statuses[pos] = [STATUS_CODES.get(a["status"], STATUS_MISSING) for a in agencies_snapshot]
+
+        times = np.array([a.get("responseTime") if a.get("responseTime") is not None else -1
+                          for a in agencies_snapshot], dtype=np.int64)
+        width = 2 if times.max(initial=0) < np.iinfo(np.uint16).max else 4
+        dtype = RT_DTYPES[width]
+        response_times = np.full(n, np.iinfo(dtype).max, dtype=dtype)
+        response_times[pos] = np.where(times < 0, np.iinfo(dtype).max, times)
+
+        return {
+            "timestamp": now,
+            "n": n,
+            "statuses": Binary(statuses.tobytes()),
+            "responseTimes": Binary(response_times.tobytes()),
+            "rtWidth": width,
+            "overall": overall,
+        }
+
+    def load(self, start, end=None):
+        """[start, end) 구간의 실행들을 RunSeries(NumPy 배열)로 디코딩"""
+        flt = {"timestamp": {"$gte": start, **({"$lt": end} if end is not None else {})}}
+        docs = list(self.db[self.collection].find(flt, {"_id": 0, "overall": 0}, sort=[("timestamp", 1)]))
+        self.load_index()
+        return RunSeries.decode(docs, self.agency_ids)
+
+
+def _naive_utc(ts):
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+class RunSeries:
+    """실행 R개 × 기관 N개 배열
+    - timestamps: datetime64[ms] (R,)
+    - statuses: uint8 (R, N), 결측은 STATUS_MISSING
+    - response_times: float32 (R, N) ms, 결측은 NaN
+    """
+
+    def __init__(self, timestamps, agency_ids, statuses, response_times):
+        self.timestamps = timestamps
+        self.agency_ids = agency_ids
+        self.statuses = statuses
+        self.response_times = response_times
+
+    @classmethod
+    def decode(cls, docs, agency_ids):
+        n = max((doc["n"] for doc in docs), default=0)
+        statuses = np.full((len(docs), n), STATUS_MISSING, dtype=np.uint8)
+        response_times = np.full((len(docs), n), np.nan, dtype=np.float32)
+        for i, doc in enumerate(docs):
+            k = doc["n"]
+            statuses[i, :k] = np.frombuffer(doc["statuses"], dtype=np.uint8)
+            dtype = RT_DTYPES[doc["rtWidth"]]
+            raw = np.frombuffer(doc["responseTimes"], dtype=dtype)
+            response_times[i, :k] = np.where(raw == np.iinfo(dtype).max, np.nan, raw)
+        # datetime64는 타임존이 없으므로 UTC 기준 naive로 변환
+        timestamps = np.array([_naive_utc(doc["timestamp"]) for doc in docs], dtype="datetime64[ms]")
+        return cls(timestamps, list(agency_ids[:n]), statuses, response_times)
+
+    def column(self, agency_id):
+        return self.agency_ids.index(agency_id)
+
+    def counts(self):
+        """실행별 상태 개수 {status: (R,) 배열}"""
+        return {name: (self.statuses == code).sum(axis=1) for name, code in STATUS_CODES.items()}
+
+    def uptime(self):
+        """기관별 정상 비율 (결측 실행 제외), (N,)"""
+        observed = (self.statuses != STATUS_MISSING).sum(axis=0)
+        normal = (self.statuses == STATUS_CODES["normal"]).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(observed > 0, normal / observed, np.nan)
@@ -1,3 +1,78 @@
+import bisect
+import numpy as np
+from config import LATENCY_BUCKETS, LATENCY_PERCENTILES
+
+STATUSES = ("normal", "maintenance", "problem")
+# 요청 단계 (checker/timing.py): 대기(커넥터 풀) → DNS → TCP 연결+TLS → 첫 바이트(요청 헤더 전송 ~ 응답 헤더 수신) → 본문 수신
+PHASES = ("queue", "dns", "connect", "ttfb", "body")
+_STATUS_INDEX = {s: i for i, s in enumerate(STATUSES)}
+_EDGES = np.asarray(LATENCY_BUCKETS, dtype=np.float64)
+N_BUCKETS = len(LATENCY_BUCKETS) + 1
+
+
+def bucket_of(response_times):
+    """응답시간(ms) 배열 → 히스토그램 버킷 번호 배열. 버킷 i는 [LATENCY_BUCKETS[i-1], LATENCY_BUCKETS[i])"""
+    return np.searchsorted(_EDGES, response_times, side="right")
+
+
+class LatencyHistogram:
+    """고정 버킷 응답시간 히스토그램. 버킷이 같으므로 시간별/일별로 더해도(merge) 원본 없이 분위수를 근사할 수 있다"""
+
+    def __init__(self, counts=None, total_ms=0.0, min_ms=None, max_ms=None):
+        self.counts = np.zeros(N_BUCKETS, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.total_ms = total_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+
+    @classmethod
+    def of(cls, response_times):
+        rt = np.asarray(response_times, dtype=np.float64)
+        rt = rt[~np.isnan(rt)]
+        if not len(rt):
+            return cls()
+        return cls(np.bincount(bucket_of(rt), minlength=N_BUCKETS), float(rt.sum()), float(rt.min()), float(rt.max()))
+
+    @classmethod
+    def from_stats(cls, stats):
+        """롤업 문서의 stats(latencyHist = {"버킷 번호": 개수}, responseTimeSum/Min/Max)에서 복원"""
+        counts = np.zeros(N_BUCKETS, dtype=np.int64)
+        for i, c in (stats.get("latencyHist") or {}).items():
+            counts[int(i)] = c
+        return cls(counts, stats.get("responseTimeSum", 0), stats.get("responseTimeMin"), stats.get("responseTimeMax"))
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def merge(self, other):
+        mins = [m for m in (self.min_ms, other.min_ms) if m is not None]
+        maxs = [m for m in (self.max_ms, other.max_ms) if m is not None]
+        return LatencyHistogram(self.counts + other.counts, self.total_ms + other.total_ms,
+                                min(mins) if mins else None, max(maxs) if maxs else None)
+
+    def quantile(self, q):
+        """q(0~1) 분위수 근사: 해당 버킷 안에서 선형 보간 (양 끝은 관측된 최소/최대로 제한)"""
+        n = self.count
+        if not n:
+            return None
+        cum = np.cumsum(self.counts)
+        rank = q * n
+        i = int(np.searchsorted(cum, rank, side="left"))
+        i = min(i, N_BUCKETS - 1)
+        lo = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+        hi = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else (self.max_ms or lo)
+        if self.min_ms is not None:
+            lo = max(lo, self.min_ms)
+        if self.max_ms is not None:
+            hi = min(hi, self.max_ms)
+        before = cum[i - 1] if i > 0 else 0
+        frac = (rank - before) / self.counts[i] if self.counts[i] else 0.0
+        return round(float(lo + (hi - lo) * frac), 1)
+
+    def percentiles(self, ps=LATENCY_PERCENTILES):
+        return {f"p{p}": self.quantile(p / 100) for p in ps}
+
+
 class StatsBuilder:
     @staticmethod
     def build(results):
@@ -16,3 +91,121 @@ class StatsBuilder:
             overall["total"] += 1
 
         return {"overall": overall, "perAgency": per_agency}
+
+    @staticmethod
+    def summarize(results, categories=None, percentiles=LATENCY_PERCENTILES):
+        """상태 개수 + 응답시간 분위수 + 고정 버킷 히스토그램을 전체/대분류/소분류별로 계산.
+        categories: agencyId -> (mainCategory, subCategory) (AgencyManager.classify_agency 결과)"""
+        n = len(results)
+        agency_index = {}
+        agencies = np.fromiter((agency_index.setdefault(r["agencyId"], len(agency_index)) for r in results),
+                               dtype=np.int64, count=n)
+        statuses = np.fromiter((_STATUS_INDEX[r["status"]] for r in results), dtype=np.int8, count=n)
+        response_times = np.fromiter(
+            (np.nan if r.get("responseTime") is None else r["responseTime"] for r in results), dtype=np.float64, count=n)
+
+        groups = {"overall": np.zeros(n, dtype=np.int64)}
+        names = {"overall": ["overall"]}
+        if categories:
+            # 분류는 기관 단위로 한 번만 찾고, 결과별 그룹 번호는 배열 인덱싱으로 펼친다
+            for level, key in (("mainCategory", lambda c: c[0]), ("subCategory", lambda c: f"{c[0]}/{c[1]}")):
+                codes = {}
+                per_agency = np.array([codes.setdefault(key(categories.get(aid, ("기타", "기타"))), len(codes))
+                                       for aid in agency_index], dtype=np.int64)
+                groups[level] = per_agency[agencies] if n else agencies
+                names[level] = list(codes)
+
+        summary = {}
+        for level, group in groups.items():
+            table = StatsBuilder.summarize_arrays(statuses, response_times, group, len(names[level]), percentiles)
+            summary[level] = dict(zip(names[level], table))
+        summary["overall"] = summary["overall"]["overall"]
+        return summary
+
+    @staticmethod
+    def summarize_arrays(statuses, response_times, groups, n_groups, percentiles=LATENCY_PERCENTILES):
+        """NumPy 배열(상태 번호, 응답시간 ms(NaN=없음), 그룹 번호)을 그룹별 요약 목록으로. 그룹 수와 무관하게 정렬 1회"""
+        counts = np.bincount(groups * len(STATUSES) + statuses, minlength=n_groups * len(STATUSES))
+        counts = counts.reshape(n_groups, len(STATUSES))
+
+        has_rt = ~np.isnan(response_times)
+        rt, g = response_times[has_rt], groups[has_rt]
+        hist = np.bincount(g * N_BUCKETS + bucket_of(rt), minlength=n_groups * N_BUCKETS).reshape(n_groups, N_BUCKETS)
+        sizes = np.bincount(g, minlength=n_groups)
+        sums = np.bincount(g, weights=rt, minlength=n_groups)
+
+        # 그룹별 정확한 분위수: (그룹, 응답시간) 순 정렬 후 그룹 경계 안에서 선형 보간 (numpy 기본 방식과 동일)
+        order = np.lexsort((rt, g))
+        sorted_rt = rt[order]
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        quantiles = {}
+        for p in percentiles:
+            pos = starts + (sizes - 1).clip(min=0) * (p / 100)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, starts + sizes - 1).clip(min=0)
+            lo = lo.clip(max=max(len(sorted_rt) - 1, 0))
+            if len(sorted_rt):
+                value = sorted_rt[lo] + (sorted_rt[hi] - sorted_rt[lo]) * (pos - lo)
+            else:
+                value = np.zeros(n_groups)
+            quantiles[f"p{p}"] = value
+
+        table = []
+        for k in range(n_groups):
+            row = {"total": int(counts[k].sum())}
+            row.update({s: int(counts[k, i]) for i, s in enumerate(STATUSES)})
+            has = sizes[k] > 0
+            row["responseTimeMean"] = round(float(sums[k] / sizes[k]), 1) if has else None
+            row.update({name: round(float(v[k]), 1) if has else None for name, v in quantiles.items()})
+            row["latencyHist"] = hist[k].tolist()
+            table.append(row)
+        return table
+
+    @staticmethod
+    def rollup(results):
+        # 상태별 횟수 + 응답시간 합/최소/최대 + 버킷 히스토그램 + 단계별 시간 합 (롤업 문서 한 개 분량)
+        acc = {"total": 0, "normal": 0, "maintenance": 0, "problem": 0,
+               "responseTimeSum": 0, "responseTimeMin": None, "responseTimeMax": None}
+        hist = {}
+        timing = {}
+        for r in results:
+            # 상태 횟수는 검사 주기 가중치(checker.tiers.weight_for)만큼, 응답시간/단계 시간은 실제 프로브 수로 센다
+            weight = r.get("weight", 1)
+            acc[r["status"]] += weight
+            acc["total"] += weight
+            t = r.get("timing")
+            if t and "failedPhase" not in t:
+                # 평균은 합 / samples (측정한 프로브만)
+                timing["samples"] = timing.get("samples", 0) + 1
+                for p in PHASES:
+                    timing[f"{p}Ms"] = timing.get(f"{p}Ms", 0) + t[f"{p}Ms"]
+            rt = r.get("responseTime")
+            # HTTP 응답을 못 받은 프로브(error)의 responseTime은 기본값이라 응답시간 합/히스토그램에 넣지 않는다
+            # (agency_daily 히스토그램이 SiteDeadlines의 타임아웃 이력이므로 실패가 기한을 상한 쪽으로 끌어올리지 않도록)
+            if rt is not None and not r.get("error"):
+                # 결과 한두 건씩 자주 호출되므로 NumPy 대신 bisect
+                bucket = str(bisect.bisect_right(LATENCY_BUCKETS, rt))
+                hist[bucket] = hist.get(bucket, 0) + 1
+                acc["responseTimeSum"] += rt
+                acc["responseTimeMin"] = rt if acc["responseTimeMin"] is None else min(acc["responseTimeMin"], rt)
+                acc["responseTimeMax"] = rt if acc["responseTimeMax"] is None else max(acc["responseTimeMax"], rt)
+        acc["latencyHist"] = hist
+        if timing:
+            acc["timing"] = timing
+        return acc
+
+    @staticmethod
+    def rollup_update(acc, keys):
+        # 같은 문서에 여러 번 나눠 써도 합산되도록 $inc/$min/$max로 표현 (히스토그램도 버킷별 $inc)
+        update = {
+            "$setOnInsert": keys,
+            "$inc": {f"stats.{k}": acc[k] for k in ("total", "normal", "maintenance", "problem", "responseTimeSum")},
+        }
+        for i, c in acc.get("latencyHist", {}).items():
+            update["$inc"][f"stats.latencyHist.{i}"] = c
+        for k, v in acc.get("timing", {}).items():
+            update["$inc"][f"stats.timing.{k}"] = v
+        if acc["responseTimeMin"] is not None:
+            update["$min"] = {"stats.responseTimeMin": acc["responseTimeMin"]}
+            update["$max"] = {"stats.responseTimeMax": acc["responseTimeMax"]}
+        return update
@@ -1,112 +1,420 @@
 import asyncio
+import errno
 import aiohttp, time
+from contextlib import asynccontextmanager
 from aiohttp import ClientConnectorCertificateError
-import csv
-import uuid
 from ssl import SSLCertVerificationError
-from config import TIMEOUT_THRESHOLD, USER_AGENT
+from config import (
+    TIMEOUT_THRESHOLD, USER_AGENT, CONCURRENCY_INITIAL, PROBE_MODE, PROBE_MAX_BYTES, PROBE_CHUNK_SIZE, TIMING_SAMPLE_RATE,
+    HEDGE_MAX_RATIO, RESET_RETRIES, RESET_RETRY_DELAY,
+)
+from checker.sites import load_sites
+from checker.concurrency import AdaptiveLimiter, make_connector
+from checker.matcher import KeywordMatcher
+from checker.cache import body_hasher
+from checker.timing import PhaseTimer, trace_configs
+from checker.deadlines import DEFAULT_DEADLINE
+
+
+def _is_reset(error):
+    """연결 리셋/서버가 응답 전에 끊은 경우 (빠른 재시도 대상)"""
+    if isinstance(error, (aiohttp.ServerDisconnectedError, ConnectionResetError)):
+        return True
+    return isinstance(error, aiohttp.ClientOSError) and error.errno in (errno.ECONNRESET, errno.EPIPE)
 
 
 class StatusChecker:
-    def __init__(self, db=None, maintenance_keywords=None):
+    def __init__(self, db=None, maintenance_keywords=None, probe_mode=PROBE_MODE, max_bytes=PROBE_MAX_BYTES,
+                 keyword_overrides=None, cache=None, session=None, timing_sample_rate=TIMING_SAMPLE_RATE,
+                 deadlines=None, hedge_ratio=HEDGE_MAX_RATIO, reset_retries=RESET_RETRIES):
         self.db = db
+        self.cache = cache
+        self.deadlines = deadlines  # SiteDeadlines: 기관별 타임아웃/헤지 시점 (없으면 TIMEOUT_THRESHOLD 하나)
+        self.hedge_ratio = hedge_ratio
+        self.reset_retries = reset_retries
+        self.attempt_stats = self._new_attempt_stats()
+        self.session = session  # 주어지면 실행마다 새로 만들지 않고 재사용 (데몬 모드)
+        self.probe_mode = probe_mode
+        self.max_bytes = max_bytes
+        self.timer = PhaseTimer(timing_sample_rate)  # 요청 단계별 시간 (session에 TraceConfig가 붙어 있어야 측정됨)
         self.results = []
+        self.summary = {"total": 0, "normal": 0, "maintenance": [], "problem": [], "bytesRead": 0}
+        self.run_stats = {}
+        self.first_request_at = None  # 이번 실행 첫 요청 시각 (time.perf_counter, 시작 시간 측정용)
         self.maintenance_keywords = maintenance_keywords or [
             "점검", "일시중단", "서비스중단", "maintenance", "개선작업"
         ]
+        # 기관별 키워드 목록 (agencyId -> 키워드 리스트, 기본 목록을 대체)
+        self.keyword_overrides = keyword_overrides or {}
+        self.matcher = KeywordMatcher(self.maintenance_keywords)
+        self._override_matchers = {}
 
-    async def check_site_status(self, session, semaphore, agency_id, url):
-        async with semaphore:
-            start_time = time.monotonic()
-            response_time = TIMEOUT_THRESHOLD
-            status = "problem"
-
-            try:
-                async with session.get(
-                    url,
-                    allow_redirects=True,
-                    timeout=aiohttp.ClientTimeout(total=TIMEOUT_THRESHOLD/1000)
-                ) as response:
-                    raw = await response.read()
-                    text = raw.decode(errors="ignore")
-                    response_time = int((time.monotonic() - start_time) * 1000)
-
-                    # 상태 판별
-                    if response.status == 200:
-                        status = "normal" if response_time < TIMEOUT_THRESHOLD else "problem"
-                    elif response.status == 503:
-                        status = "maintenance"
-                    else:
-                        status = "problem"
-
-                    # 본문 내 점검 키워드 탐지
-                    if status == "normal":
-                        for kw in self.maintenance_keywords:
-                            if kw.lower() in text.lower():
-                                status = "maintenance"
-                                break
-                    # print(f"✅ 요청 성공: {url} -> {status}")
-
-            except (ClientConnectorCertificateError, SSLCertVerificationError):
-                try:
-                    async with session.get(
-                        url,
-                        allow_redirects=True,
-                        timeout=aiohttp.ClientTimeout(total=TIMEOUT_THRESHOLD/1000),
-                        ssl=False
-                    ) as response:
-                        response_time = int((time.monotonic() - start_time) * 1000)
-                        status = "normal" if response.status == 200 else "problem"
-                        # print(f"🔁 insecure retry 성공: {url} -> {status}")
-                except Exception as e2:
-                    status = "problem"
-            except Exception as e:
-                # print(f"❌ 요청 실패: {url} -> {e if e else 'Timeout'}")
-                status = "problem"
+    @staticmethod
+    def _new_attempt_stats():
+        return {"probes": 0, "hedged": 0, "hedgeWins": 0, "resetRetries": 0, "resetRecovered": 0,
+                "insecureRetries": 0, "decidedBy": {}}
+
+    def matcher_for(self, agency_id):
+        keywords = self.keyword_overrides.get(agency_id)
+        if not keywords:
+            return self.matcher
+        key = tuple(keywords)
+        if key not in self._override_matchers:
+            self._override_matchers[key] = KeywordMatcher(keywords)
+        return self._override_matchers[key]
+
+    async def check_site_status(self, session, limiter, agency_id, url):
+        async with limiter.slot(url):
+            self.attempt_stats["probes"] += 1
+            deadline = self.deadlines.for_site(agency_id) if self.deadlines else DEFAULT_DEADLINE
+            timeout = deadline.client_timeout()
+            trace = self.timer.start()  # 단계 시간 측정 여부는 프로브 단위로 정하고 헤지/재시도에도 그대로 쓴다
+            attempts = 1
+
+            # 1) 기본 요청 (이력상 p95를 넘기면 같은 요청을 하나 더 보내 먼저 응답한 쪽을 사용)
+            outcome = await self._hedged(session, limiter, agency_id, url, deadline, timeout, trace)
+            attempts += outcome.pop("hedged", 0)
+
+            # 2) 연결 리셋/끊김은 일시적인 경우가 많으므로 같은 프로브 안에서 짧게 쉬고 재시도
+            retries = 0
+            while _is_reset(outcome["error"]) and retries < self.reset_retries:
+                retries += 1
+                self.attempt_stats["resetRetries"] += 1
+                await asyncio.sleep(RESET_RETRY_DELAY)
+                outcome = await self._attempt(session, agency_id, url, timeout, trace)
+                outcome["decidedBy"] = "resetRetry"
+                attempts += 1
+                if outcome["error"] is None:
+                    self.attempt_stats["resetRecovered"] += 1
+
+            # 3) 인증서 검증 실패는 검증 없이 재시도. 첫 시도 시간은 따로 남기고 응답시간/단계 시간은 재시도만 잰다
+            first_attempt = None
+            if isinstance(outcome["error"], (ClientConnectorCertificateError, SSLCertVerificationError)):
+                first_attempt = outcome["elapsedMs"]
+                self.attempt_stats["insecureRetries"] += 1
+                outcome = await self._attempt(session, agency_id, url, timeout, trace, insecure=True)
+                outcome["decidedBy"] = "insecureRetry"
+                attempts += 1
+            self.attempt_stats["decidedBy"][outcome["decidedBy"]] = self.attempt_stats["decidedBy"].get(outcome["decidedBy"], 0) + 1
 
-            return {
+            status, matched = outcome["status"], outcome["matched"]
+            self.timer.record(outcome["timing"])
+            limiter.observe(outcome["responseTime"], outcome["congested"])
+            result = {
                 "agencyId": agency_id,
                 "url": url,
                 "status": status,
-                "responseTime": response_time,
+                "responseTime": outcome["responseTime"],
+                "bytesRead": outcome["bytesRead"],
+                "decidedBy": outcome["decidedBy"],
             }
+            if attempts > 1:
+                result["attempts"] = attempts
+            if outcome["error"] is not None:
+                # HTTP 응답을 못 받은 프로브: responseTime은 기본값(TIMEOUT_THRESHOLD)이라 응답시간 이력에서는 뺀다
+                result["error"] = type(outcome["error"]).__name__
+            if status == "maintenance" and matched:
+                result["maintenanceKeyword"], result["keywordOffset"] = matched
+            if outcome["timing"]:
+                result["timing"] = outcome["timing"]
+            if first_attempt is not None:
+                result["insecureRetry"] = True
+                result["firstAttemptMs"] = first_attempt
+            return result
+
+    def _hedge_allowed(self):
+        # 헤지 요청은 이번 실행 검사 수의 HEDGE_MAX_RATIO까지만 (장애가 몰릴 때 부하가 두 배가 되지 않도록)
+        return self.attempt_stats["hedged"] < max(1, int(self.attempt_stats["probes"] * self.hedge_ratio))
+
+    async def _hedge(self, session, agency_id, url, timeout, trace, release):
+        try:
+            return await self._attempt(session, agency_id, url, timeout, trace)
+        finally:
+            await release()
+
+    async def _hedged(self, session, limiter, agency_id, url, deadline, timeout, trace=None):
+        """기본 요청이 deadline.hedge_after 안에 끝나지 않으면 헤지 요청을 보내고, HTTP 응답을 먼저 받은 쪽을 반환
+
+        헤지 요청도 동시성 한도의 자리를 하나 따로 차지한다 (AIMD 한도와 호스트 상한이 실제 동시 요청 수를 세도록).
+        자리가 없으면 기다리지 않고 헤지를 생략한다: 한도가 찼다는 건 이미 혼잡하다는 뜻이라 요청을 늘리지 않는다
+        """
+        primary = asyncio.ensure_future(self._attempt(session, agency_id, url, timeout, trace))
+        pending = {primary: "primary"}
+        hedged = 0
+        try:
+            if deadline.hedge_after and self.hedge_ratio > 0:
+                done, _ = await asyncio.wait({primary}, timeout=deadline.hedge_after / 1000)
+                release = await limiter.try_acquire(url) if not done and self._hedge_allowed() else None
+                if release is not None:
+                    self.attempt_stats["hedged"] += 1
+                    pending[asyncio.ensure_future(self._hedge(session, agency_id, url, timeout, trace, release))] = "hedge"
+                    hedged = 1
+
+            failed = None
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 동시에 끝났으면 기본 요청 우선. 둘 다 실패하면 기본 요청의 실패를 반환
+                for task in sorted(done, key=lambda t: pending[t] != "primary"):
+                    outcome = task.result()
+                    outcome["decidedBy"] = pending.pop(task)
+                    outcome["hedged"] = hedged
+                    if outcome["error"] is None:
+                        if outcome["decidedBy"] == "hedge":
+                            self.attempt_stats["hedgeWins"] += 1
+                        return outcome
+                    if failed is None or outcome["decidedBy"] == "primary":
+                        failed = outcome
+            return failed
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _attempt(self, session, agency_id, url, timeout, trace=None, insecure=False, conditional=True):
+        """요청 1회. 예외는 밖으로 던지지 않고 outcome["error"]에 담는다. trace: 프로브의 PhaseTimer.start() 결과
+
+        conditional=False면 캐시가 있어도 조건부 헤더(If-None-Match 등)를 붙이지 않는다
+        """
+        start_time = time.monotonic()
+        if self.first_request_at is None:
+            self.first_request_at = time.perf_counter()
+        probe_trace, trace = trace, PhaseTimer.restart(trace)
+        refetch = False
+        outcome = {"status": "problem", "responseTime": TIMEOUT_THRESHOLD, "bytesRead": 0, "matched": None,
+                   "congested": True, "timing": None, "error": None}  # congested: HTTP 응답 자체를 못 받은 경우
+        try:
+            if insecure:
+                kwargs = {"ssl": False}
+            else:
+                kwargs = {"headers": self.cache.conditional_headers(url) if self.cache and conditional else None}
+            async with session.get(url, allow_redirects=True, timeout=timeout, trace_request_ctx=trace, **kwargs) as response:
+                # 304인데 재사용할 판정이 없으면(캐시 항목이 없거나 서버가 조건 없이 304) 조건 없이 한 번 다시 받는다
+                cached = self.cache.get(url) if self.cache and not insecure else None
+                refetch = response.status == 304 and cached is None and conditional and not insecure
+                # 200일 때만 본문을 읽어 점검 키워드 탐지, 304면 지난 판정 재사용
+                # (인증서 검증을 끈 재시도는 응답 코드만 본다)
+                matched = None
+                bytes_read = 0
+                if not insecure and response.status == 200 and self.cache:
+                    matched, bytes_read = await self.scan_body_cached(response, self.matcher_for(agency_id), url)
+                elif not insecure and response.status == 200:
+                    matched, bytes_read = await self.scan_body(response, self.matcher_for(agency_id))
+                elif response.status == 304 and cached is not None:
+                    matched = self.cache.cached_verdict(cached)
+                    self.cache.stats["requests"] += 1
+                    self.cache.stats["notModified"] += 1
+                    self.cache.stats["bytesSaved"] += cached.get("size") or 0
+                response_time = int((time.monotonic() - start_time) * 1000)
+                outcome["timing"] = self.timer.finish(trace)
+
+                # 상태 판별
+                if insecure:
+                    status = "normal" if response.status == 200 else "problem"
+                elif response.status == 200 or (response.status == 304 and cached is not None):
+                    status = "normal" if response_time < TIMEOUT_THRESHOLD else "problem"
+                elif response.status == 503:
+                    status = "maintenance"
+                else:
+                    status = "problem"
 
-    async def check_all_sites_from_csv(self, csv_file: str, concurrency=30):
-        agencies = []
-        with open(csv_file, "r", encoding="utf-8-sig") as f:
-            reader = csv.reader(f)
-            next(reader)  # 헤더 스킵
-            for row in reader:
-                if len(row) >= 2 and row[1].strip():
-                    name, url = row[0].strip(), row[1].strip()
-                    agency_id = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
-                    agencies.append({"agencyId": agency_id, "name": name, "url": url})
-
-        semaphore = asyncio.Semaphore(concurrency)
-        async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
+                if status == "normal" and matched:
+                    status = "maintenance"
+                outcome.update(status=status, responseTime=response_time, bytesRead=bytes_read, matched=matched,
+                               congested=False)
+                # print(f"✅ 요청 성공: {url} -> {status}")
+        except Exception as e:
+            # print(f"❌ 요청 실패: {url} -> {e if e else 'Timeout'}")
+            outcome["error"] = e
+            outcome["timing"] = outcome["timing"] or self.timer.finish(trace, failed=True)
+        if refetch:
+            return await self._attempt(session, agency_id, url, timeout, probe_trace, conditional=False)
+        outcome["elapsedMs"] = int((time.monotonic() - start_time) * 1000)
+        return outcome
+
+    async def scan_body(self, response, matcher):
+        """본문에서 점검 키워드를 찾는다. ((키워드, 바이트 오프셋) 또는 None, 읽은 바이트 수) 반환"""
+        if self.probe_mode == "full":
+            raw = await response.read()
+            return matcher.search(raw), len(raw)
+
+        # partial: 청크 단위로 읽다가 키워드를 찾거나 max_bytes에 도달하면 중단
+        stream = matcher.stream()
+        bytes_read = 0
+        async for chunk in response.content.iter_chunked(PROBE_CHUNK_SIZE):
+            bytes_read += len(chunk)
+            found = stream.feed(chunk)
+            if found:
+                return found, bytes_read
+            if bytes_read >= self.max_bytes:
+                break
+        return None, bytes_read
+
+    async def scan_body_cached(self, response, matcher, url):
+        """캐시 사용 시: 본문(partial이면 max_bytes까지)을 청크 단위로 키워드 검사와 해시를 함께 하며 읽는다
+
+        키워드를 찾으면 scan_body처럼 바로 멈추고 판정만 저장한다 (다음 304에서 재사용, 본문 해시는 남기지 않음).
+        끝까지 키워드가 없던 본문만 해시를 저장하고, 지난번과 같으면 hashHits로 센다
+        """
+        limit = self.max_bytes if self.probe_mode == "partial" else None
+        stream = matcher.stream()
+        hasher = body_hasher()
+        hashed = bytes_read = 0
+        matched = None
+        async for chunk in response.content.iter_chunked(PROBE_CHUNK_SIZE):
+            bytes_read += len(chunk)
+            matched = stream.feed(chunk)
+            if matched:
+                break
+            part = chunk[:limit - hashed] if limit else chunk
+            hasher.update(part)
+            hashed += len(part)
+            if limit and bytes_read >= limit:
+                break
+
+        self.cache.stats["requests"] += 1
+        self.cache.stats["bytesRead"] += bytes_read
+        if matched:
+            self.cache.record(url, response, None, bytes_read, matched)
+            return matched, bytes_read
+        digest = hasher.hexdigest()
+        entry = self.cache.get(url)
+        if entry and entry.get("bodyHash") == digest:
+            self.cache.stats["hashHits"] += 1
+        self.cache.record(url, response, digest, hashed, None)
+        return None, bytes_read
+
+    @staticmethod
+    def open_session(connector=None, timing_sample_rate=TIMING_SAMPLE_RATE):
+        # 단계별 시간을 재려면 세션을 만들 때 TraceConfig를 붙여야 한다 (측정 비율 0이면 붙이지 않음)
+        return aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}, connector=connector or make_connector(),
+                                     trace_configs=trace_configs(timing_sample_rate))
+
+    @asynccontextmanager
+    async def _session(self, connector=None):
+        if self.session is not None:
+            yield self.session
+        else:
+            async with self.open_session(connector, self.timer.sample_rate) as session:
+                yield session
+
+    async def check_all_sites_from_csv(self, csv_file: str, concurrency=CONCURRENCY_INITIAL, sink=None):
+        await self.check_sites(load_sites(csv_file), concurrency=concurrency, sink=sink)
+
+    async def check_sites(self, agencies, concurrency=CONCURRENCY_INITIAL, sink=None, limiter=None, connector=None):
+        # sink가 주어지면 결과를 self.results에 쌓지 않고 완료되는 즉시 넘긴다
+        self.summary = {"total": 0, "normal": 0, "maintenance": [], "problem": [], "bytesRead": 0}
+        started = time.monotonic()
+        self.timer.reset()
+        self.attempt_stats = self._new_attempt_stats()
+        self.first_request_at = None
+
+        # 캐시와 타임아웃 이력은 서로 독립이라 DB 왕복을 겹쳐서 읽는다
+        loads = []
+        if self.cache and not self.cache.loaded:
+            loads.append(asyncio.to_thread(self.cache.load))
+        if self.deadlines is not None and not self.deadlines.loaded:
+            loads.append(asyncio.to_thread(self.deadlines.load))
+        await asyncio.gather(*loads)
+
+        limiter = limiter or AdaptiveLimiter(initial=concurrency)
+        async with self._session(connector) as session:
             tasks = [
-                self.check_site_status(session, semaphore, a["agencyId"], a["url"])
+                self.check_site_status(session, limiter, a["agencyId"], a["url"])
                 for a in agencies
             ]
             for coro in asyncio.as_completed(tasks):
                 result = await coro
                 if result:
-                    self.results.append(result)
+                    self._record(result)
+                    if sink is not None:
+                        await sink.put(result)
+                    else:
+                        self.results.append(result)
+
+        if self.cache:
+            await asyncio.to_thread(self.cache.flush)
+
+        self.run_stats = {
+            "sites": self.summary["total"],
+            "durationMs": int((time.monotonic() - started) * 1000),
+            "probeMode": self.probe_mode,
+            "bytesRead": self.summary["bytesRead"],
+            "concurrency": limiter.report(),
+        }
+        if self.cache:
+            self.run_stats["cache"] = self.cache.report()
+        if self.timer.sample_rate > 0:
+            self.run_stats["timing"] = self.timer.report()
+        self.run_stats["attempts"] = {**self.attempt_stats, "decidedBy": dict(self.attempt_stats["decidedBy"])}
+        if self.deadlines is not None:
+            self.run_stats["deadlines"] = self.deadlines.report()
+        self.print_summary()
+
+    async def recheck(self, agencies, sink=None):
+        """같은 실행 안에서 일부 기관만 다시 검사. 요약은 그대로 두고 결과(retry=True)만 넘긴다"""
+        if not agencies:
+            return []
+        limiter = AdaptiveLimiter(initial=min(len(agencies), CONCURRENCY_INITIAL), adaptive=False)
+        async with self._session() as session:
+            results = await asyncio.gather(*(
+                self.check_site_status(session, limiter, a["agencyId"], a["url"]) for a in agencies
+            ))
+        if self.cache:
+            await asyncio.to_thread(self.cache.flush)
+
+        for result in results:
+            result["retry"] = True
+            if sink is not None:
+                await sink.put(result)
+            else:
+                self.results.append(result)
+        self.run_stats["rechecked"] = self.run_stats.get("rechecked", 0) + len(results)
+        if self.timer.sample_rate > 0:
+            self.run_stats["timing"] = self.timer.report()  # 재검사까지 포함해 다시 집계
+        self.run_stats["attempts"] = {**self.attempt_stats, "decidedBy": dict(self.attempt_stats["decidedBy"])}
+        return results
+
+    def _record(self, result):
+        self.summary["total"] += 1
+        self.summary["bytesRead"] += result.get("bytesRead", 0)
+        if result["status"] == "normal":
+            self.summary["normal"] += 1
+        else:
+            self.summary[result["status"]].append({"url": result["url"], "responseTime": result["responseTime"]})
 
+    def print_summary(self):
         # 결과 요약 출력
         print("\n📊 검사 결과 요약")
 
-        total = len(self.results)
-        maintenance_sites = [r for r in self.results if r["status"] == "maintenance"]
-        problem_sites = [r for r in self.results if r["status"] == "problem"]
-        normal_sites = [r for r in self.results if r["status"] == "normal"]
+        total = self.summary["total"]
+        maintenance_sites = self.summary["maintenance"]
+        problem_sites = self.summary["problem"]
+        normal_count = self.summary["normal"]
 
         def percent(count: int) -> str:
             return f"{(count/total*100):.1f}%" if total > 0 else "0%"
 
         print(f"총 검사 사이트 수: {total}")
+        if self.run_stats:
+            conc = self.run_stats["concurrency"]
+            print(f"⏱️ 소요 시간: {self.run_stats['durationMs']/1000:.1f}s "
+                  f"(동시성 한도 {conc['minLimit']}~{conc['maxLimit']}, 최종 {conc['finalLimit']}, 호스트당 {conc['perHost']})")
+            print(f"📦 수신 본문: {self.run_stats['bytesRead']/1024/1024:.1f}MB ({self.run_stats['probeMode']})")
+        if self.run_stats.get("cache"):
+            cache = self.run_stats["cache"]
+            print(f"🗂️ 응답 캐시: 적중률 {cache['hitRate']*100:.1f}% (304 {cache['notModified']}건, 해시 일치 {cache['hashHits']}건), "
+                  f"절약 {cache['bytesSaved']/1024/1024:.1f}MB")
+        if self.run_stats.get("timing", {}).get("phases"):
+            timing = self.run_stats["timing"]
+            phases = ", ".join(f"{p} {v['mean']:.0f}ms({v['share']*100:.0f}%)" for p, v in timing["phases"].items())
+            print(f"🔬 단계별 평균 ({timing['sampled']}건 측정): {phases}")
+        attempts = self.run_stats.get("attempts") or {}
+        if attempts.get("hedged") or attempts.get("resetRetries"):
+            print(f"🔁 헤지 요청 {attempts['hedged']}건 (먼저 응답 {attempts['hedgeWins']}건), "
+                  f"리셋 재시도 {attempts['resetRetries']}건 (회복 {attempts['resetRecovered']}건)")
 
-        print(f"✅ Normal 상태: {len(normal_sites)}곳 ({percent(len(normal_sites))})")
+        print(f"✅ Normal 상태: {normal_count}곳 ({percent(normal_count)})")
         print(f"⚠️ Maintenance 상태: {len(maintenance_sites)}곳 ({percent(len(maintenance_sites))})")
         for site in maintenance_sites:
             print(f"   - {site['url']} (응답시간: {site['responseTime']}ms)")
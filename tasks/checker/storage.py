@@ -1,30 +1,167 @@
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timezone, timedelta
+from pymongo import UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from checker.stats import StatsBuilder
+from checker.snapshots import RunSnapshots
+from checker.events import StatusEvents
+from config import STORAGE_BATCH_SIZE, ROLLUP_UTC_OFFSET, RUN_SNAPSHOTS, STATUS_EVENTS
 
 class Storage:
-    def __init__(self, db):
+    def __init__(self, db, batch_size=STORAGE_BATCH_SIZE, bulk=True):
         self.db = db
+        self.batch_size = batch_size
+        self.bulk = bulk
+        self.batch_reports = []
+        self.snapshots = RunSnapshots(db) if RUN_SNAPSHOTS else None
+        self.events = StatusEvents(db) if STATUS_EVENTS else None
 
-    def save_hourly_and_overall(self, results):
+    @staticmethod
+    def hourly_update(r, bucket_time):
+        keys = {"agencyId": r["agencyId"], "timestampHour": bucket_time}
+        return keys, StatsBuilder.rollup_update(StatsBuilder.rollup([r]), keys)
+
+    @staticmethod
+    def rollup_day(bucket_time):
+        return (bucket_time + timedelta(hours=ROLLUP_UTC_OFFSET)).strftime("%Y-%m-%d")
+
+    def write_updates(self, collection, updates, replace=False):
+        # updates: (filter, update) 목록
+        if not self.bulk:
+            for flt, doc in updates:
+                self._write_one(collection, flt, doc, replace)
+            return []
+
+        # unordered bulk_write로 batch_size 단위 전송, 실패한 연산만 개별 재시도
+        op_cls = ReplaceOne if replace else UpdateOne
+        reports = []
+        for start in range(0, len(updates), self.batch_size):
+            batch = updates[start:start + self.batch_size]
+            report = {"collection": collection, "ops": len(batch), "errors": [], "retried": 0, "failed": 0}
+            t0 = time.perf_counter()
+            try:
+                self.db[collection].bulk_write([op_cls(flt, doc, upsert=True) for flt, doc in batch], ordered=False)
+            except BulkWriteError as e:
+                for err in e.details.get("writeErrors", []):
+                    report["errors"].append({"index": start + err["index"], "code": err.get("code"), "errmsg": err.get("errmsg")})
+                    report["retried"] += 1
+                    flt, doc = batch[err["index"]]
+                    if not self._write_one(collection, flt, doc, replace):
+                        report["failed"] += 1
+            report["elapsedMs"] = round((time.perf_counter() - t0) * 1000, 1)
+            reports.append(report)
+        self.batch_reports += reports
+        return reports
+
+    def _write_one(self, collection, flt, doc, replace=False):
+        try:
+            if replace:
+                self.db[collection].replace_one(flt, doc, upsert=True)
+            else:
+                self.db[collection].update_one(flt, doc, upsert=True)
+            return True
+        except PyMongoError as e:
+            print(f"❌ 개별 쓰기 실패 ({collection}): {e}")
+            return False
+
+    def save_hourly(self, results, bucket_time):
+        self.write_updates("hourly_stats", [self.hourly_update(r, bucket_time) for r in results])
+        self.save_rollups(results, bucket_time)
+
+    def save_rollups(self, results, bucket_time):
+        # 대시보드 이력 조회용 사전 집계: 시간별 전체, 기관별 일별, 전체 일별
+        if not results:
+            return
+        day = self.rollup_day(bucket_time)
+        by_agency = {}
+        for r in results:
+            by_agency.setdefault(r["agencyId"], []).append(r)
+
+        self.write_updates("agency_daily", [
+            ({"agencyId": aid, "date": day},
+             StatsBuilder.rollup_update(StatsBuilder.rollup(rs), {"agencyId": aid, "date": day}))
+            for aid, rs in by_agency.items()
+        ])
+        overall = StatsBuilder.rollup(results)
+        self.write_updates("overall_hourly", [
+            ({"timestampHour": bucket_time}, StatsBuilder.rollup_update(overall, {"timestampHour": bucket_time}))
+        ])
+        self.write_updates("global_daily", [
+            ({"date": day}, StatsBuilder.rollup_update(overall, {"date": day}))
+        ])
+
+    def save_overall(self, agencies_snapshot, overall, now, run_stats=None, run_snapshot=None):
+        """overall_stats(대시보드 현재 상태) 교체 + run_snapshots에 이번 실행 기록.
+        run_snapshot: 이번 실행에서 실제로 검사한 기관만 (기본: agencies_snapshot). agencies_snapshot이 직전 스냅샷과
+        합친 것이면 반드시 따로 넘겨야 검사하지 않은 기관이 run_snapshots에 STATUS_MISSING으로 남는다"""
+        snapshot_doc = {"timestamp": now, "overall": overall, "agencies": agencies_snapshot}
+        if run_stats:
+            snapshot_doc["run"] = run_stats
+        self.write_updates("overall_stats", [({}, snapshot_doc)], replace=True)
+        if self.snapshots is not None:
+            if run_snapshot is None:
+                run_snapshot, run_overall = agencies_snapshot, overall
+            else:
+                run_overall = self.count_overall(run_snapshot)
+            run_doc = self.snapshots.encode(run_snapshot, run_overall, now)
+            self.write_updates("run_snapshots", [({"timestamp": now}, {"$set": run_doc})])
+
+    def save_events(self, observed, now=None):
+        """observed: [(결과, 관측 시각)]. 상태가 바뀐 기관만 status_events/status_index에 기록하고 바뀐 기관 수를 반환"""
+        if self.events is None or not observed:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        states = self.events.load_states(r["agencyId"] for r, _ in observed)
+        event_updates, index_updates = self.events.changes(observed, states)
+        self.write_updates("status_events", event_updates)
+        self.write_updates("status_index", index_updates)
+        if self.events.windows_due(states, now):
+            self.write_updates("status_index", self.events.window_updates(now))
+        return len(index_updates)
+
+    def merge_snapshot(self, agencies_snapshot, known_ids=None):
+        # 이번 실행에서 검사하지 않은 기관은 직전 스냅샷 값을 유지 (known_ids에 없는 기관은 제외)
+        prev = self.db["overall_stats"].find_one({}) or {}
+        merged = {a["agencyId"]: a for a in prev.get("agencies", []) if known_ids is None or a["agencyId"] in known_ids}
+        merged.update({a["agencyId"]: a for a in agencies_snapshot})
+        return list(merged.values())
+
+    @staticmethod
+    def count_overall(agencies_snapshot):
+        overall = {"total": 0, "normal": 0, "maintenance": 0, "problem": 0}
+        for a in agencies_snapshot:
+            overall[a["status"]] += 1
+            overall["total"] += 1
+        return overall
+
+    @staticmethod
+    def snapshot_entry(r):
+        entry = {"agencyId": r["agencyId"], "status": r["status"], "responseTime": r.get("responseTime")}
+        if r.get("timing"):
+            entry["timing"] = r["timing"]  # 단계별 시간 (측정한 프로브만)
+        return entry
+
+    def save_hourly_and_overall(self, results, run_stats=None):
         now = datetime.now(timezone.utc)
         bucket_time = now.replace(minute=0, second=0, microsecond=0)
+        self.batch_reports = []
 
         # 1. hourly_stats
-        for r in results:
-            inc = {"stats.total": 1, "stats.normal": 0, "stats.maintenance": 0, "stats.problem": 0}
-            inc[f"stats.{r['status']}"] = 1
+        self.save_hourly(results, bucket_time)
 
-            self.db["hourly_stats"].update_one(
-                {"agencyId": r["agencyId"], "timestampHour": bucket_time},
-                {"$setOnInsert": {"agencyId": r["agencyId"], "timestampHour": bucket_time}, "$inc": inc},
-                upsert=True
-            )
+        # 2. 상태 변화 이벤트
+        self.save_events([(r, now) for r in results], now)
 
-        # 2. overall_stats
+        # 3. overall_stats
         stats = StatsBuilder.build(results)
-        agencies_snapshot = [{"agencyId": r["agencyId"], "status": r["status"], "responseTime": r.get("responseTime")} for r in results]
-
-        snapshot_doc = {"timestamp": now, "overall": stats["overall"], "agencies": agencies_snapshot}
-        self.db["overall_stats"].replace_one({}, snapshot_doc, upsert=True)
+        self.save_overall([self.snapshot_entry(r) for r in results], stats["overall"], now, run_stats)
 
+        self.print_batch_summary()
         print(f"✅ MongoDB 저장 완료 (hourly={bucket_time}, snapshot={now})")
+
+    def print_batch_summary(self):
+        for i, rep in enumerate(self.batch_reports, 1):
+            line = f"   - batch {i} [{rep['collection']}] ops={rep['ops']} {rep['elapsedMs']}ms"
+            if rep["errors"]:
+                line += f" errors={len(rep['errors'])} retried={rep['retried']} failed={rep['failed']}"
+            print(line)
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from datetime import timedelta
+from pymongo import UpdateOne
+from config import (
+    RUN_INTERVAL, TIER_STABLE_INTERVAL, TIER_STABLE_HOURS, TIER_RECENT_HOURS, FAST_RETRY_DELAYS,
+)
+
+
+def interval_for(history, last_status=None):
+    """최근 hourly_stats 요약과 마지막 상태로 검사 주기(분)를 정한다. 0이면 매 실행 + 빠른 재검사
+
+    history: {"hours": 데이터가 있는 시간 수, "nonNormal": 문제/점검 횟수,
+              "recentNonNormal": 최근 TIER_RECENT_HOURS 내 문제/점검 횟수}
+    """
+    if last_status in ("problem", "maintenance"):
+        return 0
+    if history.get("recentNonNormal", 0) > 0:
+        return RUN_INTERVAL
+    if history.get("hours", 0) >= TIER_STABLE_HOURS and history.get("nonNormal", 0) == 0:
+        return TIER_STABLE_INTERVAL
+    return RUN_INTERVAL
+
+
+def weight_for(interval_min):
+    """hourly_stats에 더할 가중치: 직전 검사 주기 동안의 실행 수 (매 실행 검사하는 기관 = 1)
+
+    안정 기관은 TIER_STABLE_INTERVAL마다 한 번만 검사하므로 가중치 없이 세면 자주 검사하는
+    문제/불안정 기관이 시간별 집계에서 실제보다 큰 비중을 차지한다
+    """
+    if not interval_min:
+        return 1
+    return max(1, round(interval_min / RUN_INTERVAL))
+
+
+class ProbeScheduler:
+    """기관별 검사 주기를 probe_schedule 컬렉션에 저장하고, 이번 실행에서 검사할 기관만 고른다"""
+
+    def __init__(self, db, collection="probe_schedule", retry_delays=FAST_RETRY_DELAYS):
+        self.db = db
+        self.collection = collection
+        self.retry_delays = retry_delays
+        self.schedule = {}
+        self.history = {}
+        self.observed = {}
+        self.observed_at = {}  # agencyId -> 마지막 결과를 받은 시각 (time.monotonic, 빠른 재검사 지연 기준)
+        self.weights = {}  # agencyId -> hourly_stats 가중치 (이번 검사가 대표하는 실행 수)
+
+    def load(self, now):
+        self.schedule = {doc["agencyId"]: doc for doc in self.db[self.collection].find({}, {"_id": 0})}
+
+        # 최근 TIER_STABLE_HOURS 동안의 hourly_stats를 기관별로 한 번에 요약
+        since = now - timedelta(hours=TIER_STABLE_HOURS)
+        recent_since = now - timedelta(hours=TIER_RECENT_HOURS)
+        non_normal = {"$add": ["$stats.maintenance", "$stats.problem"]}
+        pipeline = [
+            {"$match": {"timestampHour": {"$gte": since}}},
+            {"$group": {
+                "_id": "$agencyId",
+                "hours": {"$sum": 1},
+                "nonNormal": {"$sum": non_normal},
+                "recentNonNormal": {"$sum": {"$cond": [{"$gte": ["$timestampHour", recent_since]}, non_normal, 0]}},
+            }},
+        ]
+        self.history = {doc["_id"]: doc for doc in self.db["hourly_stats"].aggregate(pipeline)}
+        return self
+
+    def due(self, agencies, now):
+        # cron 실행 시각이 조금씩 흔들리므로 1분 여유를 둔다
+        horizon = now + timedelta(minutes=1)
+        due = []
+        for a in agencies:
+            entry = self.schedule.get(a["agencyId"])
+            next_due = entry.get("nextDue") if entry else None
+            if next_due is not None and next_due.tzinfo is None:
+                next_due = next_due.replace(tzinfo=now.tzinfo)
+            if next_due is None or next_due <= horizon:
+                due.append(a)
+                self.weights[a["agencyId"]] = weight_for(entry.get("intervalMin") if entry else None)
+        return due
+
+    def tap(self, sink):
+        """sink로 가는 결과를 가로채 기관별 마지막 상태를 기록"""
+        return _SchedulerTap(self, sink)
+
+    def observe(self, result):
+        self.observed[result["agencyId"]] = result
+        self.observed_at[result["agencyId"]] = time.monotonic()
+
+    async def fast_retry(self, checker, agencies, sink=None):
+        # problem 판정 기관만 지연 후 다시 검사. 회복되면 다음 재시도 대상에서 빠진다
+        # 재검사 결과(retry=True)는 스냅샷/상태 이벤트에만 반영되고 hourly_stats에는 더해지지 않는다 (ResultWriter)
+        by_id = {a["agencyId"]: a for a in agencies}
+        for delay in self.retry_delays:
+            targets = [by_id[aid] for aid, r in self.observed.items() if r["status"] == "problem" and aid in by_id]
+            if not targets:
+                break
+            # 지연은 problem 판정을 받은 시점부터 센다 (검사 단계가 길었으면 그만큼 덜 기다림)
+            last_seen = max(self.observed_at.get(a["agencyId"], 0.0) for a in targets)
+            await asyncio.sleep(max(0.0, last_seen + delay - time.monotonic()))
+            results = await checker.recheck(targets, sink=self.tap(sink) if sink is not None else None)
+            if sink is None:
+                for r in results:
+                    self.observe(r)
+
+    def save(self, now):
+        ops = []
+        for aid, result in self.observed.items():
+            interval = interval_for(self.history.get(aid, {}), result["status"])
+            ops.append(UpdateOne({"agencyId": aid}, {"$set": {
+                "agencyId": aid,
+                "intervalMin": interval,
+                "nextDue": now + timedelta(minutes=interval),
+                "lastStatus": result["status"],
+                "lastCheckedAt": now,
+            }}, upsert=True))
+        if ops:
+            self.db[self.collection].bulk_write(ops, ordered=False)
+        return len(ops)
+
+    def report(self, total):
+        intervals = {}
+        for aid in self.observed:
+            interval = interval_for(self.history.get(aid, {}), self.observed[aid]["status"])
+            intervals[str(interval)] = intervals.get(str(interval), 0) + 1
+        return {"agencies": total, "probed": len(self.observed), "skipped": total - len(self.observed), "intervals": intervals}
+
+
+class _SchedulerTap:
+    def __init__(self, scheduler, sink):
+        self.scheduler = scheduler
+        self.sink = sink
+
+    async def put(self, result):
+        self.scheduler.observe(result)
+        weight = self.scheduler.weights.get(result["agencyId"], 1)
+        if weight != 1 and not result.get("retry"):
+            result["weight"] = weight
+        if self.sink is not None:
+            await self.sink.put(result)
@@ -0,0 +1,162 @@
+import random
+import time
+import numpy as np
+import aiohttp
+from config import TIMING_SAMPLE_RATE, LATENCY_PERCENTILES
+from checker.stats import PHASES
+
+
+def _now():
+    return time.perf_counter()
+
+
+def _hook(fn):
+    # 측정 대상이 아닌 요청(trace_request_ctx=None)은 바로 반환
+    async def hook(session, trace_config_ctx, params):
+        t = trace_config_ctx.trace_request_ctx
+        if t is not None:
+            fn(t, _now())
+    return hook
+
+
+def _queue_start(t, now):
+    t["phase"], t["queue0"] = "queue", now
+
+
+def _queue_end(t, now):
+    t["queue"] += now - t.pop("queue0", now)
+
+
+def _dns_start(t, now):
+    t["phase"], t["dns0"] = "dns", now
+
+
+def _dns_end(t, now):
+    t["dns"] += now - t.pop("dns0", now)
+
+
+def _connect_start(t, now):
+    # 연결 생성 구간 안에 DNS 조회가 포함되므로 시작 시점의 DNS 누적값을 기억했다가 뺀다
+    t["phase"], t["connect0"], t["dnsAtConnect"] = "connect", now, t["dns"]
+
+
+def _connect_end(t, now):
+    t["connect"] += now - t.pop("connect0", now) - (t["dns"] - t.pop("dnsAtConnect", t["dns"]))
+
+
+def _reused(t, now):
+    t["reused"] = True
+
+
+def _headers_sent(t, now):
+    t["phase"], t["sent"] = "ttfb", now
+
+
+def _response_headers(t, now):
+    t["ttfb"] += now - t.pop("sent", now)
+    t["phase"], t["headers"] = "body", now
+
+
+def _redirect(t, now):
+    _response_headers(t, now)
+    t["redirects"] += 1
+
+
+def _request_start(t, now):
+    t["traced"] = True
+
+
+def _new_ctx():
+    return {"phase": "queue", "queue": 0.0, "dns": 0.0, "connect": 0.0, "ttfb": 0.0,
+            "redirects": 0, "reused": False, "traced": False}
+
+
+def make_trace_config():
+    """세션에 붙이는 TraceConfig. 요청별 상태는 trace_request_ctx로 넘긴 dict(PhaseTimer.start)에 쌓는다"""
+    tc = aiohttp.TraceConfig()
+    tc.on_request_start.append(_hook(_request_start))
+    tc.on_connection_queued_start.append(_hook(_queue_start))
+    tc.on_connection_queued_end.append(_hook(_queue_end))
+    tc.on_dns_resolvehost_start.append(_hook(_dns_start))
+    tc.on_dns_resolvehost_end.append(_hook(_dns_end))
+    tc.on_connection_create_start.append(_hook(_connect_start))
+    tc.on_connection_create_end.append(_hook(_connect_end))
+    tc.on_connection_reuseconn.append(_hook(_reused))
+    tc.on_request_headers_sent.append(_hook(_headers_sent))
+    tc.on_request_redirect.append(_hook(_redirect))
+    tc.on_request_end.append(_hook(_response_headers))
+    return tc
+
+
+def trace_configs(sample_rate=TIMING_SAMPLE_RATE):
+    return [make_trace_config()] if sample_rate > 0 else None
+
+
+class PhaseTimer:
+    """프로브별 단계 시간 측정 + 실행 단위 집계. sample_rate 비율의 프로브만 측정한다 (0이면 측정 안 함)"""
+
+    def __init__(self, sample_rate=TIMING_SAMPLE_RATE, seed=None):
+        self.sample_rate = sample_rate
+        self.rnd = random.Random(seed)
+        self.samples = []
+        self.failed = {}
+
+    def reset(self):
+        self.samples = []
+        self.failed = {}
+
+    def start(self):
+        """프로브 1건 시작 (측정 여부는 프로브마다 한 번만 정한다). 측정 대상이면 dict, 아니면 None.
+        요청마다 restart()로 새 dict를 받아 session.get(trace_request_ctx=...)로 넘긴다"""
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and self.rnd.random() >= self.sample_rate):
+            return None
+        return _new_ctx()
+
+    @staticmethod
+    def restart(t):
+        """같은 프로브의 요청(헤지, 재시도, insecure SSL)은 측정 여부를 유지한 채 요청마다 처음부터 다시 잰다
+        (헤지는 기본 요청과 동시에 돌므로 dict를 같이 쓰지 않는다)"""
+        return None if t is None else _new_ctx()
+
+    def finish(self, t, failed=False):
+        """결과 문서에 붙일 단계별 시간(ms). 세션에 TraceConfig가 없어 아무 훅도 안 불렸으면 None.
+        실행 집계에는 넣지 않는다 (프로브의 최종 판정에 쓴 요청만 record()로 넣는다)"""
+        if t is None or not t["traced"]:
+            return None
+        body = _now() - t["headers"] if "headers" in t and not failed else 0.0
+        timing = {f"{p}Ms": round(t[p] * 1000, 1) for p in PHASES if p != "body"}
+        timing["bodyMs"] = round(body * 1000, 1)
+        timing["reused"] = t["reused"]
+        if t["redirects"]:
+            timing["redirects"] = t["redirects"]
+        if failed:
+            timing["failedPhase"] = t["phase"]
+        return timing
+
+    def record(self, timing):
+        """프로브 1건의 단계별 시간(finish 결과)을 실행 집계에 추가"""
+        if timing is None:
+            return
+        if "failedPhase" in timing:
+            self.failed[timing["failedPhase"]] = self.failed.get(timing["failedPhase"], 0) + 1
+        else:
+            self.samples.append((*(timing[f"{p}Ms"] for p in PHASES), timing["reused"]))
+
+    def report(self, percentiles=LATENCY_PERCENTILES):
+        """실행 단위 집계: 단계별 평균/분위수와 전체 시간 중 비중, 실패한 단계별 건수"""
+        report = {"sampleRate": self.sample_rate, "sampled": len(self.samples) + sum(self.failed.values()),
+                  "failedPhases": dict(self.failed)}
+        if not self.samples:
+            return report
+        data = np.array([s[:-1] for s in self.samples], dtype=np.float64)
+        report["reusedConnections"] = int(sum(1 for s in self.samples if s[-1]))
+        means = data.mean(axis=0)
+        qs = np.percentile(data, percentiles, axis=0)
+        total = means.sum()
+        report["phases"] = {
+            p: {"mean": round(float(means[i]), 1),
+                **{f"p{q}": round(float(qs[k, i]), 1) for k, q in enumerate(percentiles)},
+                "share": round(float(means[i] / total), 3) if total else 0.0}
+            for i, p in enumerate(PHASES)
+        }
+        return report
@@ -5,3 +5,94 @@ MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "YOUR_DATABASE")
 
 TIMEOUT_THRESHOLD = 30000  # 30초
 USER_AGENT = "GovStatusBot/1.0"
+
+STORAGE_BATCH_SIZE = 500  # hourly_stats bulk_write 1회당 최대 연산 수
+
+# 검사-저장 스트리밍 파이프라인
+WRITER_QUEUE_SIZE = 200       # 결과 큐 최대 길이 (가득 차면 검사 측이 대기)
+WRITER_BATCH_SIZE = 100       # 한 번에 flush할 결과 수
+WRITER_FLUSH_INTERVAL = 2.0   # 결과가 모자라도 flush하는 주기 (초)
+
+# 동시성 (AIMD 적응형 전역 한도 + 호스트/IP별 상한)
+CONCURRENCY_INITIAL = 30
+CONCURRENCY_MIN = 10
+CONCURRENCY_MAX = 120
+CONCURRENCY_PER_HOST = 4          # 같은 호스트(IP)로 동시에 보내는 최대 요청 수
+CONCURRENCY_TARGET_LATENCY = 5000  # 이 지연(ms)을 넘기면 혼잡으로 판단
+CONCURRENCY_WINDOW = 20            # AIMD 판단에 쓰는 최근 완료 요청 수
+DNS_CACHE_TTL = 300                # TCPConnector DNS 캐시 (초)
+KEEPALIVE_TIMEOUT = 30             # keep-alive 유지 시간 (초)
+
+# 본문 프로브: partial은 청크 단위로 읽다가 키워드를 찾거나 최대 바이트에 도달하면 중단, full은 전체 본문 read()
+PROBE_MODE = "partial"
+PROBE_MAX_BYTES = 128 * 1024
+PROBE_CHUNK_SIZE = 16 * 1024
+
+RESPONSE_CACHE = True  # ETag/Last-Modified 조건부 요청 + 본문 해시 캐시 사용 여부
+
+# 계층형 검사 주기: 오래 정상인 기관은 드물게, 문제/점검 기관은 매 실행마다 + 빠른 재검사
+RUN_INTERVAL = 5            # cron 실행 주기 (분)
+TIER_STABLE_INTERVAL = 15   # 안정적으로 정상인 기관의 검사 주기 (분)
+TIER_STABLE_HOURS = 24      # 이 시간 동안 모두 정상이면 안정 기관으로 분류
+TIER_RECENT_HOURS = 3       # 최근 이 시간 내 문제/점검 이력이 있으면 매 실행 검사
+FAST_RETRY_DELAYS = (10,)   # problem 판정 기관을 같은 실행 안에서 다시 검사하는 지연 (초, 판정 시점부터)
+PROBE_TIERS = True          # False면 매 실행마다 모든 기관 검사
+
+# 데몬 모드 (python -m tasks)
+DAEMON_INTERVAL = RUN_INTERVAL * 60  # 검사 주기 (초)
+DAEMON_JITTER = 15                   # 매 주기 시작을 0~N초 늦춰 요청이 몰리지 않게 함
+DAEMON_SHUTDOWN_GRACE = 60           # 종료 신호 후 진행 중인 주기를 기다리는 최대 시간 (초)
+
+ROLLUP_UTC_OFFSET = 9  # 일별 롤업의 날짜 경계 (KST = UTC+9)
+
+# 응답시간 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부.
+# 롤업 문서끼리 $inc로 합치므로 한 번 정하면 바꾸지 않는다 (바꾸면 기존 롤업과 합칠 수 없음)
+LATENCY_BUCKETS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 20000, 30000)
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# 원본 데이터 보존 기간 (일). None이면 무기한 보관, 값이 있으면 TTL 인덱스로 자동 삭제
+HOURLY_STATS_RETENTION_DAYS = None
+
+# 실행별 압축 스냅샷 (run_snapshots): 기관 상태/응답시간을 바이너리 배열로 매 실행 보관
+RUN_SNAPSHOTS = True
+RUN_SNAPSHOT_RETENTION_DAYS = 180  # None이면 무기한 보관
+
+# 상태 변화 이벤트 로그 (checker/events.py): 기관 상태가 바뀔 때만 status_events에 구간을 남기고
+# status_index에 기관별 현재 상태/누적 시간을 둔다 (가동률/장애 지속 시간 조회용)
+STATUS_EVENTS = True
+UPTIME_WINDOWS_DAYS = (1, 7, 30)  # 기관별로 미리 계산해 두는 최근 N일 가동률 (worst-N 순위용)
+STATUS_WINDOW_REFRESH_MIN = 60    # 위 구간 집계 재계산 주기 (분)
+
+# 기관 목록 크롤러 (crawler/async_crawler.py)
+CRAWL_MAX_DEPTH = 2                     # 시드 페이지에서 따라갈 최대 링크 깊이
+CRAWL_CONCURRENCY = 16                  # 동시에 받는 페이지 수
+CRAWL_HOST_DELAY = 1.0                  # 같은 호스트 요청 사이 최소 간격 (초, robots.txt Crawl-delay가 더 크면 그 값)
+# 중단 후 이어받기용 frontier 저장 파일 (실행 위치와 무관하게 tasks/ 아래, .gitignore 대상)
+CRAWL_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_frontier.json")
+CRAWL_SAVE_EVERY = 50                   # N 페이지마다 frontier 저장
+CRAWL_PAGE_MAX_AGE_HOURS = 72           # 증분 탐색: 이 시간 안에 확인한 디렉터리 페이지는 요청 없이 재사용 (0이면 매번 조건부 요청)
+DISCOVER_MAX_CHANGES = 30               # 증분 탐색: 추가/이름 변경/삭제가 이보다 많으면 agencies/CSV에 자동 반영하지 않음 (--force로 반영)
+
+# 요청 단계별 시간 측정 (aiohttp TraceConfig: DNS, TCP 연결+TLS, 첫 바이트, 본문 수신)
+TIMING_SAMPLE_RATE = 1.0  # 이 비율의 프로브만 측정 (0이면 TraceConfig를 붙이지 않음, 저부하 모드는 0.1 등)
+
+# 기관별 타임아웃/헤지 요청 (checker/deadlines.py): 최근 agency_daily 응답시간 분포로 사이트마다 다르게 정한다
+ADAPTIVE_TIMEOUTS = True
+DEADLINE_HISTORY_DAYS = 7        # 분포를 계산할 최근 일수
+DEADLINE_MIN_SAMPLES = 20        # 이보다 이력이 적은 기관은 기본값(TIMEOUT_THRESHOLD 하나)
+TIMEOUT_HEADROOM = 3.0           # 첫 바이트 타임아웃 = p99 × 배수
+TIMEOUT_TTFB_MIN = 5000          # 첫 바이트 타임아웃 하한 (ms)
+TIMEOUT_CONNECT_MIN = 3000       # 연결(TCP+TLS) 타임아웃 범위 (ms), 평균 연결 시간 × 배수
+TIMEOUT_CONNECT_MAX = 10000
+HEDGE_MIN_DELAY = 1000           # p95가 이보다 짧아도 이 시간(ms)은 기다린 뒤 헤지 요청
+HEDGE_MAX_RATIO = 0.1            # 한 실행에서 헤지 요청을 보낼 수 있는 최대 비율 (검사 수 대비)
+RESET_RETRIES = 1                # 연결 리셋/끊김은 같은 프로브 안에서 즉시 재시도 (횟수)
+RESET_RETRY_DELAY = 0.2          # 재시도 전 대기 (초)
+
+# 분산 검사 (tasks/worker.py): 여러 워커 프로세스/노드가 scan_leases의 임대 문서로 기관 목록 조각을 나눠 맡는다
+SHARD_SIZE = 50              # 조각 하나의 기관 수
+SHARD_LEASE_TTL = 60         # 임대 유효 시간 (초). 워커가 죽으면 이 시간 뒤에 다른 워커가 가져감
+SHARD_HEARTBEAT = 15         # 임대 연장 주기 (초)
+SHARD_PARALLEL = 2           # 워커 하나가 동시에 검사하는 조각 수
+SHARD_POLL = 2.0             # 남은 조각이 없을 때 다른 워커를 기다리며 다시 확인하는 주기 (초)
+SHARD_LEASE_RETENTION_HOURS = 24  # 임대 문서 보존 시간 (TTL 인덱스)
@@ -0,0 +1,334 @@
+"""
+비동기 정부기관 URL 크롤러
+==========================
+
+GovCrawler의 도메인/유효성 필터를 그대로 쓰면서 수집 엔진만 aiohttp로 바꾼 버전
+- 정규화된 URL 기준 중복 제거 frontier, 최대 링크 깊이 지정
+- 전역 sleep 대신 호스트별 요청 간격 (robots.txt Crawl-delay 반영)
+- 호스트별 robots.txt 캐시
+- frontier를 파일로 저장해 중단 후 이어받기
+
+사용법 (tasks 디렉터리에서):
+    python -m crawler.async_crawler --depth 2 --output gov_sites.csv
+"""
+
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+from config import (
+    CRAWL_MAX_DEPTH, CRAWL_CONCURRENCY, CRAWL_HOST_DELAY, CRAWL_STATE_FILE, CRAWL_SAVE_EVERY,
+    CONCURRENCY_PER_HOST,
+)
+from checker.cache import body_hash
+from checker.concurrency import make_connector
+from checker.sites import normalize_url
+from crawler.gov_crawler import GovCrawler
+
+# 따라가지 않을 파일 확장자 (HTML이 아닌 리소스)
+SKIP_EXTENSIONS = (".pdf", ".xlsx", ".xls", ".doc", ".docx", ".hwp", ".zip", ".jpg", ".jpeg", ".png", ".gif")
+
+
+class HostThrottle:
+    """같은 호스트로 가는 요청 사이에 최소 간격을 둔다 (다른 호스트 요청은 서로 기다리지 않음)"""
+
+    def __init__(self, delay=CRAWL_HOST_DELAY):
+        self.delay = delay
+        self._next_at = {}
+        self._locks = {}
+
+    async def wait(self, host, delay=None):
+        delay = self.delay if delay is None else delay
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            at = self._next_at.get(host, 0.0)
+            if at > now:
+                await asyncio.sleep(at - now)
+                now = at
+            self._next_at[host] = now + delay
+
+
+class RobotsCache:
+    """호스트(origin)별 robots.txt를 한 번만 받아 RobotFileParser로 보관"""
+
+    def __init__(self, session, throttle, timeout=10):
+        self.session = session
+        self.throttle = throttle
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._parsers = {}  # origin -> Task[RobotFileParser] (동시에 요청돼도 한 번만 받음)
+        self.fetched = 0
+
+    async def get(self, url):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in self._parsers:
+            self._parsers[origin] = asyncio.ensure_future(self._fetch(origin, parts.netloc))
+        return await self._parsers[origin]
+
+    async def _fetch(self, origin, host):
+        parser = RobotFileParser(origin + "/robots.txt")
+        try:
+            await self.throttle.wait(host)
+            async with self.session.get(parser.url, timeout=self.timeout) as response:
+                self.fetched += 1
+                # urllib.robotparser.read()와 같은 규칙: 401/403은 전체 차단, 그 외 4xx/5xx는 전체 허용
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                elif response.status >= 400:
+                    parser.allow_all = True
+                else:
+                    parser.parse((await response.text(errors="replace")).splitlines())
+        except Exception:
+            parser.allow_all = True
+        parser.modified()
+        return parser
+
+
+class AsyncGovCrawler(GovCrawler):
+    def __init__(self, seeds=None, max_depth=CRAWL_MAX_DEPTH, concurrency=CRAWL_CONCURRENCY,
+                 host_delay=CRAWL_HOST_DELAY, state_file=CRAWL_STATE_FILE, follow_hosts=None,
+                 respect_robots=True, max_pages=None, timeout=15, page_cache=None):
+        super().__init__()
+        self.seeds = list(seeds or self.target_urls)
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.state_file = state_file
+        # 링크를 따라갈 호스트 (기본: 시드 페이지의 호스트만). 기관 사이트 자체는 수집만 하고 들어가지 않는다
+        self.follow_hosts = set(follow_hosts or (urlsplit(normalize_url(u)).netloc for u in self.seeds))
+        self.respect_robots = respect_robots
+        self.max_pages = max_pages
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.user_agent = self.session.headers["User-Agent"]
+
+        self.throttle = HostThrottle(host_delay)
+        self.page_cache = page_cache  # crawler.page_cache.PageCache (증분 탐색 시)
+        self.robots = None
+        self.seen = set()   # 한 번이라도 frontier에 들어간 정규화 URL
+        self.queued = {}    # 아직 처리가 끝나지 않은 URL -> 깊이 (처리 중 포함, 이어받기 시 다시 방문)
+        self.queue = None
+        self._stop = None
+        self._pages_before = 0
+        self.stats = {"pages": 0, "failed": 0, "skipped": 0, "robotsBlocked": 0, "bytes": 0, "durationMs": 0}
+
+    # --- frontier ---
+    def enqueue(self, url, depth):
+        key = normalize_url(url)
+        if key is None or key in self.seen:
+            return False
+        self.seen.add(key)
+        self.queued[key] = depth
+        if self.queue is not None:
+            self.queue.put_nowait((key, depth))
+        return True
+
+    def should_follow(self, url):
+        parts = urlsplit(url)
+        return parts.netloc.lower() in self.follow_hosts and not parts.path.lower().endswith(SKIP_EXTENSIONS)
+
+    def save_state(self):
+        """남은 frontier, 방문 집합, 수집 결과를 원자적으로 저장"""
+        if not self.state_file:
+            return
+        state = {
+            "seeds": self.seeds,
+            "maxDepth": self.max_depth,
+            "queued": [[url, depth] for url, depth in self.queued.items()],
+            "seen": sorted(self.seen),
+            "orgs": self.org_data,
+            "stats": self.stats,
+        }
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_file)
+
+    def load_state(self) -> bool:
+        """저장된 frontier가 있으면 이어받는다. 이어받았으면 True"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return False
+        with open(self.state_file, encoding="utf-8") as f:
+            state = json.load(f)
+        self.seen = set(state["seen"])
+        self.queued = {url: depth for url, depth in state["queued"]}
+        self.org_data, self.org_keys = [], set()
+        for org_name, url in state["orgs"]:
+            self._append_org(org_name, url)
+        self.stats.update(state.get("stats", {}))
+        print(f"🔁 frontier 이어받기: 남은 {len(self.queued)}페이지, 방문 {len(self.seen)}, 수집 {len(self.org_data)}")
+        return True
+
+    # --- 크롤링 ---
+    async def crawl(self):
+        if not self.queued and not self.seen:
+            for url in self.seeds:
+                self.enqueue(url, 0)
+
+        self.queue = asyncio.Queue()
+        for url, depth in self.queued.items():
+            self.queue.put_nowait((url, depth))
+        self._stop = asyncio.Event()
+
+        started = time.perf_counter()
+        pages_before = self._pages_before = self.stats["pages"]
+        connector = make_connector(limit=self.concurrency, limit_per_host=CONCURRENCY_PER_HOST)
+        async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": self.user_agent}) as session:
+            if self.respect_robots:
+                self.robots = RobotsCache(session, self.throttle)
+            workers = [asyncio.create_task(self._worker(session)) for _ in range(self.concurrency)]
+            drained = asyncio.create_task(self.queue.join())
+            stopped = asyncio.create_task(self._stop.wait())
+            try:
+                await asyncio.wait({drained, stopped}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                # 처리 중이던 페이지는 queued에 남아 다음 실행에서 다시 방문
+                for task in (*workers, drained, stopped):
+                    task.cancel()
+                await asyncio.gather(*workers, drained, stopped, return_exceptions=True)
+                self.queue = None
+
+        elapsed = time.perf_counter() - started
+        self.stats["durationMs"] += round(elapsed * 1000)
+        pages = self.stats["pages"] - pages_before
+        self.stats["pagesPerSec"] = round(pages / elapsed, 1) if elapsed else None
+
+        if self.queued:
+            self.save_state()
+            print(f"⏸️ 크롤링 중단: 남은 {len(self.queued)}페이지를 {self.state_file}에 저장")
+        elif self.state_file and os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        print(f"✅ 크롤링 완료: {pages}페이지 ({self.stats['pagesPerSec']}/s), 실패 {self.stats['failed']}, "
+              f"robots 차단 {self.stats['robotsBlocked']}, 수집 기관 {len(self.org_data)}")
+        return self.stats
+
+    async def _worker(self, session):
+        while True:
+            url, depth = await self.queue.get()
+            try:
+                await self._visit(session, url, depth)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"페이지 요청 실패 ({url}): {e}")
+            self.queued.pop(url, None)
+            self.queue.task_done()
+
+            if self.max_pages and self.stats["pages"] - self._pages_before >= self.max_pages:
+                self._stop.set()
+            elif self.stats["pages"] and self.stats["pages"] % CRAWL_SAVE_EVERY == 0:
+                self.save_state()
+
+    async def _visit(self, session, url, depth):
+        host = urlsplit(url).netloc
+        cache = self.page_cache
+        entry = cache.get(url) if cache is not None else None
+        if cache is not None:
+            cache.visited.add(url)
+            if cache.is_fresh(entry):
+                cache.stats["fresh"] += 1
+                return self._apply_page(depth, entry["orgs"], entry["links"])
+
+        delay = None
+        if self.robots is not None:
+            robots = await self.robots.get(url)
+            if not robots.can_fetch(self.user_agent, url):
+                self.stats["robotsBlocked"] += 1
+                if cache is not None:
+                    cache.visited.discard(url)
+                return
+            crawl_delay = robots.crawl_delay(self.user_agent)
+            if crawl_delay:
+                delay = max(self.throttle.delay, float(crawl_delay))
+
+        await self.throttle.wait(host, delay)
+        headers = cache.conditional_headers(url) if cache is not None else None
+        try:
+            async with session.get(url, headers=headers, timeout=self.timeout) as response:
+                if response.status == 304 and entry is not None:
+                    cache.stats["notModified"] += 1
+                    cache.touch(url)
+                    return self._apply_page(depth, entry["orgs"], entry["links"])
+                if response.status != 200 or "html" not in response.content_type:
+                    self.stats["skipped"] += 1
+                    if entry is not None:
+                        # 일시적인 오류로 기관이 삭제 대상으로 잡히지 않도록 직전 결과 유지
+                        self._apply_page(depth, entry["orgs"], entry["links"])
+                    return
+                body = await response.read()
+                base_url = str(response.url)  # 리다이렉트 후 최종 URL 기준으로 상대 링크 해석
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if entry is not None:
+                self._apply_page(depth, entry["orgs"], entry["links"])
+            raise
+
+        self.stats["pages"] += 1
+        self.stats["bytes"] += len(body)
+        if cache is not None:
+            digest = body_hash(body)
+            if entry is not None and entry.get("bodyHash") == digest:
+                cache.stats["hashHits"] += 1
+                cache.touch(url, response)
+                return self._apply_page(depth, entry["orgs"], entry["links"])
+
+        orgs, links = [], []
+        for full_url, text in self.extract_links(body, base_url):
+            org = self.org_for(full_url, text)
+            if org is not None:
+                orgs.append(org)
+            elif self.should_follow(full_url):
+                links.append(full_url)
+        if cache is not None:
+            cache.stats["changed"] += 1
+            cache.record(url, response, digest, orgs, links)
+        self._apply_page(depth, orgs, links)
+
+    def _apply_page(self, depth, orgs, links):
+        """페이지에서 찾은 기관을 수집하고 하위 링크를 frontier에 추가"""
+        for org_name, full_url in orgs:
+            if self._append_org(org_name, full_url):
+                print(f"  발견: {org_name} - {full_url}")
+        if depth < self.max_depth:
+            for link in links:
+                self.enqueue(link, depth + 1)
+
+    def crawl_all(self) -> None:
+        """전체 크롤링 실행 (저장된 frontier가 있으면 이어받음)"""
+        if not self.load_state():
+            self.add_known_orgs()
+        asyncio.run(self.crawl())
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="비동기 정부기관 URL 크롤러")
+    parser.add_argument("--seed", action="append", help="시작 페이지 (여러 번 지정 가능, 기본: GovCrawler.target_urls)")
+    parser.add_argument("--depth", type=int, default=CRAWL_MAX_DEPTH)
+    parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY)
+    parser.add_argument("--host-delay", type=float, default=CRAWL_HOST_DELAY)
+    parser.add_argument("--state-file", default=CRAWL_STATE_FILE)
+    parser.add_argument("--max-pages", type=int, default=None, help="N페이지 후 frontier를 저장하고 중단")
+    parser.add_argument("--ignore-robots", action="store_true")
+    parser.add_argument("--output", default="gov_sites.csv")
+    args = parser.parse_args()
+
+    crawler = AsyncGovCrawler(seeds=args.seed, max_depth=args.depth, concurrency=args.concurrency,
+                              host_delay=args.host_delay, state_file=args.state_file,
+                              respect_robots=not args.ignore_robots, max_pages=args.max_pages)
+    try:
+        crawler.crawl_all()
+        crawler.print_results()
+        crawler.save_to_csv(args.output)
+    except KeyboardInterrupt:
+        crawler.save_state()
+        print("\n사용자에 의해 중단되었습니다. frontier를 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
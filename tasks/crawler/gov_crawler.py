@@ -9,21 +9,60 @@
 - 에러 핸들링 및 서버 부하 방지
 """
 
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
 import re
 from urllib.parse import urljoin, urlparse
 import time
 from typing import Set, List, Tuple
 
+# 단독 실행(python tasks/crawler/gov_crawler.py)에서도 checker 패키지를 찾도록 tasks/를 경로에 추가
+TASKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if TASKS_DIR not in sys.path:
+    sys.path.insert(0, TASKS_DIR)
+
+from checker.sites import normalize_url  # noqa: E402
+
+# 정부 도메인 패턴: .go.kr, .gov.kr(외부), .or.kr(공공기관), .re.kr(연구기관), .ac.kr(국립대학교)
+GOV_DOMAIN_RE = re.compile(r'\.(?:go|gov|or|re|ac)\.kr$')
+
+# 제외할 URL 패턴 (하나의 정규식으로 합쳐 링크마다 한 번만 검색)
+EXCLUDE_URL_RE = re.compile('|'.join([
+    r'/bbs/', r'/board/', r'/event/', r'/contest/', r'/gongmo/',
+    r'/privacy', r'/policy', r'/notice/', r'/news/', r'/content/',
+    r'#', r'\.pdf$', r'\.xlsx$', r'\.doc$', r'\.zip$'
+]), re.IGNORECASE)
+
+# 제외할 텍스트 키워드
+EXCLUDE_TEXT_RE = re.compile('|'.join(map(re.escape, [
+    '공모전', '이벤트', '대회', '개인정보처리방침', '공지사항',
+    '보도자료', '뉴스', '게시판', '자료실', '다운로드',
+    '로그인', '회원가입', '바로가기', '웹접근성', '배너'
+])))
+
+
 class GovCrawler:
+    # 기관 목록을 수집할 정부 포털 페이지
+    target_urls = [
+        'https://www.gov.kr/portal/orgInfo',
+        'https://www.gov.kr/portal/orgInfo/orgmapr'
+    ]
+
+    # 링크 추출 파서: "lxml"(lxml.html 직접 순회), "strainer"(BeautifulSoup + <a>만 파싱), "bs4"(기존 html.parser 전체 파싱)
+    parser = "lxml"
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.org_data = []  # (기관명, URL) 튜플 저장
+        self.org_keys = set()  # 수집한 URL의 정규화 키 (중복 체크용)
+        self.delay = 1  # 페이지 요청 사이 대기 (초)
         
         # 주요 정부기관 목록
         self.known_orgs = {
@@ -98,16 +137,7 @@ class GovCrawler:
             if 'gov.kr' in domain:
                 return False
                 
-            # 정부 도메인 패턴
-            gov_patterns = [
-                r'\.go\.kr$',      # .go.kr
-                r'\.gov\.kr$',     # .gov.kr (외부)
-                r'\.or\.kr$',      # 공공기관
-                r'\.re\.kr$',      # 연구기관
-                r'\.ac\.kr$',      # 국립대학교
-            ]
-            
-            return any(re.search(pattern, domain) for pattern in gov_patterns)
+            return GOV_DOMAIN_RE.search(domain) is not None
             
         except Exception:
             return False
@@ -117,27 +147,12 @@ class GovCrawler:
         if not url:
             return False
             
-        # 제외할 URL 패턴
-        exclude_patterns = [
-            r'/bbs/', r'/board/', r'/event/', r'/contest/', r'/gongmo/',
-            r'/privacy', r'/policy', r'/notice/', r'/news/', r'/content/',
-            r'#', r'\.pdf$', r'\.xlsx$', r'\.doc$', r'\.zip$'
-        ]
-        
-        # 제외할 텍스트 키워드
-        exclude_keywords = [
-            '공모전', '이벤트', '대회', '개인정보처리방침', '공지사항',
-            '보도자료', '뉴스', '게시판', '자료실', '다운로드',
-            '로그인', '회원가입', '바로가기', '웹접근성', '배너'
-        ]
-        
         # URL 패턴 체크
-        if any(re.search(pattern, url, re.IGNORECASE) for pattern in exclude_patterns):
+        if EXCLUDE_URL_RE.search(url):
             return False
         
         # 텍스트 키워드 체크
-        text_lower = text.lower()
-        if any(keyword in text_lower for keyword in exclude_keywords):
+        if text and EXCLUDE_TEXT_RE.search(text.lower()):
             return False
         
         return True
@@ -172,6 +187,61 @@ class GovCrawler:
         except Exception:
             return "기관명 미확인"
     
+    def extract_links(self, html, base_url: str):
+        """페이지의 <a href> 링크를 (절대 URL, 링크 텍스트)로 반환"""
+        if self.parser == "lxml" and html:
+            doc = lxml.html.document_fromstring(html)
+            for link in doc.iter('a'):
+                href = link.get('href')
+                if href is None:
+                    continue
+                # BeautifulSoup get_text(strip=True)와 같은 결과: 텍스트 조각별 strip 후 이어 붙임
+                text = "".join(part.strip() for part in link.itertext())
+                yield urljoin(base_url, href.strip()), text
+            return
+
+        if self.parser == "strainer":
+            soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('a', href=True))
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+        for link in soup.find_all('a', href=True):
+            href = link['href'].strip()
+            text = link.get_text(strip=True)
+            yield urljoin(base_url, href), text
+
+    def _append_org(self, org_name: str, url: str) -> bool:
+        key = normalize_url(url) or url
+        if key in self.org_keys:
+            return False
+        self.org_keys.add(key)
+        self.org_data.append((org_name, url))
+        return True
+
+    def org_for(self, full_url: str, text: str = ""):
+        """정부 도메인이면서 유효한 사이트면 (기관명, URL), 아니면 None"""
+        if not (self.is_gov_domain(full_url) and self.is_valid_site(full_url, text)):
+            return None
+        return self.extract_org_name(full_url, text), full_url
+
+    def add_org(self, full_url: str, text: str = "") -> bool:
+        """정부 도메인이면서 유효한 사이트면 기관 목록에 추가. 새로 추가됐으면 True"""
+        org = self.org_for(full_url, text)
+        if org is None:
+            return False
+
+        # 중복 체크 (정규화 URL 집합)
+        if not self._append_org(*org):
+            return False
+        print(f"  발견: {org[0]} - {full_url}")
+        return True
+
+    def add_known_orgs(self) -> None:
+        """알려진 기관들 추가"""
+        print("알려진 정부 기관들 추가 중...")
+        for org_name, url in self.known_orgs.items():
+            self._append_org(org_name, url)
+            print(f"추가: {org_name} - {url}")
+
     def crawl_page(self, url: str) -> None:
         """단일 페이지 크롤링"""
         try:
@@ -179,26 +249,11 @@ class GovCrawler:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             # 기관 목록 링크 찾기
-            for link in soup.find_all('a', href=True):
-                href = link['href'].strip()
-                text = link.get_text(strip=True)
-                full_url = urljoin(url, href)
-                
-                # 정부 도메인이면서 유효한 사이트인지 확인
-                if (self.is_gov_domain(full_url) and 
-                    self.is_valid_site(full_url, text)):
-                    
-                    # 중복 체크
-                    existing_urls = [url for _, url in self.org_data]
-                    if full_url not in existing_urls:
-                        org_name = self.extract_org_name(full_url, text)
-                        self.org_data.append((org_name, full_url))
-                        print(f"  발견: {org_name} - {full_url}")
+            for full_url, text in self.extract_links(response.content, url):
+                self.add_org(full_url, text)
             
-            time.sleep(1)  # 서버 부하 방지
+            time.sleep(self.delay)  # 서버 부하 방지
             
         except requests.RequestException as e:
             print(f"페이지 요청 실패 ({url}): {e}")
@@ -208,18 +263,10 @@ class GovCrawler:
     def crawl_all(self) -> None:
         """전체 크롤링 실행"""
         # 1. 알려진 기관들 추가
-        print("알려진 정부 기관들 추가 중...")
-        for org_name, url in self.known_orgs.items():
-            self.org_data.append((org_name, url))
-            print(f"추가: {org_name} - {url}")
+        self.add_known_orgs()
         
         # 2. 정부 포털에서 기관 목록 크롤링
-        target_urls = [
-            'https://www.gov.kr/portal/orgInfo',
-            'https://www.gov.kr/portal/orgInfo/orgmapr'
-        ]
-        
-        for url in target_urls:
+        for url in self.target_urls:
             self.crawl_page(url)
     
     def save_to_csv(self, filename: str = 'gov_sites.csv') -> None:
@@ -0,0 +1,107 @@
+import zlib
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from pymongo import UpdateOne, DeleteMany
+from config import CRAWL_PAGE_MAX_AGE_HOURS
+from checker.sites import normalize_url
+
+
+def merge_orgs(pages):
+    """페이지별 (기관명, URL) 목록을 정규화 URL 기준으로 합친다. 같은 기관이 여러 이름으로 걸려 있으면 가장 많이 쓰인 이름"""
+    names = {}
+    urls = {}
+    for orgs in pages:
+        for name, url in orgs:
+            key = normalize_url(url) or url
+            names.setdefault(key, Counter())[name] += 1
+            urls.setdefault(key, url)
+    return {key: (min(c.items(), key=lambda kv: (-kv[1], kv[0]))[0], urls[key]) for key, c in names.items()}
+
+
+class PageCache:
+    """디렉터리 페이지별 ETag/Last-Modified/본문 해시와 그 페이지에서 찾은 기관·링크를 MongoDB(crawl_pages)에 보관"""
+
+    def __init__(self, db, collection="crawl_pages", max_age_hours=CRAWL_PAGE_MAX_AGE_HOURS):
+        self.db = db
+        self.collection = collection
+        self.max_age = timedelta(hours=max_age_hours) if max_age_hours else None
+        self.entries = {}
+        self.visited = set()
+        self._dirty = set()
+        self.stats = {"fresh": 0, "notModified": 0, "hashHits": 0, "changed": 0, "stale": 0}
+
+    def load(self):
+        self.entries = {doc["url"]: doc for doc in self.db[self.collection].find({}, {"_id": 0})}
+        return self
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def is_fresh(self, entry, now=None):
+        """max_age 안에 확인한 페이지면 요청 없이 저장된 결과를 재사용.
+        한 번에 몰려서 만료되지 않도록 URL마다 max_age의 50~100% 사이로 분산"""
+        if self.max_age is None or entry is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        spread = 0.5 + (zlib.crc32(entry["url"].encode()) % 1000) / 2000
+        checked = entry["checkedAt"]
+        if checked.tzinfo is None:
+            checked = checked.replace(tzinfo=timezone.utc)
+        return now - checked < self.max_age * spread
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def touch(self, url, response=None):
+        """변경 없음(304 또는 같은 해시): 확인 시각과 검증 헤더만 갱신"""
+        entry = self.entries[url]
+        entry["checkedAt"] = datetime.now(timezone.utc)
+        if response is not None and response.status == 200:
+            entry["etag"] = response.headers.get("ETag")
+            entry["lastModified"] = response.headers.get("Last-Modified")
+        self._dirty.add(url)
+
+    def record(self, url, response, digest, orgs, links):
+        now = datetime.now(timezone.utc)
+        self.entries[url] = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+            "bodyHash": digest,
+            "orgs": [list(org) for org in orgs],
+            "links": links,
+            "checkedAt": now,
+            "changedAt": now,
+        }
+        self._dirty.add(url)
+
+    def discovered(self, urls=None):
+        """저장된 페이지들(기본: 전체)에서 찾은 기관 {정규화 URL: (기관명, URL)}"""
+        urls = self.entries.keys() if urls is None else urls
+        return merge_orgs(self.entries[u]["orgs"] for u in urls if u in self.entries)
+
+    def flush(self, prune=False):
+        """변경분 저장. prune이면 이번 크롤링에서 더 이상 도달하지 않은 페이지를 삭제"""
+        ops = [UpdateOne({"url": url}, {"$set": self.entries[url]}, upsert=True) for url in self._dirty]
+        stale = [url for url in self.entries if url not in self.visited] if prune else []
+        if stale:
+            ops.append(DeleteMany({"url": {"$in": stale}}))
+            for url in stale:
+                del self.entries[url]
+        if ops:
+            self.db[self.collection].bulk_write(ops, ordered=False)
+        written = len(self._dirty)
+        self._dirty.clear()
+        self.stats["stale"] = len(stale)
+        return written
+
+    def report(self):
+        visited = len(self.visited)
+        reused = self.stats["fresh"] + self.stats["notModified"] + self.stats["hashHits"]
+        return {**self.stats, "pages": visited, "reuseRate": round(reused / visited, 3) if visited else 0.0}
@@ -0,0 +1,153 @@
+"""
+상주(daemon) 모드
+=================
+
+cron으로 5분마다 프로세스를 새로 띄우는 대신, 이벤트 루프 하나와
+ClientSession(커넥션 풀) 하나, MongoClient 하나를 계속 유지하면서 내부 스케줄러로 검사를 반복한다.
+
+    python -m tasks --interval 300 --jitter 15 --metrics-port 9108
+
+- 주기마다 0~jitter초 무작위 지연 후 시작
+- 이전 주기가 아직 끝나지 않았으면 이번 주기는 건너뜀 (중복 실행 방지)
+- SIGTERM/SIGINT 수신 시 진행 중인 주기를 최대 DAEMON_SHUTDOWN_GRACE초 기다린 뒤 종료
+- 주기별 소요 시간, 단계별 시간, 큐 깊이를 JSON 한 줄로 출력하고 --metrics-port로 조회 가능
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import time
+
+from aiohttp import web
+
+from checker.status_checker import StatusChecker
+from checker.concurrency import AdaptiveLimiter
+from checker.indexes import ensure_indexes
+from runner import CycleRunner
+from config import DAEMON_INTERVAL, DAEMON_JITTER, DAEMON_SHUTDOWN_GRACE
+
+
+class Daemon:
+    def __init__(self, db, csv_file, interval=DAEMON_INTERVAL, jitter=DAEMON_JITTER, grace=DAEMON_SHUTDOWN_GRACE,
+                 metrics_file=None, max_cycles=None):
+        self.db = db
+        self.csv_file = csv_file
+        self.interval = interval
+        self.jitter = jitter
+        self.grace = grace
+        self.metrics_file = metrics_file
+        self.max_cycles = max_cycles
+
+        self.stop_event = None
+        self.current = None
+        self.runner = None
+        self.started_at = time.time()
+        self.metrics = {"cycles": 0, "failed": 0, "skippedOverlap": 0, "lastCycle": None}
+
+    def snapshot(self):
+        return {
+            **self.metrics,
+            "uptimeS": round(time.time() - self.started_at, 1),
+            "running": self.current is not None and not self.current.done(),
+            "queueDepth": self.runner.queue_depth() if self.runner else 0,
+        }
+
+    async def _cycle(self, session, limiter):
+        self.runner = CycleRunner(self.db, self.csv_file, session=session, limiter=limiter)
+        try:
+            result = await self.runner.run()
+            self.metrics["cycles"] += 1
+            self.metrics["lastCycle"] = result
+            line = json.dumps({"event": "cycle", **result}, ensure_ascii=False)
+            print(line, flush=True)
+            if self.metrics_file:
+                with open(self.metrics_file, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics["failed"] += 1
+            print(f"❌ 검사 주기 실패: {e}", flush=True)
+
+    async def run(self, metrics_port=None):
+        loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop_event.set)
+
+        await asyncio.to_thread(ensure_indexes, self.db)
+        metrics_runner = await self._serve_metrics(metrics_port) if metrics_port else None
+        # 주기 사이에 커넥션 풀과 AIMD 동시성 한도를 그대로 이어서 사용
+        session = StatusChecker.open_session()
+        limiter = AdaptiveLimiter()
+        next_at = loop.time()
+        started = 0
+        try:
+            while not self.stop_event.is_set():
+                delay = max(0.0, next_at - loop.time()) + random.uniform(0, self.jitter)
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+                next_at += self.interval
+
+                if self.current is not None and not self.current.done():
+                    self.metrics["skippedOverlap"] += 1
+                    print("⏭️ 이전 검사 주기가 아직 진행 중이라 이번 주기는 건너뜁니다", flush=True)
+                    continue
+                self.current = asyncio.create_task(self._cycle(session, limiter))
+                started += 1
+                if self.max_cycles and started >= self.max_cycles:
+                    break
+        finally:
+            # --max-cycles로 끝난 경우엔 마지막 주기를 끝까지 기다린다
+            await self._shutdown(wait_all=not self.stop_event.is_set())
+            await session.close()
+            if metrics_runner:
+                await metrics_runner.cleanup()
+            print(json.dumps({"event": "shutdown", **self.snapshot()}, ensure_ascii=False, default=str), flush=True)
+
+    async def _shutdown(self, wait_all=False):
+        if self.current is None or self.current.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self.current), timeout=None if wait_all else self.grace)
+        except asyncio.TimeoutError:
+            # 취소되면 ResultWriter.close()가 finally에서 남은 결과를 flush
+            self.current.cancel()
+            await asyncio.gather(self.current, return_exceptions=True)
+
+    async def _serve_metrics(self, port):
+        async def handle(request):
+            return web.json_response(self.snapshot(), dumps=lambda o: json.dumps(o, ensure_ascii=False, default=str))
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+        return runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tasks")
+    parser.add_argument("--csv", default="tasks/gov_sites.csv")
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL, help="검사 주기 (초)")
+    parser.add_argument("--jitter", type=float, default=DAEMON_JITTER, help="주기 시작 무작위 지연 상한 (초)")
+    parser.add_argument("--grace", type=float, default=DAEMON_SHUTDOWN_GRACE, help="종료 시 진행 중 주기 대기 (초)")
+    parser.add_argument("--metrics-file", default=None, help="주기별 지표 JSON lines 파일")
+    parser.add_argument("--metrics-port", type=int, default=None, help="GET /metrics 로 현재 지표 제공")
+    parser.add_argument("--max-cycles", type=int, default=None, help="지정 횟수만큼 실행 후 종료 (측정용)")
+    args = parser.parse_args(argv)
+
+    from checker.db import db
+    daemon = Daemon(db, args.csv, interval=args.interval, jitter=args.jitter, grace=args.grace,
+                    metrics_file=args.metrics_file, max_cycles=args.max_cycles)
+    asyncio.run(daemon.run(metrics_port=args.metrics_port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+MongoDB 관리 명령
+=================
+
+    python tasks/dbadmin.py indexes        # 인덱스 생성/확인 (TTL 보존 기간 포함)
+    python tasks/dbadmin.py stats          # 컬렉션별 문서 수, 데이터/인덱스 크기
+    python tasks/dbadmin.py index-usage    # $indexStats: 인덱스별 사용 횟수
+    python tasks/dbadmin.py explain        # 자주 쓰는 쿼리의 실행 계획 요약
+    python tasks/dbadmin.py sync-agencies --dry-run [--prune]   # gov_sites.csv → agencies 변경분 반영
+"""
+
+import argparse
+from datetime import datetime, timezone, timedelta
+
+from checker.indexes import ensure_indexes, index_specs
+
+MB = 1024 * 1024
+
+
+def hot_queries(db):
+    """(이름, 컬렉션, explain 명령) — 수집기 upsert와 대시보드 API가 실제로 보내는 쿼리"""
+    latest = db["hourly_stats"].find_one({}, sort=[("timestampHour", -1)]) or {}
+    hour = latest.get("timestampHour") or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    agency = latest.get("agencyId", "")
+    day_ago = hour - timedelta(hours=24)
+    return [
+        ("upsert 대상 조회", "hourly_stats", {"find": "hourly_stats", "filter": {"agencyId": agency, "timestampHour": hour}}),
+        ("history: distinct timestampHour", "hourly_stats", {"distinct": "hourly_stats", "key": "timestampHour"}),
+        ("history: 최근 24시간", "hourly_stats", {"find": "hourly_stats", "filter": {"timestampHour": {"$gte": day_ago}},
+                                              "sort": {"timestampHour": 1}}),
+        ("history: 롤업", "overall_hourly", {"find": "overall_hourly", "filter": {}, "sort": {"timestampHour": -1},
+                                           "limit": 720}),
+        ("dashboard: 최신 스냅샷", "overall_stats", {"find": "overall_stats", "filter": {}, "sort": {"timestamp": -1},
+                                              "limit": 1}),
+        ("events: 진행 중 장애", "status_index", {"find": "status_index", "filter": {"status": {"$in": ["problem"]}},
+                                              "sort": {"since": 1}, "limit": 10}),
+        ("events: 시각 t까지 누적", "status_events", {"find": "status_events",
+                                                 "filter": {"agencyId": agency, "start": {"$lte": day_ago}},
+                                                 "sort": {"start": -1}, "limit": 1}),
+    ]
+
+
+def _plan_stages(plan):
+    stages = []
+    while plan:
+        stages.append(plan.get("stage", "?") + (f"({plan['indexName']})" if plan.get("indexName") else ""))
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " <- ".join(stages)
+
+
+def cmd_sync_agencies(db, args):
+    from checker.agencies import AgencyManager
+    AgencyManager(csv_file=args.csv, db=db).sync(dry_run=args.dry_run, prune=args.prune)
+
+
+def cmd_indexes(db):
+    created = ensure_indexes(db)
+    for collection, names in created.items():
+        print(f"✅ {collection}: {', '.join(names)}")
+
+
+def cmd_stats(db):
+    print(f"{'collection':<18} {'docs':>10} {'data(MB)':>10} {'storage(MB)':>12} {'indexes(MB)':>12}")
+    for name in sorted(db.list_collection_names()):
+        try:
+            stats = next(db[name].aggregate([{"$collStats": {"storageStats": {}}}]))["storageStats"]
+        except StopIteration:
+            continue
+        print(f"{name:<18} {stats.get('count', 0):>10} {stats.get('size', 0) / MB:>10.1f} "
+              f"{stats.get('storageSize', 0) / MB:>12.1f} {stats.get('totalIndexSize', 0) / MB:>12.1f}")
+
+
+def cmd_index_usage(db):
+    for name in sorted(index_specs()):
+        for idx in db[name].aggregate([{"$indexStats": {}}]):
+            ops = idx.get("accesses", {}).get("ops", 0)
+            since = idx.get("accesses", {}).get("since")
+            print(f"{name:<18} {idx['name']:<28} ops={ops:<10} since={since}")
+
+
+def cmd_explain(db):
+    for title, collection, command in hot_queries(db):
+        result = db.command("explain", command, verbosity="executionStats")
+        planner = result.get("queryPlanner", {})
+        stats = result.get("executionStats", {})
+        print(f"▶ {title} [{collection}]")
+        print(f"   plan: {_plan_stages(planner.get('winningPlan', {}))}")
+        print(f"   returned={stats.get('nReturned')} keysExamined={stats.get('totalKeysExamined')} "
+              f"docsExamined={stats.get('totalDocsExamined')} time={stats.get('executionTimeMillis')}ms")
+
+
+COMMANDS = {"indexes": cmd_indexes, "stats": cmd_stats, "index-usage": cmd_index_usage, "explain": cmd_explain,
+            "sync-agencies": cmd_sync_agencies}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--csv", default="tasks/gov_sites.csv", help="sync-agencies: 기관 목록 CSV")
+    parser.add_argument("--dry-run", action="store_true", help="sync-agencies: 반영하지 않고 변경 내역만 출력")
+    parser.add_argument("--prune", action="store_true", help="sync-agencies: CSV에 없는 기관 삭제")
+    args = parser.parse_args()
+
+    from checker.db import db
+    if args.command == "sync-agencies":
+        cmd_sync_agencies(db, args)
+    else:
+        COMMANDS[args.command](db)
@@ -0,0 +1,187 @@
+"""
+기관 목록 증분 탐색
+===================
+
+포털 디렉터리 페이지를 AsyncGovCrawler로 다시 훑되, 페이지별 ETag/Last-Modified/본문 해시를
+crawl_pages 컬렉션에 저장해 두고 바뀌지 않은 페이지는 파싱하지 않는다 (최근 확인한 페이지는 요청도 생략).
+직전 탐색 결과와 비교한 증분(추가/삭제/이름 변경)만 agencies 컬렉션에 반영한다.
+
+    python tasks/discover.py --dry-run                 # 증분만 출력
+    python tasks/discover.py                           # agencies에 추가/이름 변경 반영
+    python tasks/discover.py --prune                   # 포털에서 사라진 기관 삭제까지
+    python tasks/discover.py --csv tasks/gov_sites.csv # gov_sites.csv 대비 증분을 CSV와 agencies에 반영
+    python tasks/discover.py --csv tasks/gov_sites.csv --csv-only  # CSV만 갱신 (자동 실행용)
+    python tasks/discover.py --delta-out delta.json    # 증분을 JSON으로 저장
+    python tasks/discover.py --force                   # 증분이 커도 반영
+
+--csv를 주면 직전 탐색 결과가 아니라 CSV 자체와 비교한다. CSV 변경이 병합되지 않은 채 남아 있어도
+다음 실행에서 같은 증분이 다시 나오므로 페이지 캐시(crawl_pages)는 매번 저장해도 된다.
+(CSV에 직접 넣은 기관이 포털에 없어도 --prune 없이는 삭제로 잡지 않는다)
+
+--csv 없이 crawl_pages가 비어 있는 첫 실행(비교할 직전 결과 없음)이거나 증분이 DISCOVER_MAX_CHANGES보다 크면
+반영하지 않는다 (--delta-out으로 남긴 증분을 검토한 뒤 --force).
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+
+from config import CRAWL_MAX_DEPTH, CRAWL_CONCURRENCY, CRAWL_HOST_DELAY, CRAWL_PAGE_MAX_AGE_HOURS, DISCOVER_MAX_CHANGES
+from checker.sites import normalize_url
+from crawler.async_crawler import AsyncGovCrawler
+from crawler.page_cache import PageCache
+
+
+def compute_delta(before, after):
+    """{정규화 URL: (기관명, URL)} 두 개를 비교한 added/removed/renamed 목록"""
+    delta = {"added": [], "removed": [], "renamed": []}
+    for key, (name, url) in after.items():
+        if key not in before:
+            delta["added"].append({"name": name, "url": url})
+        elif before[key][0] != name:
+            delta["renamed"].append({"name": name, "url": url, "before": before[key][0]})
+    for key, (name, url) in before.items():
+        if key not in after:
+            delta["removed"].append({"name": name, "url": url})
+    for items in delta.values():
+        items.sort(key=lambda org: org["url"])
+    return delta
+
+
+def delta_size(delta):
+    return sum(len(items) for items in delta.values())
+
+
+def load_csv_orgs(csv_file):
+    """기관 목록 CSV → {정규화 URL: (기관명, URL)} (compute_delta 비교 기준)"""
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))[1:]
+    return {normalize_url(row[1].strip()) or row[1].strip(): (row[0].strip(), row[1].strip())
+            for row in rows if len(row) >= 2 and row[1].strip()}
+
+
+def discover(db, seeds=None, max_depth=CRAWL_MAX_DEPTH, concurrency=CRAWL_CONCURRENCY,
+             host_delay=CRAWL_HOST_DELAY, max_age_hours=CRAWL_PAGE_MAX_AGE_HOURS, dry_run=False, max_changes=None,
+             reference=None, prune=False):
+    """증분 탐색 한 번. (delta, 크롤링 통계) 반환. 크롤링이 끝까지 돌지 못했으면 removed는 비워 둔다
+
+    reference({정규화 URL: (기관명, URL)}, 예: load_csv_orgs)를 주면 crawl_pages의 직전 결과 대신 그것과 비교한다.
+    이때 removed는 prune일 때만 채운다 (기준 목록에 손으로 넣은 기관이 삭제로 잡혀 증분을 키우지 않도록)
+
+    통계의 held가 있으면 반영하지 말아야 하는 증분이다.
+    - "baseline": reference 없이 crawl_pages가 비어 있던 첫 실행 (모든 기관이 추가로 잡힘). 캐시는 저장해 다음 실행의 기준으로 쓴다
+    - "tooLarge": 증분이 max_changes보다 큼. reference가 없으면 캐시를 저장하지 않아 검토 후 --force로 다시 실행하면
+      같은 증분이 나온다 (reference가 있으면 기준이 그대로라 캐시를 저장해도 같은 증분이 나온다)
+    """
+    cache = PageCache(db, max_age_hours=max_age_hours).load()
+    before = cache.discovered() if reference is None else reference
+
+    crawler = AsyncGovCrawler(seeds=seeds, max_depth=max_depth, concurrency=concurrency, host_delay=host_delay,
+                              state_file=None, page_cache=cache)
+    stats = asyncio.run(crawler.crawl())
+    complete = not crawler.queued
+
+    after = cache.discovered(cache.visited)
+    delta = compute_delta(before, after)
+    if not complete or (reference is not None and not prune):
+        delta["removed"] = []
+    held = None
+    if reference is None and not before and any(delta.values()):
+        held = "baseline"
+    elif max_changes is not None and delta_size(delta) > max_changes:
+        held = "tooLarge"
+    if not dry_run and (reference is not None or held != "tooLarge"):
+        cache.flush(prune=complete)
+    return delta, {**stats, "complete": complete, "held": held, "cache": cache.report()}
+
+
+def apply_delta_to_csv(csv_file, delta, prune=False):
+    """gov_sites.csv에 증분만 반영 (기존 행 순서 유지, 새 기관은 끝에 추가)"""
+    with open(csv_file, "r", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    header, rows = rows[0], rows[1:]
+
+    renamed = {normalize_url(org["url"]): org["name"] for org in delta["renamed"]}
+    removed = {normalize_url(org["url"]) for org in delta["removed"]} if prune else set()
+    present = set()
+    kept = []
+    for row in rows:
+        key = normalize_url(row[1].strip()) if len(row) >= 2 else None
+        if key in removed:
+            continue
+        if key in renamed:
+            row = [renamed[key], *row[1:]]
+        present.add(key)
+        kept.append(row)
+    kept += [[org["name"], org["url"]] for org in delta["added"] if normalize_url(org["url"]) not in present]
+
+    with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(kept)
+    return len(kept) - len(rows)
+
+
+def print_delta(delta):
+    print(f"🔎 증분: 추가 {len(delta['added'])}, 이름 변경 {len(delta['renamed'])}, 삭제 {len(delta['removed'])}")
+    for org in delta["added"]:
+        print(f"   + {org['name']} - {org['url']}")
+    for org in delta["renamed"]:
+        print(f"   ~ {org['before']} → {org['name']} - {org['url']}")
+    for org in delta["removed"]:
+        print(f"   - {org['name']} - {org['url']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="append", help="시작 페이지 (기본: GovCrawler.target_urls)")
+    parser.add_argument("--depth", type=int, default=CRAWL_MAX_DEPTH)
+    parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY)
+    parser.add_argument("--host-delay", type=float, default=CRAWL_HOST_DELAY)
+    parser.add_argument("--max-age", type=float, default=CRAWL_PAGE_MAX_AGE_HOURS,
+                        help="이 시간(시간 단위) 안에 확인한 페이지는 요청하지 않음 (0이면 매번 조건부 요청)")
+    parser.add_argument("--dry-run", action="store_true", help="crawl_pages/agencies를 갱신하지 않고 증분만 출력")
+    parser.add_argument("--prune", action="store_true", help="포털에서 사라진 기관을 agencies(와 CSV)에서 삭제")
+    parser.add_argument("--csv", default=None, help="이 CSV와 비교한 증분을 CSV(와 agencies)에 반영")
+    parser.add_argument("--csv-only", action="store_true",
+                        help="agencies는 건드리지 않고 CSV만 갱신 (병합된 CSV는 main.py가 agencies로 다시 읽는다)")
+    parser.add_argument("--delta-out", default=None, help="증분을 저장할 JSON 파일")
+    parser.add_argument("--max-changes", type=int, default=DISCOVER_MAX_CHANGES,
+                        help="증분이 이보다 크면 agencies/CSV에 반영하지 않음")
+    parser.add_argument("--force", action="store_true", help="첫 실행이거나 증분이 커도 반영")
+    args = parser.parse_args()
+    if args.csv_only and not args.csv:
+        parser.error("--csv-only는 --csv와 함께 써야 합니다")
+
+    from checker.db import db
+    from checker.agencies import AgencyManager
+    from checker.indexes import ensure_indexes
+
+    ensure_indexes(db)
+    delta, stats = discover(db, seeds=args.seed, max_depth=args.depth, concurrency=args.concurrency,
+                            host_delay=args.host_delay, max_age_hours=args.max_age, dry_run=args.dry_run,
+                            max_changes=None if args.force else args.max_changes,
+                            reference=load_csv_orgs(args.csv) if args.csv else None, prune=args.prune)
+    cache = stats["cache"]
+    print(f"📄 페이지 {cache['pages']}개: 요청 생략 {cache['fresh']}, 304 {cache['notModified']}, "
+          f"같은 해시 {cache['hashHits']}, 변경 {cache['changed']}, 정리 {cache['stale']}")
+    print_delta(delta)
+
+    if args.delta_out:
+        with open(args.delta_out, "w", encoding="utf-8") as f:
+            json.dump(delta, f, ensure_ascii=False, indent=2)
+    if stats["held"] == "baseline" and not args.force:
+        print("⚠️ crawl_pages에 직전 탐색 결과가 없어 이번 결과는 기준으로만 저장합니다 (반영하려면 --force)")
+        sys.exit(0)
+    if stats["held"] == "tooLarge":
+        print(f"⚠️ 증분 {delta_size(delta)}건이 --max-changes({args.max_changes})보다 커서 반영하지 않습니다 "
+              f"(검토 후 --force)")
+        sys.exit(0)
+    if any(delta.values()):
+        if not args.csv_only:
+            AgencyManager(db=db).apply_delta(delta, dry_run=args.dry_run, prune=args.prune)
+        if args.csv and not args.dry_run:
+            apply_delta_to_csv(args.csv, delta, prune=args.prune)
+            print(f"✅ {args.csv} 갱신 완료")
@@ -1,28 +1,92 @@
+"""
+검사 1회 실행 (cron/Actions 진입점)
+===================================
+
+    python tasks/main.py                    # 기관 상태 확인 + 결과 저장
+    python tasks/main.py --crawl            # 먼저 기관 목록 크롤링 (gov_sites.csv 생성)
+    python tasks/main.py --load-agencies    # 먼저 CSV 기반 agencies 컬렉션 업데이트
+    python tasks/main.py --profile-startup  # 모듈별 import 시간 + 첫 요청까지 걸린 시간 측정
+
+정기 실행 경로는 검사/저장에 필요한 모듈만 import한다. 크롤러와 기관 관리 모듈은 해당 옵션을 줄 때만 불러오고,
+DB 연결은 import 시점이 아니라 시작 직후 백그라운드에서 열어 나머지 준비 작업과 겹친다.
+"""
+
+import argparse
 import asyncio
-from checker.db import db
-from checker.agencies import AgencyManager
-from checker.status_checker import StatusChecker
-from checker.storage import Storage
-from crawler.gov_crawler import GovCrawler
-
-async def main():
-    CSV_FILE = "tasks/gov_sites.csv"
-    # # Step 1. 기관 목록 크롤링 (gov_sites.csv 생성): 초반 csv파일이 없거나 GovCrawler 클래스 수정 시 사용
-    # crawler = GovCrawler()
-    # crawler.crawl_all()
-    # crawler.save_to_csv(CSV_FILE)
-    
-    # # Step 2. CSV 기반 DB 업데이트: DB에 데이터가 없거나 GovCrawler 클래스 수정 시 사용
-    # agency_mgr = AgencyManager(csv_file=CSV_FILE)
-    # agency_mgr.load_from_csv()
-    
-    # Step 3. 기관 상태 확인
-    checker = StatusChecker(db)
-    await checker.check_all_sites_from_csv(CSV_FILE)
-    
-    # Step 4. 결과 저장
-    storage = Storage(db)
-    storage.save_hourly_and_overall(checker.results)
+import signal
+import sys
+import time
+
+from checker.db import get_db, warm_up
+from startup import marks_from_env
+
+CSV_FILE = "tasks/gov_sites.csv"
+
+
+def crawl():
+    # 기관 목록 크롤링 (gov_sites.csv 생성): 초반 csv파일이 없거나 GovCrawler 클래스 수정 시 사용
+    #   (frontier는 tasks/crawl_frontier.json에 저장되어 중단돼도 다음 실행에서 이어받음)
+    from crawler.async_crawler import AsyncGovCrawler
+    crawler = AsyncGovCrawler()
+    crawler.crawl_all()
+    crawler.save_to_csv(CSV_FILE)
+
+
+def load_agencies():
+    # CSV 기반 DB 업데이트: DB에 데이터가 없거나 GovCrawler 클래스 수정 시 사용
+    from checker.agencies import AgencyManager
+    AgencyManager(csv_file=CSV_FILE, db=get_db()).load_from_csv()
+
+
+async def main(marks=None):
+    # SIGTERM(Actions 타임아웃 등) 수신 시에도 finally에서 남은 결과를 flush
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    # 검사 경로 모듈(aiohttp, numpy, pymongo...)은 DB 연결 예열을 시작한 뒤에 import
+    from checker.indexes import ensure_indexes
+    from runner import CycleRunner
+    if marks:
+        marks.mark("imports")
+
+    db = get_db()
+    # 인덱스 확인은 검사와 겹쳐서 (이미 있으면 컬렉션당 왕복 1회로 끝남)
+    indexes = asyncio.create_task(asyncio.to_thread(ensure_indexes, db))
+    try:
+        # Step 3. 기관 상태 확인 + Step 4. 결과 저장
+        started = time.perf_counter()
+        result = await CycleRunner(db, CSV_FILE).run()
+        if marks and result["firstRequestMs"] is not None:
+            marks.mark("firstRequest", started + result["firstRequestMs"] / 1000)
+    finally:
+        await indexes
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--crawl", action="store_true", help="검사 전에 기관 목록 크롤링 (gov_sites.csv 생성)")
+    parser.add_argument("--load-agencies", action="store_true", help="검사 전에 CSV 기반 agencies 컬렉션 업데이트")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="-X importtime으로 다시 실행해 모듈별 import 시간과 첫 요청까지 걸린 시간 출력")
+    parser.add_argument("--json", action="store_true", help="--profile-startup 결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from startup import profile_startup
+        argv = [a for a in sys.argv[1:] if a not in ("--profile-startup", "--json")]
+        sys.exit(profile_startup(__file__, argv, as_json=args.json))
+
+    marks = marks_from_env()
+    warm_up()
+    if args.crawl:
+        crawl()
+    if args.load_agencies:
+        load_agencies()
+    try:
+        asyncio.run(main(marks))
+    finally:
+        if marks:
+            from checker import db as db_module
+            if db_module.warmed_at is not None:
+                marks.mark("dbReady", db_module.warmed_at)
+            marks.mark("done")
+            marks.save()
@@ -0,0 +1,120 @@
+"""
+롤업 컬렉션 재구성
+==================
+
+hourly_stats 원본에서 overall_hourly / agency_daily / global_daily 롤업을 다시 계산한다.
+평소에는 Storage가 저장 시점에 점진적으로 갱신하므로, 롤업 도입 이전 데이터나
+롤업이 어긋났을 때만 사용한다.
+
+    python tasks/rollups.py backfill               # 전체 기간
+    python tasks/rollups.py backfill --days 30     # 최근 30일 (첫날은 KST 자정부터 통째로)
+    python tasks/rollups.py events                 # 상태 변화 이벤트(status_events/status_index) 재구성
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone, timedelta
+
+from config import ROLLUP_UTC_OFFSET, STORAGE_BATCH_SIZE
+from checker.events import StatusEvents
+from checker.indexes import ensure_indexes
+from checker.stats import N_BUCKETS, PHASES, STATUSES
+from checker.storage import Storage
+
+STATUS_FIELDS = ("total", "normal", "maintenance", "problem", "responseTimeSum")
+TIMING_FIELDS = ("samples",) + tuple(f"{p}Ms" for p in PHASES)
+
+
+def _group_stats():
+    fields = {k: {"$sum": {"$ifNull": [f"$stats.{k}", 0]}} for k in STATUS_FIELDS}
+    fields["responseTimeMin"] = {"$min": "$stats.responseTimeMin"}
+    fields["responseTimeMax"] = {"$max": "$stats.responseTimeMax"}
+    # 응답시간 히스토그램은 버킷별 합 (stats.latencyHist.<버킷 번호>)
+    for i in range(N_BUCKETS):
+        fields[f"h{i}"] = {"$sum": {"$ifNull": [f"$stats.latencyHist.{i}", 0]}}
+    # 요청 단계별 시간 합 (stats.timing.*)
+    for k in TIMING_FIELDS:
+        fields[f"t_{k}"] = {"$sum": {"$ifNull": [f"$stats.timing.{k}", 0]}}
+    return fields
+
+
+def _project_stats(keys):
+    stats = {k: f"${k}" for k in STATUS_FIELDS + ("responseTimeMin", "responseTimeMax")}
+    stats["latencyHist"] = {str(i): f"$h{i}" for i in range(N_BUCKETS)}
+    stats["timing"] = {k: f"$t_{k}" for k in TIMING_FIELDS}
+    return {"_id": 0, **{k: f"$_id.{k}" for k in keys}, "stats": stats}
+
+
+def _day_expr():
+    tz = f"{'+' if ROLLUP_UTC_OFFSET >= 0 else '-'}{abs(ROLLUP_UTC_OFFSET):02d}:00"
+    return {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestampHour", "timezone": tz}}
+
+
+ROLLUPS = {
+    # 컬렉션: (그룹 키, $merge 기준 필드)
+    "overall_hourly": ({"timestampHour": "$timestampHour"}, ["timestampHour"]),
+    "agency_daily": ({"agencyId": "$agencyId", "date": _day_expr()}, ["agencyId", "date"]),
+    "global_daily": ({"date": _day_expr()}, ["date"]),
+}
+
+
+def day_start(ts):
+    """ts가 속한 롤업 날짜(ROLLUP_UTC_OFFSET 기준)의 시작 시각 (UTC). 시간 버킷 경계이기도 하다"""
+    local = ts + timedelta(hours=ROLLUP_UTC_OFFSET)
+    return local.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(hours=ROLLUP_UTC_OFFSET)
+
+
+def backfill(db, since=None):
+    # $merge(whenMatched: replace)는 문서를 통째로 바꾸므로 첫날을 일부만 합산하면 그날 일별 롤업이 줄어든다
+    # → 시작 시각을 그 날짜의 시작(시간 버킷 경계)으로 내린다
+    if since is not None:
+        since = day_start(since)
+    match = {"timestampHour": {"$gte": since}} if since else {}
+    ensure_indexes(db)  # $merge의 on 필드에는 unique 인덱스가 필요
+    for collection, (group_id, keys) in ROLLUPS.items():
+        t0 = time.perf_counter()
+        db["hourly_stats"].aggregate([
+            {"$match": match},
+            {"$group": {"_id": group_id, **_group_stats()}},
+            {"$project": _project_stats(keys)},
+            {"$merge": {"into": collection, "on": keys, "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ], allowDiskUse=True)
+        count = db[collection].count_documents({})
+        print(f"✅ {collection} 재구성 완료: {count}건 ({time.perf_counter() - t0:.1f}s)"
+              + (f", {since.isoformat()}부터" if since else ""))
+
+
+def backfill_events(db, now=None):
+    """hourly_stats 전체로 status_events/status_index를 다시 만든다 (기존 내용은 지움).
+    시간마다 가장 많이 관측된 상태를 그 시간의 상태로 보므로 시간 단위보다 짧은 변화는 남지 않는다"""
+    now = now or datetime.now(timezone.utc)
+    ensure_indexes(db)
+    t0 = time.perf_counter()
+    events = StatusEvents(db)
+    projection = {"_id": 0, "agencyId": 1, "timestampHour": 1, **{f"stats.{s}": 1 for s in STATUSES}}
+    docs = db["hourly_stats"].find({}, projection, sort=[("agencyId", 1), ("timestampHour", 1)])
+    event_docs, index_docs = events.from_hourly(docs)
+
+    db[events.collection].delete_many({})
+    db[events.index_collection].delete_many({})
+    for collection, items in ((events.collection, event_docs), (events.index_collection, index_docs)):
+        for start in range(0, len(items), STORAGE_BATCH_SIZE):
+            db[collection].insert_many(items[start:start + STORAGE_BATCH_SIZE], ordered=False)
+    Storage(db).write_updates(events.index_collection, events.window_updates(now))
+    print(f"✅ 상태 이벤트 재구성 완료: 기관 {len(index_docs)}곳, 구간 {len(event_docs)}건 ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    bf = sub.add_parser("backfill", help="hourly_stats로부터 롤업 재구성")
+    bf.add_argument("--days", type=int, default=None, help="최근 N일만 재구성 (기본: 전체)")
+    sub.add_parser("events", help="hourly_stats로부터 상태 변화 이벤트/누적 인덱스 재구성")
+    args = parser.parse_args()
+
+    from checker.db import db
+    if args.command == "backfill":
+        since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+        backfill(db, since)
+    elif args.command == "events":
+        backfill_events(db)
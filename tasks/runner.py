@@ -0,0 +1,92 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from checker.status_checker import StatusChecker
+from checker.storage import Storage
+from checker.pipeline import ResultWriter
+from checker.cache import ResponseCache
+from checker.sites import load_sites
+from checker.agencies import AgencyManager
+from checker.tiers import ProbeScheduler
+from checker.deadlines import SiteDeadlines
+from config import RESPONSE_CACHE, PROBE_TIERS, ADAPTIVE_TIMEOUTS
+
+
+def agency_categories(db, agencies):
+    """agencyId -> (mainCategory, subCategory). 분류별 응답시간 요약용"""
+    classify = AgencyManager(db=db).classify_agency
+    categories = {}
+    for a in agencies:
+        c = classify(a["name"])
+        categories[a["agencyId"]] = (c["mainCategory"], c["subCategory"])
+    return categories
+
+
+class CycleRunner:
+    """검사 1회(대상 선정 → 검사 → 재검사 → 저장). cron 실행과 데몬 모드가 함께 사용"""
+
+    def __init__(self, db, csv_file, session=None, limiter=None):
+        self.db = db
+        self.csv_file = csv_file
+        self.session = session
+        self.limiter = limiter
+        self.writer = None
+        self.phases = {}
+
+    def queue_depth(self):
+        return self.writer.queue.qsize() if self.writer else 0
+
+    async def _phase(self, name, coro):
+        t0 = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.phases[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+    async def run(self):
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+
+        # Step 1. 검사 대상 선정: 이력상 안정적인 기관은 검사 주기가 돌아온 경우에만 검사
+        agencies = load_sites(self.csv_file)
+        scheduler = ProbeScheduler(self.db) if PROBE_TIERS else None
+        if scheduler:
+            await self._phase("load", asyncio.to_thread(scheduler.load, now))
+            targets = scheduler.due(agencies, now)
+        else:
+            targets = agencies
+
+        # Step 2. 기관 상태 확인 + 결과 저장: 완료된 결과를 바로 writer로 흘려보내 검사와 저장을 겹친다
+        categories = agency_categories(self.db, agencies)
+        self.writer = await ResultWriter(Storage(self.db), merge_snapshot=scheduler is not None,
+                                         known_ids={a["agencyId"] for a in agencies}, categories=categories).start()
+        checker = StatusChecker(self.db, cache=ResponseCache(self.db) if RESPONSE_CACHE else None, session=self.session,
+                                deadlines=SiteDeadlines(self.db) if ADAPTIVE_TIMEOUTS else None)
+        completed = False
+        try:
+            sink = scheduler.tap(self.writer) if scheduler else self.writer
+            await self._phase("check", checker.check_sites(targets, sink=sink, limiter=self.limiter))
+            if scheduler:
+                await self._phase("retry", scheduler.fast_retry(checker, targets, sink=self.writer))
+                await self._phase("schedule", asyncio.to_thread(scheduler.save, now))
+                checker.run_stats["schedule"] = scheduler.report(len(agencies))
+                print(f"🗓️ 검사 대상 {len(targets)}/{len(agencies)}곳 (재검사 {checker.run_stats.get('rechecked', 0)}건)")
+            completed = True
+        finally:
+            # 실패/취소여도 받은 결과는 flush하되, overall_stats는 검사가 끝난 경우에만 기록
+            writer_summary = await self._phase("store", self.writer.close(run_stats=checker.run_stats,
+                                                                           completed=completed))
+
+        return {
+            "startedAt": now.isoformat(),
+            "durationMs": round((time.perf_counter() - started) * 1000, 1),
+            "phases": dict(self.phases),
+            "firstRequestMs": (round((checker.first_request_at - started) * 1000, 1)
+                               if checker.first_request_at else None),
+            "agencies": len(agencies),
+            "probed": len(targets),
+            "maxQueueDepth": writer_summary["maxQueueDepth"],
+            "blockedPuts": writer_summary["blockedPuts"],
+            "overall": writer_summary["overall"],
+            "latency": {k: v for k, v in (self.writer.latency or {}).items() if k.startswith("p")},
+        }
@@ -0,0 +1,116 @@
+"""
+시작 시간 측정 (python tasks/main.py --profile-startup)
+=======================================================
+
+같은 명령을 `python -X importtime`으로 다시 띄워(자식 프로세스) 검사 1회를 그대로 실행하고
+- 모듈별 import 시간 (self / 누적, -X importtime 출력 집계)
+- 프로세스 시작 → import 완료 / DB 연결 예열 완료 / 첫 요청까지 걸린 시간
+을 출력한다. 자식은 측정 지점을 PROFILE_ENV로 받은 파일에 JSON으로 남긴다.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILE_ENV = "GOV_STATUS_STARTUP_PROFILE"  # "<부모가 자식을 띄운 시각(epoch 초)>:<측정 지점 파일>"
+MARKS = (("imports", "import 완료"), ("dbReady", "DB 연결 예열 완료"), ("firstRequest", "첫 요청"), ("done", "종료"))
+
+
+class StartupMarks:
+    """자식 프로세스 쪽 측정 지점. time.perf_counter 값을 부모가 프로세스를 띄운 시각 기준 ms로 바꿔 기록"""
+
+    def __init__(self, spec):
+        spawned, self.path = spec.split(":", 1)
+        # 벽시계 기준점은 한 번만 잡고 이후 지점은 perf_counter로만 잰다
+        self.offset = (time.time() - float(spawned)) - time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name, at=None):
+        at = time.perf_counter() if at is None else at
+        self.marks[name] = round((at + self.offset) * 1000, 1)
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.marks, f)
+
+
+def marks_from_env():
+    spec = os.environ.get(PROFILE_ENV)
+    return StartupMarks(spec) if spec else None
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → ([{module, selfMs, cumulativeMs, depth}], 나머지 stderr 줄)"""
+    imports, other = [], []
+    for line in stderr.splitlines(keepends=True):
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 머리글 줄 ("self [us] | cumulative | imported package")
+        name = fields[2].rstrip("\n")
+        module = name.lstrip()
+        imports.append({
+            "module": module,
+            "selfMs": int(fields[0]) / 1000,
+            "cumulativeMs": int(fields[1]) / 1000,
+            "depth": (len(name) - len(module) - 1) // 2,
+        })
+    return imports, "".join(other)
+
+
+def summarize(imports, marks, top=15):
+    # 패키지별 self 합계가 곧 그 패키지를 import하는 데 쓴 시간 (누적은 중첩되어 합치면 중복)
+    packages = {}
+    for i in imports:
+        package = i["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + i["selfMs"]
+    return {
+        "marks": marks,
+        "importMs": round(sum(i["selfMs"] for i in imports), 1),
+        "modules": len(imports),
+        "slowest": [{k: i[k] for k in ("module", "selfMs", "cumulativeMs")}
+                    for i in sorted(imports, key=lambda i: -i["cumulativeMs"])[:top]],
+        "packages": [{"package": p, "ms": round(ms, 1)}
+                     for p, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:top]],
+    }
+
+
+def print_report(report):
+    print("\n⏱️ 시작 시간 (프로세스 시작 기준)")
+    for key, label in MARKS:
+        value = report["marks"].get(key)
+        print(f"  {label:<18} {f'{value:.1f}ms' if value is not None else '-'}")
+    print(f"\n📦 import {report['modules']}개 모듈, self 합계 {report['importMs']:.1f}ms")
+    print("  패키지별 (self 합계)")
+    for p in report["packages"]:
+        print(f"    {p['ms']:>8.1f}ms  {p['package']}")
+    print("  모듈별 (누적 / self)")
+    for m in report["slowest"]:
+        print(f"    {m['cumulativeMs']:>8.1f}ms {m['selfMs']:>8.1f}ms  {m['module']}")
+
+
+def profile_startup(script, argv, as_json=False):
+    """script를 -X importtime 자식 프로세스로 실행하고 시작 시간 보고. 자식의 종료 코드를 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "marks.json")
+        env = {**os.environ, PROFILE_ENV: f"{time.time()!r}:{path}"}
+        proc = subprocess.Popen([sys.executable, "-X", "importtime", script, *argv], env=env,
+                                stderr=subprocess.PIPE, text=True)
+        _, stderr = proc.communicate()
+        imports, other = parse_importtime(stderr)
+        sys.stderr.write(other)
+        marks = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                marks = json.load(f)
+    report = summarize(imports, marks)
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        print_report(report)
+    return proc.returncode
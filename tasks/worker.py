@@ -0,0 +1,184 @@
+"""
+분산 검사 워커
+==============
+
+여러 프로세스/노드에서 같은 명령을 동시에 띄우면 scan_leases 컬렉션의 임대 문서로
+기관 목록 조각(SHARD_SIZE개씩)을 나눠 맡아 검사한다.
+
+    python tasks/worker.py                           # 현재 실행 슬롯(RUN_INTERVAL 단위)의 조각을 나눠 맡음
+    python tasks/worker.py --worker-id node-a        # 워커 이름 지정 (기본: 호스트명-PID)
+    python tasks/worker.py --run-id 2025-01-01T09:05 # 실행 ID 직접 지정
+
+- 조각마다 기관별 최종 상태는 임대 문서에 담고, hourly_stats/롤업과 상태 변화 이벤트는 임대를 지킨 채 조각을 완료한
+  워커만 쓴다 (완료 처리는 조각마다 한 번만 성공하므로 임대를 잃은 워커가 뒤늦게 끝내도 같은 실행·조각이 두 번 쓰이지 않는다.
+  완료 직후 저장 전에 워커가 죽으면 그 조각의 해당 실행분은 빠진다)
+- 모든 조각이 끝나면 한 워커만 병합 작업을 가져가 overall_stats(와 run_snapshots)를 기록한다
+- 워커가 죽으면 임대가 SHARD_LEASE_TTL 뒤 만료되어 남은 워커가 다시 가져간다
+- 분산 모드는 계층형 검사 주기(PROBE_TIERS)를 쓰지 않고 매 실행 전체 기관을 검사한다
+- 호스트당 동시 요청 상한(CONCURRENCY_PER_HOST)은 워커마다 따로 적용되므로 워커 수만큼 곱해진다
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timezone
+
+from checker.status_checker import StatusChecker
+from checker.concurrency import AdaptiveLimiter
+from checker.storage import Storage
+from checker.pipeline import ResultWriter
+from checker.cache import ResponseCache
+from checker.deadlines import SiteDeadlines
+from checker.shards import ShardLeases, run_id_for
+from checker.sites import load_sites
+from checker.stats import StatsBuilder
+from runner import agency_categories
+from config import (
+    RESPONSE_CACHE, ADAPTIVE_TIMEOUTS, CONCURRENCY_INITIAL, SHARD_SIZE, SHARD_LEASE_TTL, SHARD_HEARTBEAT, SHARD_POLL,
+    SHARD_PARALLEL,
+)
+
+
+class ShardWorker:
+    def __init__(self, db, csv_file, worker_id=None, shard_size=SHARD_SIZE, ttl=SHARD_LEASE_TTL,
+                 heartbeat=SHARD_HEARTBEAT, poll=SHARD_POLL, concurrency=CONCURRENCY_INITIAL, parallel=SHARD_PARALLEL):
+        self.db = db
+        self.concurrency = concurrency
+        self.parallel = parallel
+        self.csv_file = csv_file
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.shard_size = shard_size
+        self.heartbeat_interval = heartbeat
+        self.poll = poll
+        self.leases = ShardLeases(db, ttl=ttl)
+        self.held = set()
+        self.stats = {"shards": 0, "sites": 0, "lostLeases": 0, "merged": False, "waitedMs": 0.0}
+
+    async def run(self, run_id=None):
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        run_id = run_id or run_id_for(now)
+        agencies = {a["agencyId"]: a for a in load_sites(self.csv_file)}
+        shards = await asyncio.to_thread(self.leases.plan, run_id, list(agencies), self.shard_size, now)
+        print(f"🧩 [{self.worker_id}] 실행 {run_id}: 조각 {shards}개")
+
+        heartbeat = asyncio.create_task(self._heartbeat())
+        scans = set()
+        try:
+            async with StatusChecker.open_session() as session:
+                # 세션/동시성 한도/캐시/타임아웃 이력은 조각마다 새로 만들지 않고 워커 전체에서 재사용
+                shared = {
+                    "session": session,
+                    "cache": ResponseCache(self.db) if RESPONSE_CACHE else None,
+                    "deadlines": SiteDeadlines(self.db) if ADAPTIVE_TIMEOUTS else None,
+                }
+                # 조각 검사가 겹쳐 돌므로 각자 load하면 한쪽이 다른 쪽이 쓰던 캐시 항목을 갈아엎는다: 미리 한 번만 읽는다
+                await asyncio.gather(*(asyncio.to_thread(shared[k].load) for k in ("cache", "deadlines")
+                                       if shared[k] is not None))
+                limiter = AdaptiveLimiter(initial=self.concurrency)
+                while True:
+                    # 조각 하나의 느린 꼬리를 기다리며 놀지 않도록 최대 parallel개 조각을 겹쳐 검사
+                    while len(scans) < self.parallel:
+                        shard = await asyncio.to_thread(self.leases.claim, run_id, self.worker_id)
+                        if shard is None:
+                            break
+                        self.held.add(shard["_id"])
+                        scans.add(asyncio.create_task(self._scan(shard, shared, limiter, agencies)))
+                    if scans:
+                        done, scans = await asyncio.wait(scans, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            task.result()
+                        continue
+                    merge = await asyncio.to_thread(self.leases.claim_merge, run_id, self.worker_id)
+                    if merge is not None:
+                        await self._merge(merge, run_id, agencies)
+                        break
+                    if await asyncio.to_thread(self.leases.merged, run_id):
+                        break
+                    # 다른 워커가 맡은 조각(또는 병합)이 끝나거나 임대가 만료되기를 기다림
+                    t0 = time.perf_counter()
+                    await asyncio.sleep(self.poll)
+                    self.stats["waitedMs"] += (time.perf_counter() - t0) * 1000
+        finally:
+            heartbeat.cancel()
+            for task in scans:
+                task.cancel()
+
+        result = {"workerId": self.worker_id, "runId": run_id, **self.stats,
+                  "waitedMs": round(self.stats["waitedMs"], 1),
+                  "durationMs": round((time.perf_counter() - started) * 1000, 1)}
+        print(f"✅ [{self.worker_id}] 조각 {self.stats['shards']}개 / 기관 {self.stats['sites']}곳 검사"
+              f"{', 병합 완료' if self.stats['merged'] else ''} ({result['durationMs'] / 1000:.1f}s)")
+        return result
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            held = list(self.held)
+            extended = await asyncio.to_thread(self.leases.heartbeat, self.worker_id, held)
+            if extended < len(held):
+                print(f"⚠️ [{self.worker_id}] 임대 {len(held) - extended}개가 만료되어 다른 워커에게 넘어갔습니다")
+
+    async def _scan(self, shard, shared, limiter, agencies):
+        try:
+            targets = [agencies[aid] for aid in shard["agencyIds"] if aid in agencies]
+            checker = StatusChecker(self.db, **shared)
+            writer = await ResultWriter(Storage(self.db), save_snapshot=False, defer_writes=True).start()
+            completed = False
+            try:
+                await checker.check_sites(targets, sink=writer, limiter=limiter)
+                completed = True
+            finally:
+                await writer.close(completed=completed)
+            stats = {"durationMs": checker.run_stats["durationMs"], "attempts": checker.run_stats.get("attempts")}
+            ok = await asyncio.to_thread(self.leases.complete, shard["_id"], self.worker_id,
+                                         list(writer.snapshot.values()), stats)
+            if ok:
+                await writer.write_deferred()
+                self.stats["shards"] += 1
+                self.stats["sites"] += len(targets)
+            else:
+                self.stats["lostLeases"] += 1
+        finally:
+            self.held.discard(shard["_id"])
+
+    async def _merge(self, merge, run_id, agencies):
+        """완료된 조각들의 결과를 합쳐 overall_stats(+ run_snapshots) 기록"""
+        self.held.add(merge["_id"])
+        try:
+            shards = await asyncio.to_thread(self.leases.done_shards, run_id)
+            snapshot = [entry for s in shards for entry in s["results"]]
+            storage = Storage(self.db)
+            latency = StatsBuilder.summarize(snapshot, agency_categories(self.db, agencies.values()))
+            distributed = ShardLeases.report(shards)
+            await asyncio.to_thread(storage.save_overall, snapshot, storage.count_overall(snapshot),
+                                    datetime.now(timezone.utc),
+                                    {"runId": run_id, "distributed": distributed, "latency": latency})
+            await asyncio.to_thread(self.leases.complete, merge["_id"], self.worker_id, None, distributed)
+            self.stats["merged"] = True
+            print(f"🧮 [{self.worker_id}] 병합: 조각 {distributed['shards']}개, 워커 {len(distributed['workers'])}개, "
+                  f"재임대 {distributed['reclaimed']}개, 기관 {len(snapshot)}곳")
+        finally:
+            self.held.discard(merge["_id"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="tasks/gov_sites.csv")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--run-id", default=None, help="기본: 현재 시각을 RUN_INTERVAL 단위로 내린 값")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--ttl", type=float, default=SHARD_LEASE_TTL, help="임대 유효 시간 (초)")
+    parser.add_argument("--heartbeat", type=float, default=SHARD_HEARTBEAT, help="임대 연장 주기 (초)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY_INITIAL, help="워커별 초기 동시성 한도")
+    args = parser.parse_args()
+
+    from checker.db import db
+    from checker.indexes import ensure_indexes
+
+    ensure_indexes(db)
+    worker = ShardWorker(db, args.csv, worker_id=args.worker_id, shard_size=args.shard_size, ttl=args.ttl,
+                         heartbeat=args.heartbeat, concurrency=args.concurrency)
+    asyncio.run(worker.run(args.run_id))